@@ -0,0 +1,376 @@
+"""
+Component micro-benchmarks with baseline regression checks.
+
+Runs offline: config and timetables live in a temporary directory and the
+Cast layer is replaced by FakeCast devices (benchmarks/stubs.py). Results
+are written as JSON and compared against the stored baseline for this
+machine type (benchmarks/baselines/<machine>.json), since a Pi and a
+desktop are not comparable. The suite is run --runs times and each
+benchmark is judged on the median across runs; it exits non-zero if any
+benchmark is more than --threshold slower than its baseline and also more
+than --noise-floor milliseconds slower, so jitter on sub-millisecond
+calls cannot fail the gate on its own.
+
+Usage:
+    python benchmarks/run.py                      # run, save results, compare
+    python benchmarks/run.py --update-baseline    # record this run as the baseline
+    python benchmarks/run.py --filter calculate   # only matching benchmarks
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config.config_manager import ConfigManager  # noqa: E402
+from core.audio_manager import AudioManager  # noqa: E402
+from core.calculator import PrayerCalculator  # noqa: E402
+from core.scheduler import AthanScheduler  # noqa: E402
+from core.utils import gregorian_to_hijri, hijri_calendar  # noqa: E402
+from benchmarks.stubs import OfflineCastManager  # noqa: E402
+
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+DEFAULT_OUTPUT = os.path.join(ROOT, "cache", "benchmarks", "latest.json")
+
+# Target wall time per sample when a benchmark is cheap enough to loop
+MIN_SAMPLE_SECONDS = 0.02
+
+# Slowdowns smaller than this (ms per call) are treated as timing noise
+NOISE_FLOOR_MS = 0.05
+
+BENCHMARKS = []
+
+
+def benchmark(name: str):
+    """Register a benchmark factory.
+
+    The factory receives the shared context and returns (run, before):
+    `run` is the timed call, `before` an optional untimed reset run before
+    every call (which also disables looping within a sample).
+    """
+    def register(factory):
+        BENCHMARKS.append((name, factory))
+        return factory
+    return register
+
+
+class Context:
+    """Isolated config, calculator, scheduler and audio manager for one run."""
+
+    def __init__(self):
+        self.tmp = tempfile.mkdtemp(prefix="athan-bench-")
+        self.config_path = os.path.join(self.tmp, "config.yaml")
+        self.config = ConfigManager(config_path=self.config_path,
+                                    default_path=os.path.join(ROOT, "config", "default_config.yaml"))
+        self.config.update({"system": {"timetable_cache_dir": os.path.join(self.tmp, "timetables"),
+                                       "job_store_path": os.path.join(self.tmp, "jobs.sqlite")}})
+
+        self.audio_manager = AudioManager(self.config)
+        self.cast_manager = OfflineCastManager(self.config, device_count=3)
+        self.scheduler = AthanScheduler(self.config, audio_manager=self.audio_manager,
+                                        cast_manager=self.cast_manager)
+        self.calculator = self.scheduler.calculator
+
+    def fresh_calculator(self, backend: str = None) -> PrayerCalculator:
+        """Calculator with an empty in-memory cache and its own empty store."""
+        if backend is not None:
+            self.config.set("location", "calculation_backend", backend)
+        calculator = PrayerCalculator(self.config)
+        shutil.rmtree(calculator.store.base_dir, ignore_errors=True)
+        return calculator
+
+    def close(self):
+        if self.scheduler.scheduler.running:
+            self.scheduler.scheduler.shutdown(wait=False)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+def _cold_times(ctx: Context, backend: str):
+    calculator = ctx.fresh_calculator(backend)
+
+    def before():
+        calculator.clear_cache()
+        shutil.rmtree(calculator.store.base_dir, ignore_errors=True)
+
+    return calculator.calculate_times, before
+
+
+@benchmark("calculate_times.cold[islamic_times]")
+def bench_times_cold(ctx):
+    return _cold_times(ctx, "islamic_times")
+
+
+@benchmark("calculate_times.cold[numpy]")
+def bench_times_cold_numpy(ctx):
+    return _cold_times(ctx, "numpy")
+
+
+@benchmark("calculate_times.disk")
+def bench_times_disk(ctx):
+    calculator = ctx.fresh_calculator("islamic_times")
+    calculator.calculate_times()
+    return calculator.calculate_times, calculator._times_cache.clear
+
+
+@benchmark("calculate_times.cached")
+def bench_times_cached(ctx):
+    ctx.calculator.calculate_times()
+    return ctx.calculator.calculate_times, None
+
+
+@benchmark("get_astronomy_data.grid")
+def bench_astronomy_grid(ctx):
+    calculator = ctx.calculator
+    calculator._astronomy_grid = calculator.build_astronomy_grid()
+    return calculator.get_astronomy_data, None
+
+
+@benchmark("get_astronomy_data.direct")
+def bench_astronomy_direct(ctx):
+    calculator = ctx.calculator
+    return lambda: calculator._get_astronomy_data_direct(datetime.now()), calculator.clear_cache
+
+
+@benchmark("get_next_prayer")
+def bench_next_prayer(ctx):
+    calculator = ctx.calculator
+    calculator.calculate_times()
+    return calculator.get_next_prayer, None
+
+
+@benchmark("gregorian_to_hijri")
+def bench_hijri(ctx):
+    today = date.today()
+    return lambda: gregorian_to_hijri(today, offset=1), None
+
+
+@benchmark("hijri_calendar.year")
+def bench_hijri_year(ctx):
+    year = date.today().year
+    return lambda: hijri_calendar(date(year, 1, 1), date(year, 12, 31)), None
+
+
+@benchmark("config.load_config")
+def bench_config_load(ctx):
+    return ctx.config.load_config, None
+
+
+@benchmark("config.save")
+def bench_config_save(ctx):
+    return ctx.config.save, None
+
+
+@benchmark("scheduler.refresh_prayer_times")
+def bench_refresh(ctx):
+    scheduler = ctx.scheduler
+    if not scheduler.scheduler.running:
+        scheduler.scheduler.start()
+    scheduler.refresh_prayer_times()
+    return scheduler.refresh_prayer_times, None
+
+
+@benchmark("audio.get_athan_path")
+def bench_athan_path(ctx):
+    audio_manager = ctx.audio_manager
+    return lambda: audio_manager.get_athan_path("missing.mp3"), None
+
+
+@benchmark("audio.get_reminder_path")
+def bench_reminder_path(ctx):
+    audio_manager = ctx.audio_manager
+    return lambda: audio_manager.get_reminder_path("missing.mp3"), None
+
+
+@benchmark("cast.play_audio[3 devices, 5ms latency]")
+def bench_play_audio(ctx):
+    cast_manager = OfflineCastManager(ctx.config, device_count=3, latency=0.005)
+    cast_manager.start_discovery()
+    ctx.config.set("audio", "fade_in", False)
+    path = ctx.audio_manager.get_athan_path()
+    return lambda: cast_manager.play_audio(path, volume=0.5), None
+
+
+@benchmark("cast.stop_all[3 devices, 5ms latency]")
+def bench_stop_all(ctx):
+    cast_manager = OfflineCastManager(ctx.config, device_count=3, latency=0.005)
+    cast_manager.start_discovery()
+    return cast_manager.stop_all, None
+
+
+def measure(run, before, repeat: int) -> dict:
+    """Time `run`; returns per-call statistics in milliseconds."""
+    number = 1
+    if before is None:
+        # Loop cheap calls so each sample is long enough to time reliably
+        run()
+        while True:
+            t0 = time.perf_counter()
+            for _ in range(number):
+                run()
+            if time.perf_counter() - t0 >= MIN_SAMPLE_SECONDS or number >= 100000:
+                break
+            number *= 10
+
+    samples = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - t0) / number * 1000.0)
+
+    return {
+        "median_ms": round(statistics.median(samples), 6),
+        "min_ms": round(min(samples), 6),
+        "stdev_ms": round(statistics.stdev(samples), 6) if len(samples) > 1 else 0.0,
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def run_suite(name_filter: str = None, repeat: int = 7) -> dict:
+    """One pass over the registered benchmarks in a fresh context."""
+    ctx = Context()
+    results = {}
+    try:
+        for name, factory in BENCHMARKS:
+            if name_filter and name_filter not in name:
+                continue
+            run, before = factory(ctx)
+            results[name] = measure(run, before, repeat)
+    finally:
+        ctx.close()
+    return results
+
+
+def combine_runs(runs: list) -> dict:
+    """Merge per-run statistics: median of the run medians, overall fastest sample."""
+    results = {}
+    for name in runs[0]:
+        medians = [run[name]["median_ms"] for run in runs]
+        results[name] = {
+            "median_ms": round(statistics.median(medians), 6),
+            "min_ms": min(run[name]["min_ms"] for run in runs),
+            "stdev_ms": round(statistics.stdev(medians), 6) if len(medians) > 1 else runs[0][name]["stdev_ms"],
+            "repeat": runs[0][name]["repeat"],
+            "number": runs[0][name]["number"],
+            "runs": len(runs),
+        }
+    return results
+
+
+def run_benchmarks(name_filter: str = None, repeat: int = 7, runs: int = 3) -> dict:
+    passes = []
+    for i in range(runs):
+        passes.append(run_suite(name_filter, repeat))
+        print(f"Run {i + 1}/{runs} done")
+    results = combine_runs(passes)
+    for name, result in results.items():
+        print(f"{name:<45}{result['median_ms']:>12.4f} ms")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, noise_floor: float = NOISE_FLOOR_MS) -> list:
+    """Print current vs baseline times; return the names that regressed.
+
+    Compares the median across runs. A benchmark regresses only if it is
+    both `threshold` relatively and `noise_floor` ms absolutely slower;
+    microsecond-scale calls swing by more than 30% between runs on a
+    shared machine without anything having changed.
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<45}{'Baseline':>12}{'Current':>12}{'Ratio':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<45}{'-':>12}{result['median_ms']:>12.4f}{'new':>8}")
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        flag = ""
+        if ratio > 1.0 + threshold:
+            if result["median_ms"] - base["median_ms"] > noise_floor:
+                regressions.append(name)
+                flag = "  SLOWER"
+            else:
+                flag = "  (noise)"
+        print(f"{name:<45}{base['median_ms']:>12.4f}{result['median_ms']:>12.4f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write this run's JSON results")
+    parser.add_argument("--baseline", default=os.path.join(BASELINE_DIR, f"{platform.machine()}.json"))
+    parser.add_argument("--update-baseline", action="store_true", help="save this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="allowed slowdown before failing (0.3 = 30%%)")
+    parser.add_argument("--noise-floor", type=float, default=NOISE_FLOOR_MS,
+                        help="ignore slowdowns smaller than this many ms per call")
+    parser.add_argument("--repeat", type=int, default=7, help="samples per benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="full passes; each benchmark uses the median across them")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    # Benchmarks resolve relative paths (audio/, web/) from the repo root
+    os.chdir(ROOT)
+    logging.basicConfig(level=logging.ERROR)
+
+    current = run_benchmarks(args.filter, args.repeat, args.runs)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        baseline = current
+        if args.filter and os.path.isfile(args.baseline):
+            # Only replace the benchmarks that were run
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            baseline["results"].update(current["results"])
+            baseline["meta"] = current["meta"]
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("machine") != current["meta"]["machine"]:
+        print(f"Warning: baseline was recorded on {baseline.get('meta', {}).get('machine')}")
+
+    regressions = compare(current, baseline, args.threshold, args.noise_floor)
+    if regressions:
+        print(f"FAIL: {len(regressions)} benchmark(s) more than {args.threshold:.0%} slower: {', '.join(regressions)}")
+        return 1
+    print(f"OK: no benchmark more than {args.threshold:.0%} slower than baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Offline stand-ins for the pychromecast objects used by CastManager.
+
+FakeCast implements just the surface CastManager touches (wait, set_volume,
+quit_app, status, media_controller) and sleeps for `latency` seconds per
+network call, so fan-out and stop paths can be timed without real devices.
+"""
+import threading
+import time
+import uuid as uuid_lib
+
+from integrations.cast_manager import CastManager
+
+
+class FakeStatus:
+    def __init__(self):
+        self.volume_level = 0.5
+        self.player_state = "IDLE"
+        self.content_id = None
+
+
+class FakeMediaController:
+    def __init__(self, cast):
+        self.cast = cast
+        self.status = FakeStatus()
+
+    def play_media(self, url, content_type=None, autoplay=True, **kwargs):
+        self.cast._network()
+        self.status.player_state = "PLAYING" if autoplay else "PAUSED"
+        self.status.content_id = url
+
+    def play(self):
+        self.cast._network()
+        self.status.player_state = "PLAYING"
+
+    def block_until_active(self, timeout=None):
+        self.cast._network()
+
+    def stop(self):
+        self.cast._network()
+        self.status.player_state = "IDLE"
+
+
+class FakeSocketClient:
+    def __init__(self):
+        self.is_connected = True
+
+    def is_alive(self):
+        return True
+
+
+class FakeCast:
+    def __init__(self, name: str, latency: float = 0.0):
+        self.name = name
+        self.uuid = uuid_lib.uuid4()
+        self.latency = latency
+        self.status = FakeStatus()
+        self.media_controller = FakeMediaController(self)
+        self.socket_client = FakeSocketClient()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _network(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def start(self):
+        pass
+
+    def wait(self, timeout=None):
+        self._network()
+
+    def disconnect(self, timeout=None):
+        self.socket_client.is_connected = False
+
+    def set_volume(self, volume):
+        self._network()
+        self.status.volume_level = volume
+
+    def quit_app(self):
+        self._network()
+
+
+class OfflineCastManager(CastManager):
+    """CastManager whose discovery yields `device_count` FakeCast devices."""
+
+    def __init__(self, config, device_count: int = 3, latency: float = 0.0):
+        super().__init__(config)
+        self.device_count = device_count
+        self.latency = latency
+
+    def get_local_ip(self):
+        return "127.0.0.1"
+
+    def start_discovery(self):
+        for i in range(self.device_count):
+            cast = FakeCast(f"Fake Speaker {i + 1}", self.latency)
+            self.devices[cast.uuid] = cast
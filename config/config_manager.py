@@ -1,40 +1,130 @@
 import yaml
 import os
 import logging
+import threading
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+
+class FrozenDict(dict):
+    """Read-only dict; config snapshots are built from these and tuples."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Config snapshots are read-only; use ConfigManager.set() or update()")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    """Deep read-only copy of a YAML value: dicts become FrozenDicts and lists tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Deep mutable copy of a snapshot value (plain dicts and lists)."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
 class ConfigManager:
+    """The configuration as immutable, versioned snapshots.
+
+    `config` is the current snapshot: a FrozenDict that is never modified,
+    only replaced as a whole (a single reference swap) by load_config(),
+    set() and update(). Readers need no lock and a snapshot they hold stays
+    consistent; writers are serialised by a lock and bump `version`.
+    Listeners are called with (old, new) after every change, including
+    edits to the config file picked up by the watcher (start_watching).
+    """
+
+    # Seconds between checks of the config file for edits (system.config_poll_seconds)
+    POLL_SECONDS = 2
+
     def __init__(self, config_path="config/config.yaml", default_path="config/default_config.yaml"):
         self.config_path = config_path
         self.default_path = default_path
-        self.config: dict[str, Any] = {}
+        # (version, snapshot), swapped in one assignment
+        self._current = (0, FrozenDict())
+        self._write_lock = threading.Lock()
+        # (mtime_ns, size) of the config file as last loaded or saved
+        self._file_stamp = None
+        self._stop = threading.Event()
+        self._thread = None
+        # Called with (old, new) snapshots whenever the config changes
+        self.listeners = []
         self.load_config()
 
-    def load_config(self):
-        """Loads config from file, falling back to defaults if necessary."""
-        # Try to load user config
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    self.config = yaml.safe_load(f) or {}
-                logger.info(f"Loaded configuration from {self.config_path}")
-            except Exception as e:
-                logger.error(f"Error loading config from {self.config_path}: {e}")
-                self.config = {}
-        
-        # Load defaults to fill in gaps
-        if os.path.exists(self.default_path):
-            try:
-                with open(self.default_path, 'r') as f:
-                    defaults = yaml.safe_load(f) or {}
-                
-                self._deep_merge(self.config, defaults)
-                
-                logger.info(f"Merged with defaults from {self.default_path}")
-            except Exception as e:
-                logger.error(f"Error loading defaults: {e}")
+    @property
+    def config(self) -> dict:
+        """The current snapshot (read-only)."""
+        return self._current[1]
+
+    @property
+    def version(self) -> int:
+        return self._current[0]
+
+    def snapshot(self) -> tuple:
+        """(version, snapshot), for callers that read several values and need them consistent."""
+        return self._current
+
+    def load_config(self) -> bool:
+        """Loads config from file, falling back to defaults if necessary.
+
+        Returns True if this published a new snapshot. Once a config has been
+        loaded, a file that is missing or fails to parse (e.g. half-written
+        by an editor) leaves the current snapshot in place.
+        """
+        with self._write_lock:
+            self._file_stamp = self._stat()
+            # Try to load user config
+            config = {}
+            if os.path.exists(self.config_path):
+                try:
+                    with open(self.config_path, 'r') as f:
+                        config = yaml.safe_load(f) or {}
+                    logger.info(f"Loaded configuration from {self.config_path}")
+                except Exception as e:
+                    logger.error(f"Error loading config from {self.config_path}: {e}")
+                    if self.version:
+                        return False
+            elif self.version:
+                # Removed or mid-rename: keep what we have
+                return False
+
+            # Load defaults to fill in gaps
+            if os.path.exists(self.default_path):
+                try:
+                    with open(self.default_path, 'r') as f:
+                        defaults = yaml.safe_load(f) or {}
+
+                    self._deep_merge(config, defaults)
+
+                    logger.info(f"Merged with defaults from {self.default_path}")
+                except Exception as e:
+                    logger.error(f"Error loading defaults: {e}")
+
+            old, new = self._publish(config)
+        return self._notify(old, new)
 
     def _deep_merge(self, target: dict, source: dict):
         """Recursively merge source dict into target dict."""
@@ -53,28 +143,56 @@ class ConfigManager:
 
     def get(self, section: str, key: str = None, default: Any = None):
         """Retrieve a config value safely."""
-        if section not in self.config:
+        config = self.config
+        if section not in config:
             return default
         
         if key is None:
-            return self.config[section]
+            return config[section]
             
-        return self.config[section].get(key, default)
+        return config[section].get(key, default)
 
     def set(self, section: str, key: str, value: Any):
         """Set a config value and save."""
-        if section not in self.config:
-            self.config[section] = {}
-        self.config[section][key] = value
-        self.save()
+        with self._write_lock:
+            config = thaw(self.config)
+            if not isinstance(config.get(section), dict):
+                config[section] = {}
+            config[section][key] = value
+            old, new = self._publish(config)
+            self.save()
+        self._notify(old, new)
 
     def update(self, config_data: dict):
         """Update config with a dictionary (deep merge) and save."""
         # We can reuse the deep merge logic, but inverted: existing config is target, new data is source.
         # However, for updates, we want the NEW data to overwrite the OLD data.
-        # Example: self._deep_update(self.config, config_data)
-        self._deep_update(self.config, config_data)
-        self.save()
+        with self._write_lock:
+            config = thaw(self.config)
+            self._deep_update(config, thaw(config_data))
+            old, new = self._publish(config)
+            self.save()
+        self._notify(old, new)
+
+    def _publish(self, config: dict) -> tuple:
+        """Swap in a snapshot of `config` (write lock held); returns (old, new), new is None if unchanged."""
+        version, old = self._current
+        new = freeze(config)
+        if new == old:
+            return old, None
+        self._current = (version + 1, new)
+        return old, new
+
+    def _notify(self, old, new) -> bool:
+        if new is None:
+            return False
+        logger.debug(f"Configuration version {self.version}")
+        for listener in list(self.listeners):
+            try:
+                listener(old, new)
+            except Exception as e:
+                logger.error(f"Error in config listener: {e}")
+        return True
 
     def _deep_update(self, target: dict, source: dict):
         """Recursively update target with source."""
@@ -93,9 +211,11 @@ class ConfigManager:
         temp_path = self.config_path + '.tmp'
         try:
             with open(temp_path, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+                yaml.dump(thaw(self.config), f, default_flow_style=False)
             # os.replace is atomic on POSIX systems
             os.replace(temp_path, self.config_path)
+            # Our own write; the watcher should not reload it
+            self._file_stamp = self._stat()
             logger.info("Configuration saved.")
         except Exception as e:
             logger.error(f"Error saving config: {e}")
@@ -106,3 +226,35 @@ class ConfigManager:
                 except OSError:
                     pass
 
+    def _stat(self):
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(self) -> bool:
+        """True if the config file differs from the last load or save (one stat call)."""
+        return self._stat() != self._file_stamp
+
+    def start_watching(self, interval: float):
+        """Poll the config file every `interval` seconds and reload it when edited."""
+        if interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        def _run():
+            while not self._stop.wait(interval):
+                if not self.changed():
+                    continue
+                try:
+                    if self.load_config():
+                        logger.info(f"Reloaded {self.config_path} (version {self.version})")
+                except Exception as e:
+                    logger.error(f"Error reloading config from {self.config_path}: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=_run, name="config-watch", daemon=True)
+        self._thread.start()
+
+    def stop_watching(self):
+        self._stop.set()
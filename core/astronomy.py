@@ -0,0 +1,44 @@
+import numpy as np
+from datetime import date, datetime, timedelta
+
+
+class AstronomyGrid:
+    """Sun/moon samples for one day on a fixed time grid, with interpolation.
+
+    Samples run from local midnight to the following midnight inclusive, so
+    any instant of the day falls between two grid points. Azimuth is stored
+    unwrapped so interpolation across north (359° -> 0°) stays smooth.
+    """
+
+    def __init__(self, day: date, location: tuple, step_seconds: int,
+                 sun_altitude, sun_azimuth, moon_illumination, phases: list):
+        self.day = day
+        self.location = location
+        self.step_seconds = step_seconds
+        self.offsets = np.arange(len(sun_altitude), dtype=np.float64) * step_seconds
+        self.sun_altitude = np.asarray(sun_altitude, dtype=np.float64)
+        self.sun_azimuth = np.degrees(np.unwrap(np.radians(np.asarray(sun_azimuth, dtype=np.float64))))
+        self.moon_illumination = np.asarray(moon_illumination, dtype=np.float64)
+        # [(name, naive datetime)] nearest moon phases, computed once for the day
+        self.phases = phases
+
+    @staticmethod
+    def sample_times(day: date, step_seconds: int) -> list:
+        midnight = datetime.combine(day, datetime.min.time())
+        count = 86400 // step_seconds + 1
+        return [midnight + timedelta(seconds=i * step_seconds) for i in range(count)]
+
+    def covers(self, day: date, location: tuple) -> bool:
+        return self.day == day and self.location == location
+
+    def interpolate(self, dt: datetime) -> dict:
+        """Linearly interpolated sun position and moon illumination at dt."""
+        seconds = (dt - datetime.combine(self.day, datetime.min.time())).total_seconds()
+        return {
+            "sun_altitude": float(np.interp(seconds, self.offsets, self.sun_altitude)),
+            "sun_azimuth": float(np.interp(seconds, self.offsets, self.sun_azimuth)) % 360.0,
+            "moon_illumination": float(np.interp(seconds, self.offsets, self.moon_illumination)),
+        }
+
+    def nearest_phase(self, dt: datetime):
+        return min(self.phases, key=lambda x: abs((x[1] - dt).total_seconds()))
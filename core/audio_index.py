@@ -0,0 +1,238 @@
+import hashlib
+import logging
+import os
+import threading
+
+from core.plan import Frozen
+
+logger = logging.getLogger(__name__)
+
+# MPEG audio frame header tables, indexed by (version, layer) and header bits
+_BITRATES = {
+    ("1", 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    ("1", 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    ("1", 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    ("2", 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    ("2", 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    ("2", 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {"1": (44100, 48000, 32000), "2": (22050, 24000, 16000), "2.5": (11025, 12000, 8000)}
+_VERSIONS = {0b00: "2.5", 0b10: "2", 0b11: "1"}
+_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+# How far into the file to look for the first frame
+_SCAN_BYTES = 64 * 1024
+
+
+class AudioInfo(Frozen):
+    """One audio file: stat data plus duration (s), bitrate (kbps) and SHA-256."""
+
+    __slots__ = ("filename", "path", "size", "mtime", "duration", "bitrate", "sha256")
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__ if name != "path"}
+
+
+def mp3_info(path: str) -> tuple:
+    """(duration seconds, bitrate kbps) from the first MPEG frame, or (None, None).
+
+    Uses the Xing/Info header for the frame count when present (VBR files),
+    otherwise assumes constant bitrate.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            data = f.read(_SCAN_BYTES)
+    except OSError:
+        return None, None
+
+    offset = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        # Syncsafe tag size, plus the 10-byte header (and footer if flagged)
+        tag_size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + tag_size + (10 if data[5] & 0x10 else 0)
+        if offset + 4 > len(data):
+            try:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(_SCAN_BYTES)
+            except OSError:
+                return None, None
+            size -= offset
+            offset = 0
+
+    for i in range(offset, len(data) - 4):
+        if data[i] != 0xFF or (data[i + 1] & 0xE0) != 0xE0:
+            continue
+        header = int.from_bytes(data[i:i + 4], "big")
+        version = _VERSIONS.get((header >> 19) & 0b11)
+        layer = _LAYERS.get((header >> 17) & 0b11)
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0b11
+        if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+
+        bitrate = _BITRATES[("1" if version == "1" else "2", layer)][bitrate_index - 1]
+        sample_rate = _SAMPLE_RATES[version][rate_index]
+        samples = 384 if layer == 1 else 1152 if layer == 2 or version == "1" else 576
+        mono = (header >> 6) & 0b11 == 0b11
+        audio_bytes = size - i
+
+        if layer == 3:
+            side_info = (17 if mono else 32) if version == "1" else (9 if mono else 17)
+            xing = i + 4 + side_info
+            if data[xing:xing + 4] in (b"Xing", b"Info") and int.from_bytes(data[xing + 4:xing + 8], "big") & 1:
+                frames = int.from_bytes(data[xing + 8:xing + 12], "big")
+                duration = frames * samples / sample_rate
+                if duration > 0:
+                    return round(duration, 3), round(audio_bytes * 8 / duration / 1000)
+        return round(audio_bytes * 8 / (bitrate * 1000), 3), bitrate
+    return None, None
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AudioIndex:
+    """In-memory index of the audio files in one directory.
+
+    Lookups (files(), get(), contains()) never touch the filesystem. The
+    first scan runs on a background thread so hashing a large library does
+    not hold up startup; lookups made before it finishes wait for it, and
+    listeners are notified of its result like any other rescan. The
+    index is rebuilt by refresh() when the directory's mtime changes, which
+    a background watcher polls for (start_watching); files whose size and
+    mtime are unchanged keep their metadata and hash, so a rescan only
+    reads new or modified files. Call refresh(force=True) after replacing a
+    file in place, which does not change the directory mtime.
+    """
+
+    def __init__(self, directory: str, extension: str = ".mp3"):
+        self.directory = directory
+        self.extension = extension
+        # (filename -> AudioInfo, sorted filenames), replaced in one assignment
+        # so lock-free readers never see one without the other
+        self._state = ({}, ())
+        self._dir_mtime = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.version = 0
+        # Called with the new entries whenever a rescan finds changes
+        self.listeners = []
+        # Set once the first scan has been published
+        self._loaded = threading.Event()
+        threading.Thread(target=self._initial_scan, name="audio-index-load", daemon=True).start()
+
+    def _initial_scan(self):
+        try:
+            self.refresh(force=True)
+        except Exception as e:
+            logger.error(f"Error indexing {self.directory}: {e}")
+        finally:
+            self._loaded.set()
+
+    def wait_loaded(self, timeout: float = None) -> bool:
+        """Block until the first scan has finished; True if it has."""
+        if self._loaded.is_set():
+            return True
+        return self._loaded.wait(timeout)
+
+    def files(self) -> list:
+        """Sorted filenames."""
+        self.wait_loaded()
+        return list(self._state[1])
+
+    def get(self, filename: str):
+        self.wait_loaded()
+        return self._state[0].get(filename)
+
+    def __contains__(self, filename: str) -> bool:
+        self.wait_loaded()
+        return filename in self._state[0]
+
+    def entries(self) -> list:
+        self.wait_loaded()
+        entries, files = self._state
+        return [entries[name] for name in files]
+
+    def fingerprint(self) -> str:
+        """Hash of every filename and content hash; changes whenever the library does."""
+        payload = "\n".join(f"{info.filename}:{info.sha256}" for info in self.entries())
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def changed(self) -> bool:
+        """True if the directory's mtime differs from the last scan (one stat call)."""
+        try:
+            return os.stat(self.directory).st_mtime_ns != self._dir_mtime
+        except OSError:
+            return self._dir_mtime is not None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rescan the directory if it changed (or force); returns True if it did."""
+        with self._lock:
+            if not force and not self.changed():
+                return False
+            try:
+                dir_mtime = os.stat(self.directory).st_mtime_ns
+                scanned = [e for e in os.scandir(self.directory)
+                           if e.name.endswith(self.extension) and e.is_file()]
+            except OSError:
+                dir_mtime, scanned = None, []
+
+            entries = {}
+            for entry in scanned:
+                stat = entry.stat()
+                old = self._state[0].get(entry.name)
+                if old is not None and (old.size, old.mtime) == (stat.st_size, stat.st_mtime_ns):
+                    entries[entry.name] = old
+                    continue
+                try:
+                    duration, bitrate = mp3_info(entry.path)
+                    entries[entry.name] = AudioInfo(
+                        filename=entry.name, path=os.path.join(self.directory, entry.name),
+                        size=stat.st_size, mtime=stat.st_mtime_ns,
+                        duration=duration, bitrate=bitrate, sha256=file_hash(entry.path),
+                    )
+                except OSError as e:
+                    logger.warning(f"Could not index {entry.path}: {e}")
+
+            changed = entries != self._state[0]
+            self._state = (entries, tuple(sorted(entries)))
+            # Before the listeners run, so they can use the index
+            self._loaded.set()
+            self._dir_mtime = dir_mtime
+            if changed:
+                self.version += 1
+                logger.info(f"Indexed {len(entries)} audio files in {self.directory}")
+
+        if changed:
+            for listener in list(self.listeners):
+                try:
+                    listener(self.entries())
+                except Exception as e:
+                    logger.error(f"Error in audio index listener: {e}")
+        return True
+
+    def start_watching(self, interval: float):
+        """Poll the directory mtime every `interval` seconds and refresh on change."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def _run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Error refreshing audio index for {self.directory}: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=_run, name="audio-index", daemon=True)
+        self._thread.start()
+
+    def stop_watching(self):
+        self._stop.set()
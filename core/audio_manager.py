@@ -1,12 +1,20 @@
 import os
 import logging
+from core.audio_index import AudioIndex
+from core.audio_pipeline import AudioPipeline
+from core.cache import ByteCache
 
 logger = logging.getLogger(__name__)
 
 class AudioManager:
-    def __init__(self, config):
+    # Default seconds between checks of the audio directories for changes (audio.index_poll_seconds)
+    INDEX_POLL_SECONDS = 10
+    # Default size of the in-memory cache of pre-warmed audio (audio.memory_cache_mb)
+    MEMORY_CACHE_MB = 32
+
+    def __init__(self, config, base_path: str = "audio"):
         self.config = config
-        self.base_path = "audio"
+        self.base_path = base_path
         self.athan_dir = os.path.join(self.base_path, "athan")
         self.reminder_dir = os.path.join(self.base_path, "reminders")
         
@@ -14,23 +22,145 @@ class AudioManager:
         os.makedirs(self.athan_dir, exist_ok=True)
         os.makedirs(self.reminder_dir, exist_ok=True)
 
+        # Listings, lookups and metadata are served from memory
+        self.athan_index = AudioIndex(self.athan_dir)
+        self.reminder_index = AudioIndex(self.reminder_dir)
+        self.poll_interval = self.config.get("audio", "index_poll_seconds", self.INDEX_POLL_SECONDS) or 0
+        if self.poll_interval > 0:
+            self.athan_index.start_watching(self.poll_interval)
+            self.reminder_index.start_watching(self.poll_interval)
+        # Loudness-normalised, cast-friendly encodes (started by start_pipeline)
+        self.pipeline = AudioPipeline(config)
+        # media key -> file bytes, loaded ahead of scheduled playback (see prewarm)
+        self.byte_cache = ByteCache(int(self.config.get("audio", "memory_cache_mb", self.MEMORY_CACHE_MB) * 1024 * 1024))
+
+    def start_pipeline(self, on_change=None):
+        """Encode the library in the background and keep it encoded as files change.
+
+        on_change is called whenever the library or the set of encoded
+        variants changes, so callers can re-resolve their media URLs.
+        """
+        available = self.pipeline.available
+        if not available and self.pipeline.enabled:
+            logger.warning("ffmpeg not found; audio files will be cast as-is.")
+        for index in (self.athan_index, self.reminder_index):
+            if available:
+                index.listeners.append(self.pipeline.submit)
+                self.pipeline.submit(index.entries())
+            # Media URLs carry the content hash, so library changes matter even without encodes
+            if on_change is not None:
+                index.listeners.append(lambda entries: on_change())
+        if available and on_change is not None:
+            self.pipeline.listeners.append(on_change)
+
+    def _indexes(self) -> tuple:
+        if self.poll_interval <= 0:
+            # No watcher: check the directory mtimes on use instead
+            self.athan_index.refresh()
+            self.reminder_index.refresh()
+        return self.athan_index, self.reminder_index
+
     def list_athan_files(self) -> list:
         """List mp3 files in the athan directory."""
-        if not os.path.exists(self.athan_dir):
-            return []
-        
-        files = [f for f in os.listdir(self.athan_dir) if f.endswith(".mp3")]
-        files.sort()
-        return files
+        return self._indexes()[0].files()
 
     def list_reminder_files(self) -> list:
         """List mp3 files in the reminder directory."""
-        if not os.path.exists(self.reminder_dir):
-            return []
-        
-        files = [f for f in os.listdir(self.reminder_dir) if f.endswith(".mp3")]
-        files.sort()
-        return files
+        return self._indexes()[1].files()
+
+    def library(self) -> dict:
+        """Metadata (size, duration, bitrate, hash) for every indexed file."""
+        athan, reminders = self._indexes()
+        return {
+            "athan": [self._describe(info) for info in athan.entries()],
+            "reminders": [self._describe(info) for info in reminders.entries()],
+        }
+
+    def _describe(self, info) -> dict:
+        return dict(info.as_dict(), optimized=self.pipeline.variant(info) is not None)
+
+    def info(self, path: str):
+        """AudioInfo for a path under the athan or reminder directory, or None."""
+        if not path:
+            return None
+        directory, filename = os.path.split(os.path.abspath(path))
+        for index in self._indexes():
+            if os.path.abspath(index.directory) == directory:
+                return index.get(filename)
+        return None
+
+    def media_key(self, path: str):
+        """Content key for the bytes served for path (its encode if ready), or None.
+
+        Keys go into /media URLs, so a key always names the same content.
+        """
+        info = self.info(path)
+        if info is None:
+            return None
+        variant = self.pipeline.variant(info)
+        if variant is not None:
+            return os.path.splitext(os.path.basename(variant))[0]
+        return info.sha256[:16]
+
+    def media_path(self, key: str):
+        """File to serve for a media key, or None."""
+        for index in self._indexes():
+            for info in index.entries():
+                if info.sha256[:16] == key:
+                    return info.path
+        return self.pipeline.variant_by_key(key)
+
+    @staticmethod
+    def media_key_from_url(url: str):
+        """The media key in a /media/{key}/{filename} URL, or None."""
+        if not url or "/media/" not in url:
+            return None
+        return url.split("/media/", 1)[1].split("/", 1)[0] or None
+
+    def prewarm(self, key: str) -> bool:
+        """Load the file for a media key into memory ahead of playback.
+
+        Files too large for the cache are only read ahead into the OS page
+        cache. Returns True if the bytes are now held in memory.
+        """
+        if key is None:
+            return False
+        if key in self.byte_cache:
+            return True
+        path = self.media_path(key)
+        if path is None:
+            logger.warning(f"Nothing to pre-warm for media key {key}")
+            return False
+        try:
+            size = os.path.getsize(path)
+            if size > self.byte_cache.max_bytes:
+                with open(path, "rb") as f:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                logger.info(f"{os.path.basename(path)} is larger than the memory cache, read ahead only")
+                return False
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"Could not pre-warm {path}: {e}")
+            return False
+        self.byte_cache.put(key, data)
+        logger.info(f"Pre-warmed {os.path.basename(path)} ({len(data) // 1024} KiB) into memory")
+        return True
+
+    def cached_bytes(self, key: str):
+        """Pre-warmed bytes for a media key, or None."""
+        return self.byte_cache.get(key)
+
+    def fingerprint(self) -> str:
+        """Changes whenever a file is added, removed or modified."""
+        athan, reminders = self._indexes()
+        return f"{athan.fingerprint()}:{reminders.fingerprint()}:{self.pipeline.fingerprint()}"
+
+    def refresh(self, force: bool = True):
+        """Rescan both directories now, e.g. after replacing a file in place."""
+        self.athan_index.refresh(force=force)
+        self.reminder_index.refresh(force=force)
 
     def get_default_athan(self) -> str:
         """Get the default athan file from config."""
@@ -44,18 +174,19 @@ class AudioManager:
         if not filename:
             filename = self.get_default_athan()
         
+        athan_index = self._indexes()[0]
         path = os.path.join(self.athan_dir, filename)
-        if os.path.isfile(path):
+        if filename in athan_index:
             return path
         
         # Fallback to default if specified file doesn't exist
         default_path = os.path.join(self.athan_dir, self.get_default_athan())
-        if os.path.isfile(default_path):
+        if self.get_default_athan() in athan_index:
             logger.warning(f"Athan file '{filename}' not found, using default.")
             return default_path
         
         # Last resort: return first available athan file
-        available = self.list_athan_files()
+        available = athan_index.files()
         if available:
             logger.warning(f"Default athan not found, using '{available[0]}'.")
             return os.path.join(self.athan_dir, available[0])
@@ -68,13 +199,14 @@ class AudioManager:
         if not filename:
             filename = "beep.mp3"
             
+        reminder_index = self._indexes()[1]
         path = os.path.join(self.reminder_dir, filename)
-        if os.path.exists(path):
+        if filename in reminder_index:
             return path
             
         # Fallback to beep.mp3 if specific file missing
         beep_path = os.path.join(self.reminder_dir, "beep.mp3")
-        if os.path.exists(beep_path):
+        if "beep.mp3" in reminder_index:
             logger.warning(f"Reminder file '{filename}' not found, using beep.mp3.")
             return beep_path
         
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AudioPipeline:
+    """Background ffmpeg encodes of the audio library for casting.
+
+    Each file is loudness-normalised (EBU R128 loudnorm), has its leading
+    silence trimmed and is re-encoded as constant-bitrate MP3, so every
+    Athan starts straight away at the same level and buffers quickly. The
+    output is cached in `cache_dir` under the source's content hash plus a
+    hash of the settings, so an encode is only ever done once per file
+    content and settings. Until a variant exists (or if ffmpeg is not
+    installed) the original file is served.
+    """
+
+    CACHE_DIR = "cache/audio"
+    # Integrated loudness target in LUFS (audio.loudness_target)
+    LOUDNESS_TARGET = -16
+    # Encode bitrate (audio.cast_bitrate)
+    BITRATE = "128k"
+    SAMPLE_RATE = 44100
+    # Leading audio quieter than this is trimmed
+    SILENCE_THRESHOLD = "-50dB"
+    ENCODE_TIMEOUT = 300
+
+    def __init__(self, config, cache_dir: str = None, ffmpeg: str = None):
+        self.config = config
+        self.cache_dir = cache_dir or self.CACHE_DIR
+        self.ffmpeg = ffmpeg or shutil.which("ffmpeg")
+        self.enabled = bool(self.config.get("audio", "optimize", True))
+        # (source sha256, settings key) -> encoded path, for variants that exist
+        self._variants = {}
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {"encoded": 0, "cached": 0, "failed": 0}
+        # Called with no arguments when a new variant becomes available
+        self.listeners = []
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and self.ffmpeg is not None
+
+    def settings_key(self) -> str:
+        """Hash of the encode settings; part of every cached file name."""
+        settings = (self.config.get("audio", "loudness_target", self.LOUDNESS_TARGET),
+                    self.config.get("audio", "cast_bitrate", self.BITRATE),
+                    self.SAMPLE_RATE, self.SILENCE_THRESHOLD)
+        return hashlib.sha1(repr(settings).encode("utf-8")).hexdigest()[:8]
+
+    def variant_path(self, info) -> str:
+        return os.path.join(self.cache_dir, f"{info.sha256[:16]}-{self.settings_key()}.mp3")
+
+    def fingerprint(self) -> str:
+        """Changes whenever a variant becomes available."""
+        with self._lock:
+            paths = sorted(self._variants.values())
+        return hashlib.sha1("\n".join(paths).encode("utf-8")).hexdigest()[:16]
+
+    def variant(self, info):
+        """Path of the optimised encode for an AudioInfo, or None if not ready."""
+        if info is None:
+            return None
+        return self._variants.get((info.sha256, self.settings_key()))
+
+    def variant_by_key(self, key: str):
+        """Path of a ready variant by its file name without extension (see AudioManager.media_key)."""
+        with self._lock:
+            paths = list(self._variants.values())
+        for path in paths:
+            if os.path.splitext(os.path.basename(path))[0] == key:
+                return path
+        return None
+
+    def submit(self, entries):
+        """Queue AudioInfo entries for encoding; ones already cached are registered at once."""
+        if not self.available:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self.settings_key()
+        for info in entries:
+            with self._lock:
+                if (info.sha256, key) in self._variants or (info.sha256, key) in self._queued:
+                    continue
+                path = self.variant_path(info)
+                if os.path.isfile(path):
+                    self._variants[(info.sha256, key)] = path
+                    self.stats["cached"] += 1
+                    continue
+                self._queued.add((info.sha256, key))
+            self._queue.put(info)
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audio-pipeline", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            info = self._queue.get()
+            key = self.settings_key()
+            try:
+                path = self.encode(info)
+                if path is not None:
+                    with self._lock:
+                        self._variants[(info.sha256, key)] = path
+                    for listener in list(self.listeners):
+                        try:
+                            listener()
+                        except Exception as e:
+                            logger.error(f"Error in audio pipeline listener: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard((info.sha256, key))
+                self._queue.task_done()
+
+    def command(self, source: str, target: str) -> list:
+        loudness = self.config.get("audio", "loudness_target", self.LOUDNESS_TARGET)
+        filters = (
+            f"silenceremove=start_periods=1:start_threshold={self.SILENCE_THRESHOLD},"
+            f"loudnorm=I={loudness}:TP=-1.5:LRA=11"
+        )
+        return [
+            self.ffmpeg, "-y", "-hide_banner", "-loglevel", "error", "-i", source,
+            "-af", filters, "-ar", str(self.SAMPLE_RATE), "-map_metadata", "-1",
+            "-codec:a", "libmp3lame", "-b:a", self.config.get("audio", "cast_bitrate", self.BITRATE),
+            "-f", "mp3", target,
+        ]
+
+    def encode(self, info):
+        """Encode one file; returns the variant path or None on failure."""
+        target = self.variant_path(info)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        logger.info(f"Optimising {info.filename} for casting...")
+        try:
+            subprocess.run(self.command(info.path, tmp), check=True, capture_output=True,
+                           timeout=self.ENCODE_TIMEOUT)
+            os.replace(tmp, target)
+        except (OSError, subprocess.SubprocessError) as e:
+            stderr = getattr(e, "stderr", None)
+            detail = stderr.decode("utf-8", "replace").strip() if stderr else str(e)
+            logger.error(f"Could not optimise {info.filename}: {detail}")
+            self.stats["failed"] += 1
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+        self.stats["encoded"] += 1
+        logger.info(f"Optimised {info.filename} -> {target}")
+        return target
+
+    def wait(self):
+        """Block until every queued encode has finished."""
+        self._queue.join()
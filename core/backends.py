@@ -0,0 +1,342 @@
+"""
+Prayer time calculation backends.
+
+PrayerCalculator delegates the date-range calculation to a backend selected by
+`location.calculation_backend` in the config:
+
+- "islamic_times" (default): the islamic-times library (ITLocation).
+- "numpy": a lightweight vectorised NOAA-style solar position model, which
+  computes a whole range of dates in a handful of array operations and does
+  not import islamic-times at all.
+
+Both return times in the same convention as ITLocation without a timezone
+(UTC wall-clock, tzinfo stripped), so they can be swapped freely.
+"""
+from datetime import date, datetime
+import logging
+import numpy as np
+from core.timetable import PrayerTable
+from core.utils import gregorian_to_hijri_array
+
+logger = logging.getLogger(__name__)
+
+
+class CalculationBackend:
+    """Interface for prayer time calculation engines."""
+
+    name = None
+
+    def calculate_range(self, settings: dict, start: date, end: date) -> PrayerTable:
+        """Calculate Fajr..Isha for every date from start to end (inclusive).
+
+        `settings` is PrayerCalculator.location_settings(). Dates that cannot be
+        calculated are left as NaN rows.
+        """
+        raise NotImplementedError
+
+    def calculate_locations(self, settings: dict, coordinates: list, start: date, end: date) -> list:
+        """Calculate the same date range for many (latitude, longitude) pairs.
+
+        Returns one PrayerTable per coordinate, in order. The default simply
+        calls calculate_range() per location; backends that can vectorise
+        across locations override it.
+        """
+        return [
+            self.calculate_range(dict(settings, latitude=lat, longitude=lon), start, end)
+            for lat, lon in coordinates
+        ]
+
+
+class IslamicTimesBackend(CalculationBackend):
+    """Reference backend built on islamic_times.ITLocation."""
+
+    name = "islamic_times"
+
+    def create_location(self, settings: dict, calculation_date: date):
+        """Build an ITLocation configured from location settings."""
+        # Imported lazily: islamic-times is slow to import on ARMv6
+        from islamic_times.islamic_times import ITLocation
+
+        # Map Asr: 0 (Shafi/Std) or 1 (Hanafi)
+        asr_type = 1 if settings["asr_method"].upper() == "HANAFI" else 0
+
+        # Create ITLocation instance
+        # Note: elevation/temp/pressure used defaults
+        # We must convert date to datetime w/ default time for ITLocation
+        dt = datetime.combine(calculation_date, datetime.min.time())
+
+        it = ITLocation(
+            latitude=settings["latitude"],
+            longitude=settings["longitude"],
+            date=dt,
+            method=settings["calculation_method"],
+            asr_type=asr_type,
+            auto_calculate=True
+        )
+
+        # Apply custom angles if present in config
+        # Expected config: custom_angles: { fajr: 18.0, isha: 15.0, maghrib: 4.0 }
+        custom_angles = settings["custom_angles"]
+        if custom_angles:
+            fajr_angle = custom_angles.get("fajr")
+            maghrib_angle = custom_angles.get("maghrib")
+            isha_angle = custom_angles.get("isha")
+
+            # Check if we have valid floats
+            if any(x is not None for x in [fajr_angle, maghrib_angle, isha_angle]):
+                it.set_custom_prayer_angles(
+                    fajr_angle=float(fajr_angle) if fajr_angle is not None else None,
+                    maghrib_angle=float(maghrib_angle) if maghrib_angle is not None else None,
+                    isha_angle=float(isha_angle) if isha_angle is not None else None
+                )
+
+        # High Latitude Rule
+        high_lat_rule = settings["high_latitude_rule"]
+        if high_lat_rule and high_lat_rule != "NONE":
+            try:
+                it.set_extreme_latitude_rule(high_lat_rule)
+            except Exception as e:
+                logger.warning(f"Failed to set high latitude rule '{high_lat_rule}': {e}")
+
+        return it
+
+    def calculate_range(self, settings: dict, start: date, end: date) -> PrayerTable:
+        """One ITLocation is moved from day to day with update_time()."""
+        table = PrayerTable.empty(start, (end - start).days + 1)
+        try:
+            it = self.create_location(settings, start)
+        except Exception as e:
+            logger.error(f"Error calculating prayer times with islamic-times: {e}")
+            return table
+
+        for day in table.dates():
+            try:
+                if day != start:
+                    it.update_time(datetime.combine(day, datetime.min.time()))
+                    it.calculate_prayer_times()
+                pt = it.prayer_times()
+                times = {
+                    "Fajr": pt.fajr.time,
+                    "Sunrise": pt.sunrise.time,
+                    "Dhuhr": pt.zuhr.time,
+                    "Asr": pt.asr.time,
+                    "Maghrib": pt.maghrib.time,
+                    "Isha": pt.isha.time
+                }
+                # Remove timezone info to match local wall-time expectation of rest of app
+                table.set_row(day, {k: v.replace(tzinfo=None) for k, v in times.items()})
+            except Exception as e:
+                logger.error(f"Error calculating prayer times for {day}: {e}")
+
+        return table
+
+
+class NumpySolarBackend(CalculationBackend):
+    """Vectorised solar-angle backend (NOAA / Meeus low-precision equations).
+
+    Implements the angle-based methods of islamic-times: Fajr/Isha twilight
+    angles, Maghrib at sunset (+1 min) or at an angle, Makkah's fixed Isha
+    interval, Standard/Hanafi Asr, and the ANGLEBASED / MIDDLENIGHT /
+    ONESEVENTH / NEARESTLAT high latitude fallbacks. Accuracy against
+    ITLocation is checked by scripts/compare_backends.py.
+    """
+
+    name = "numpy"
+
+    # (fajr, isha, maghrib) angles in degrees; None isha = fixed interval after Maghrib
+    METHODS = {
+        "MWL": (18.0, 17.0, 0.0),
+        "ISNA": (15.0, 15.0, 0.0),
+        "EGYPT": (19.5, 17.5, 0.0),
+        "MAKKAH": (18.5, None, 0.0),
+        "KARACHI": (18.0, 18.0, 0.0),
+        "TEHRAN": (17.7, 14.0, 4.5),
+        "JAFARI": (16.0, 14.0, 4.0),
+        "FRANCE": (12.0, 12.0, 0.0),
+        "RUSSIA": (16.0, 15.0, 0.0),
+        "SINGAPORE": (20.0, 18.0, 0.0),
+    }
+    # Sunrise/sunset altitude (refraction + solar semi-diameter), as in islamic-times
+    SUNRISE_ANGLE = 5 / 6
+    # Above this latitude missing twilight events trigger the high latitude rule
+    EXTREME_LATITUDE = 46.5
+    ITERATIONS = 2
+
+    @staticmethod
+    def _sun(jd: np.ndarray):
+        """Apparent declination (radians) and equation of time (minutes) at JD (UT)."""
+        t = (jd - 2451545.0) / 36525.0
+        l0 = np.radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360.0)
+        m = np.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+        e = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+        c = (np.sin(m) * (1.914602 - t * (0.004817 + 0.000014 * t))
+             + np.sin(2 * m) * (0.019993 - 0.000101 * t)
+             + np.sin(3 * m) * 0.000289)
+        omega = np.radians(125.04 - 1934.136 * t)
+        apparent_long = np.radians(np.degrees(l0) + c - 0.00569 - 0.00478 * np.sin(omega))
+        eps0 = 23.0 + (26.0 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60.0) / 60.0
+        eps = np.radians(eps0 + 0.00256 * np.cos(omega))
+
+        declination = np.arcsin(np.sin(eps) * np.sin(apparent_long))
+        y = np.tan(eps / 2) ** 2
+        eot = 4 * np.degrees(
+            y * np.sin(2 * l0) - 2 * e * np.sin(m) + 4 * e * y * np.sin(m) * np.cos(2 * l0)
+            - 0.5 * y * y * np.sin(4 * l0) - 1.25 * e * e * np.sin(2 * m)
+        )
+        return declination, eot
+
+    @staticmethod
+    def _hour_angle(lat: np.ndarray, declination: np.ndarray, altitude) -> np.ndarray:
+        """Hour angle in minutes of time for a solar altitude (degrees); NaN if never reached."""
+        cos_h = ((np.sin(np.radians(altitude)) - np.sin(lat) * np.sin(declination))
+                 / (np.cos(lat) * np.cos(declination)))
+        with np.errstate(invalid="ignore"):
+            return 4 * np.degrees(np.arccos(np.where(np.abs(cos_h) <= 1, cos_h, np.nan)))
+
+    def _solve(self, jd0, lat_deg, lon_deg, angle=None, direction=0, asr_factor=None):
+        """Minutes after 00:00 UT of a solar event for each day.
+
+        direction: -1 = morning (rise), +1 = evening (set), 0 = transit.
+        The event time is refined by re-evaluating the sun at the event itself.
+        """
+        lat = np.radians(lat_deg)
+        minutes = 720.0 - 4 * lon_deg + 0.0 * jd0
+        event = minutes
+        for _ in range(self.ITERATIONS):
+            declination, eot = self._sun(jd0 + minutes / 1440.0)
+            transit = 720.0 - 4 * lon_deg - eot
+            if direction == 0:
+                event = minutes = transit
+                continue
+            if asr_factor is not None:
+                # Shadow length 1 + factor * noon shadow, the islamic-times definition
+                altitude = np.degrees(np.arctan(1.0 / (1.0 + asr_factor * np.tan(np.abs(lat - declination)))))
+            else:
+                altitude = -angle
+            event = transit + direction * self._hour_angle(lat, declination, altitude)
+            # Where the event does not exist, keep refining around transit
+            minutes = np.where(np.isnan(event), transit, event)
+        return event
+
+    def _angles(self, settings: dict):
+        method = settings["calculation_method"].strip().upper()
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported calculation method '{method}' for the numpy backend")
+        fajr, isha, maghrib = self.METHODS[method]
+
+        custom = settings["custom_angles"] or {}
+        overrides = {k: custom.get(k) for k in ("fajr", "maghrib", "isha")}
+        if any(v is not None for v in overrides.values()):
+            # Like ITLocation, custom angles turn the method into a plain angle method
+            fajr = float(overrides["fajr"]) if overrides["fajr"] is not None else fajr
+            maghrib = float(overrides["maghrib"]) if overrides["maghrib"] is not None else maghrib
+            isha = float(overrides["isha"]) if overrides["isha"] is not None else (isha or 999.0)
+        return fajr, isha, maghrib
+
+    def calculate_range(self, settings: dict, start: date, end: date) -> PrayerTable:
+        coordinates = [(float(settings["latitude"]), float(settings["longitude"]))]
+        return self.calculate_locations(settings, coordinates, start, end)[0]
+
+    def calculate_locations(self, settings: dict, coordinates: list, start: date, end: date) -> list:
+        """Vectorised over locations and dates: every array is (locations, days)."""
+        days = (end - start).days + 1
+        try:
+            fajr_angle, isha_angle, maghrib_angle = self._angles(settings)
+        except ValueError as e:
+            logger.error(f"Error calculating prayer times with numpy backend: {e}")
+            return [PrayerTable.empty(start, days) for _ in coordinates]
+
+        coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        lat = coords[:, :1]
+        lon = coords[:, 1:]
+        asr_factor = 2.0 if settings["asr_method"].upper() == "HANAFI" else 1.0
+        # JD at 00:00 UT of each date
+        jd0 = (start.toordinal() + 1721424.5) + np.arange(days, dtype=np.float64)
+
+        dhuhr = self._solve(jd0, lat, lon)
+        sunrise = self._solve(jd0, lat, lon, self.SUNRISE_ANGLE, -1)
+        sunset = self._solve(jd0, lat, lon, self.SUNRISE_ANGLE, 1)
+        asr = self._solve(jd0, lat, lon, direction=1, asr_factor=asr_factor)
+        fajr = self._solve(jd0, lat, lon, fajr_angle, -1)
+        if maghrib_angle > 0:
+            maghrib = self._solve(jd0, lat, lon, maghrib_angle, 1)
+        else:
+            maghrib = sunset + 1.0
+
+        if isha_angle is None:
+            # Umm al-Qura: 90 minutes after Maghrib, 120 during Ramadan
+            ordinals = np.arange(start.toordinal(), start.toordinal() + days)
+            ramadan = gregorian_to_hijri_array(ordinals)[:, 1] == 9
+            isha = maghrib + np.where(ramadan, 120.0, 90.0)
+        else:
+            isha = self._solve(jd0, lat, lon, isha_angle, 1)
+
+        if (np.abs(lat) > self.EXTREME_LATITUDE).any():
+            fajr, maghrib, isha = self._high_latitude(
+                settings, jd0, lat, lon, (fajr_angle, maghrib_angle, isha_angle),
+                sunrise, sunset, fajr, maghrib, isha)
+
+        seconds = np.stack([fajr, sunrise, dhuhr, asr, maghrib, isha], axis=-1) * 60.0
+        return [PrayerTable(start, seconds[i]) for i in range(len(coords))]
+
+    def _high_latitude(self, settings, jd0, lat, lon, angles, sunrise, sunset, fajr, maghrib, isha):
+        """Apply the configured high latitude rule on days with a missing event."""
+        rule = settings["high_latitude_rule"]
+        rule = "ANGLEBASED" if not rule or rule == "NONE" else rule.upper()
+        fajr_angle, maghrib_angle, isha_angle = angles
+        missing = ((np.isnan(fajr) | np.isnan(maghrib) | np.isnan(isha))
+                   & (np.abs(lat) > self.EXTREME_LATITUDE))
+        if not missing.any():
+            return fajr, maghrib, isha
+
+        if rule == "NEARESTLAT":
+            # Recalculate at the highest latitude where the Fajr angle is still reached
+            nearest = np.sign(lat) * (90.0 - 23.44 - fajr_angle - 0.01)
+            fajr = np.where(missing, self._solve(jd0, nearest, lon, fajr_angle, -1), fajr)
+            # islamic-times solves Maghrib at its own angle here, so 0 means geometric sunset
+            maghrib = np.where(missing, self._solve(jd0, nearest, lon, maghrib_angle, 1), maghrib)
+            if isha_angle is not None:
+                isha = np.where(missing, self._solve(jd0, nearest, lon, isha_angle, 1), isha)
+            return fajr, maghrib, isha
+
+        factors = {"MIDDLENIGHT": 1 / 2, "ONESEVENTH": 1 / 7, "ANGLEBASED": 1 / 60}
+        if rule not in factors:
+            logger.warning(f"Unsupported high latitude rule '{rule}', leaving missing times unset")
+            return fajr, maghrib, isha
+
+        night = 1440.0 + sunrise - sunset
+
+        def _portion(angle):
+            portion = factors[rule] * night
+            return portion * angle if rule == "ANGLEBASED" else portion
+
+        def _adjust(times, base, sign, angle):
+            # Same test as islamic-times: missing, or further after base than the portion
+            portion = _portion(angle)
+            with np.errstate(invalid="ignore"):
+                too_far = np.isnan(times) | (times - base > portion)
+            return np.where(missing & too_far, base + sign * portion, times)
+
+        fajr = _adjust(fajr, sunrise, -1, fajr_angle)
+        if maghrib_angle > 0:
+            maghrib = _adjust(maghrib, sunset, 1, maghrib_angle)
+        if isha_angle is not None:
+            isha = _adjust(isha, sunset, 1, isha_angle)
+        return fajr, maghrib, isha
+
+
+BACKENDS = {cls.name: cls for cls in (IslamicTimesBackend, NumpySolarBackend)}
+DEFAULT_BACKEND = IslamicTimesBackend.name
+
+_instances = {}
+
+
+def get_backend(name: str = None) -> CalculationBackend:
+    """Return the (shared) backend instance for a name, falling back to the default."""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        logger.warning(f"Unknown calculation backend '{name}', using '{DEFAULT_BACKEND}'")
+        name = DEFAULT_BACKEND
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
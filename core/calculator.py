@@ -1,23 +1,51 @@
-from islamic_times.islamic_times import ITLocation
 from datetime import date, datetime, timedelta
 import logging
 from config.config_manager import ConfigManager
+from core.timetable import PrayerTable, TimetableStore, location_fingerprint
+from core.cache import LRUCache
+from core.astronomy import AstronomyGrid
+from core.backends import get_backend, DEFAULT_BACKEND
 import math
+import bisect
+import threading
 
 logger = logging.getLogger(__name__)
 
 class PrayerCalculator:
     # Astronomy cache TTL in seconds (5 minutes)
     ASTRONOMY_CACHE_TTL = 300
+    # Spacing of the precomputed daily astronomy grid in seconds (5 minutes)
+    ASTRONOMY_GRID_STEP = 300
+    # Default number of (fingerprint, date) entries kept in memory
+    TIMES_CACHE_SIZE = 128
+    # Days (starting at the requested date) copied into memory on a cache miss
+    TIMES_CACHE_FILL_DAYS = 31
+    # Backend for many-location timetables (location.network_backend); numpy
+    # vectorises across sites, islamic_times would loop over every site and day
+    NETWORK_BACKEND = "numpy"
     
     def __init__(self, config: ConfigManager):
         self.config = config
-        # Cache: { date_str: { times dict } }
-        self._times_cache = {}
+        # Cache: { (fingerprint, date): { times dict } }, bounded LRU
+        self._times_cache = LRUCache(config.get("system", "times_cache_size", self.TIMES_CACHE_SIZE))
         self._cache_date = None
+        # Fingerprint of the location settings the astronomy cache was built for
+        self._fingerprint = None
+        # Rolling sorted timeline of prayer events for yesterday, today and tomorrow
+        # (times, names) parallel lists, swapped as one tuple so readers need no lock
+        self._timeline = ([], [])
+        self._timeline_day = None
+        self._timeline_fingerprint = None
+        self._timeline_lock = threading.Lock()
         # Astronomy cache
         self._astronomy_cache = None
         self._astronomy_cache_time = None
+        # Precomputed daily astronomy grid, built in a background thread
+        self._astronomy_grid = None
+        self._astronomy_thread = None
+        self._astronomy_lock = threading.Lock()
+        # Persistent yearly timetables, shared across restarts and config changes
+        self.store = TimetableStore(config.get("system", "timetable_cache_dir", "cache/timetables"))
 
     def _calculate_moon_index(self, dt):
         """Calculate generic moon age index (0-29) for image selection."""
@@ -44,99 +72,237 @@ class PrayerCalculator:
         return index
 
     def clear_cache(self):
-        """Clear all caches. Call this when config changes."""
-        self._times_cache = {}
+        """Clear all in-memory caches unconditionally."""
+        self._times_cache.clear()
         self._cache_date = None
         self._astronomy_cache = None
         self._astronomy_cache_time = None
+        self._timeline_day = None
         logger.debug("Prayer times and astronomy caches cleared")
 
+    def on_config_changed(self) -> bool:
+        """Invalidate caches only if location-relevant settings changed.
+
+        Cached times are keyed by fingerprint, so entries for the old settings
+        simply stop being hit and age out of the LRU (and are reused if the
+        settings are switched back). Returns True if the location changed.
+        """
+        fingerprint = self.fingerprint()
+        if fingerprint == self._fingerprint:
+            logger.debug("Config change does not affect prayer times, keeping caches")
+            return False
+
+        self._fingerprint = fingerprint
+        self._astronomy_cache = None
+        self._astronomy_cache_time = None
+        logger.debug(f"Location settings changed (fingerprint {fingerprint})")
+        return True
+
+    def cache_stats(self) -> dict:
+        """Hit/miss/eviction counters for the in-memory prayer times cache."""
+        return self._times_cache.stats()
+
+    def location_settings(self) -> dict:
+        """The subset of config that determines calculated prayer times."""
+        return {
+            "latitude": float(self.config.get("location", "latitude")),
+            "longitude": float(self.config.get("location", "longitude")),
+            "calculation_method": self.config.get("location", "calculation_method", "ISNA"),
+            "asr_method": self.config.get("location", "asr_method", "STANDARD"),
+            "custom_angles": self.config.get("location", "custom_angles", {}) or {},
+            "high_latitude_rule": self.config.get("location", "high_latitude_rule"),
+            "backend": self.config.get("location", "calculation_backend", DEFAULT_BACKEND),
+        }
+
+    def fingerprint(self) -> str:
+        """Hash of location_settings(), used to key cached timetables."""
+        return location_fingerprint(self.location_settings())
+
+    def calculate_range(self, start: date, end: date) -> PrayerTable:
+        """Calculate prayer times for every date from start to end (inclusive).
+
+        The work is done by the configured calculation backend (see
+        core.backends). Dates that fail to calculate are left as NaN rows.
+        """
+        if end < start:
+            raise ValueError(f"Range end {end} is before start {start}")
+
+        settings = self.location_settings()
+        table = get_backend(settings["backend"]).calculate_range(settings, start, end)
+        logger.debug(f"Calculated prayer times from {start} to {end} ({settings['backend']})")
+        return table
+
+    def get_year_table(self, year: int) -> PrayerTable:
+        """Return the full-year table, from disk if this location was seen before."""
+        fingerprint = self.fingerprint()
+        table = self.store.load_year(fingerprint, year)
+        if table is not None:
+            return table
+
+        table = self.calculate_range(date(year, 1, 1), date(year, 12, 31))
+        # NaN rows are kept: at high latitudes "no such prayer that day" is the
+        # answer, and recomputing the year on every miss would not change it
+        self.store.save_year(fingerprint, table, self.location_settings())
+        return table
+
+    def calculate_locations(self, locations: list, start: date, end: date) -> dict:
+        """Calculate start..end for many locations in one batched backend call.
+
+        `locations` are dicts with "name", "lat", "lng" and optionally
+        "country" (the core.cities format); every other setting comes from the
+        configured location, except the backend, which is
+        location.network_backend. Full years are shared with the timetable
+        store, so only locations not seen before are calculated. Returns
+        {(country, name): PrayerTable}.
+        """
+        if end < start:
+            raise ValueError(f"Range end {end} is before start {start}")
+
+        base = dict(self.location_settings(),
+                    backend=self.config.get("location", "network_backend", self.NETWORK_BACKEND))
+        backend = get_backend(base["backend"])
+        site_settings = [
+            dict(base, latitude=float(loc["lat"]), longitude=float(loc["lng"])) for loc in locations
+        ]
+        fingerprints = [location_fingerprint(s) for s in site_settings]
+        parts = [[] for _ in locations]
+
+        for year in range(start.year, end.year + 1):
+            tables = [self.store.load_year(fp, year) for fp in fingerprints]
+            missing = [i for i, table in enumerate(tables) if table is None]
+            if missing:
+                coordinates = [(site_settings[i]["latitude"], site_settings[i]["longitude"]) for i in missing]
+                computed = backend.calculate_locations(base, coordinates, date(year, 1, 1), date(year, 12, 31))
+                for i, table in zip(missing, computed):
+                    tables[i] = table
+                    self.store.save_year(fingerprints[i], table, site_settings[i])
+                logger.info(f"Calculated {year} for {len(missing)} of {len(locations)} locations")
+
+            for i, table in enumerate(tables):
+                parts[i].append(table.slice(start, end))
+
+        return {(loc.get("country"), loc["name"]): PrayerTable.concat(p) for loc, p in zip(locations, parts)}
+
     def calculate_times(self, calculation_date=None) -> dict:
-        """Calculate prayer times for a specific date (defaults to today)."""
+        """Calculate prayer times for a specific date (defaults to today).
+
+        On a cache miss the year around the date is loaded from the timetable
+        store (or calculated in one calculate_range() pass and saved), and the
+        following days are copied into the in-memory LRU as well.
+        """
         if calculation_date is None:
             calculation_date = date.today()
 
         # Check cache first
-        cache_key = str(calculation_date)
-        if cache_key in self._times_cache:
-            logger.debug(f"Returning cached prayer times for {cache_key}")
-            return self._times_cache[cache_key]
-
-        lat = self.config.get("location", "latitude")
-        lon = self.config.get("location", "longitude")
-        method_str = self.config.get("location", "calculation_method", "ISNA")
-        asr_str = self.config.get("location", "asr_method", "STANDARD")
-        
-        # Map Asr: 0 (Shafi/Std) or 1 (Hanafi)
-        asr_type = 1 if asr_str.upper() == "HANAFI" else 0
+        try:
+            fingerprint = self.fingerprint()
+        except Exception as e:
+            logger.error(f"Invalid location settings: {e}")
+            return {}
+        cache_key = (fingerprint, calculation_date)
+        cached = self._times_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Returning cached prayer times for {calculation_date}")
+            return cached
 
-        # Create ITLocation instance
-        # Note: elevation/temp/pressure used defaults
         try:
-            # We must convert date to datetime w/ default time for ITLocation
-            dt = datetime.combine(calculation_date, datetime.min.time())
-            
-            it = ITLocation(
-                latitude=float(lat),
-                longitude=float(lon),
-                date=dt,
-                method=method_str,
-                asr_type=asr_type,
-                auto_calculate=True
-            )
-            
-            # Apply custom angles if present in config
-            # Expected config: custom_angles: { fajr: 18.0, isha: 15.0, maghrib: 4.0 }
-            custom_angles = self.config.get("location", "custom_angles", {})
-            if custom_angles:
-                fajr_angle = custom_angles.get("fajr")
-                maghrib_angle = custom_angles.get("maghrib")
-                isha_angle = custom_angles.get("isha")
-                
-                # Check if we have valid floats
-                if any(x is not None for x in [fajr_angle, maghrib_angle, isha_angle]):
-                    it.set_custom_prayer_angles(
-                        fajr_angle=float(fajr_angle) if fajr_angle is not None else None,
-                        maghrib_angle=float(maghrib_angle) if maghrib_angle is not None else None,
-                        isha_angle=float(isha_angle) if isha_angle is not None else None
-                    )
-
-            # High Latitude Rule
-            high_lat_rule = self.config.get("location", "high_latitude_rule")
-            if high_lat_rule and high_lat_rule != "NONE":
+            table = self.get_year_table(calculation_date.year)
+        except Exception as e:
+            logger.error(f"Error loading prayer timetable: {e}")
+            return {}
+
+        fill_end = min(calculation_date + timedelta(days=self.TIMES_CACHE_FILL_DAYS - 1), table.end)
+        day = calculation_date
+        while day <= fill_end:
+            # Days without times (NaN rows) are cached too; the stored year would give the same answer
+            self._times_cache.put((fingerprint, day), table.row(day))
+            day += timedelta(days=1)
+        logger.debug(f"Cached prayer times for {calculation_date} to {fill_end}")
+
+        return table.row(calculation_date)
+
+    def build_astronomy_grid(self, day: date = None) -> AstronomyGrid:
+        """Sample sun position and moon illumination over a whole day.
+
+        One ITLocation is stepped across the grid with update_time(); the moon
+        phase list is taken once at midday.
+        """
+        # Imported lazily: islamic-times is slow to import on ARMv6
+        from islamic_times.islamic_times import ITLocation
+
+        day = day or date.today()
+        lat = float(self.config.get("location", "latitude"))
+        lon = float(self.config.get("location", "longitude"))
+        step = self.ASTRONOMY_GRID_STEP
+
+        samples = AstronomyGrid.sample_times(day, step)
+        it = ITLocation(latitude=lat, longitude=lon, date=samples[0])
+        altitude, azimuth, illumination = [], [], []
+        for dt in samples:
+            it.update_time(dt)
+            sun = it.sun()
+            altitude.append(sun.apparent_altitude.decimal)
+            azimuth.append(sun.true_azimuth.decimal)
+            illumination.append(it.moon().illumination)
+
+        it.update_time(datetime.combine(day, datetime.min.time()) + timedelta(hours=12))
+        phases = [(name, when.replace(tzinfo=None)) for name, when in it.moonphases()]
+
+        return AstronomyGrid(day, (lat, lon), step, altitude, azimuth, illumination, phases)
+
+    def start_astronomy_precompute(self, day: date = None):
+        """Build the astronomy grid for a day in a background thread."""
+        day = day or date.today()
+        with self._astronomy_lock:
+            if self._astronomy_thread is not None and self._astronomy_thread.is_alive():
+                return
+
+            def _run():
                 try:
-                    it.set_extreme_latitude_rule(high_lat_rule)
+                    self._astronomy_grid = self.build_astronomy_grid(day)
+                    logger.info(f"Astronomy grid ready for {day}")
                 except Exception as e:
-                    logger.warning(f"Failed to set high latitude rule '{high_lat_rule}': {e}")
+                    logger.error(f"Error precomputing astronomy grid: {e}")
+
+            self._astronomy_thread = threading.Thread(target=_run, name="astronomy-grid", daemon=True)
+            self._astronomy_thread.start()
 
-            pt = it.prayer_times()
+    def get_astronomy_data(self):
+        """Get Moon Phase, Illumination, and Sun position.
 
-            times = {
-                "Fajr": pt.fajr.time,
-                "Sunrise": pt.sunrise.time,
-                "Dhuhr": pt.zuhr.time,
-                "Asr": pt.asr.time,
-                "Maghrib": pt.maghrib.time,
-                "Isha": pt.isha.time
+        Served by interpolating the precomputed daily grid. Until that grid is
+        ready (first request of the day, location change) it is built in the
+        background and a direct calculation, cached for 5 minutes, is returned.
+        """
+        now = datetime.now()
+
+        try:
+            location = (float(self.config.get("location", "latitude")),
+                        float(self.config.get("location", "longitude")))
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error calculating astronomy data: {e}")
+            return None
+
+        grid = self._astronomy_grid
+        if grid is not None and grid.covers(now.date(), location):
+            values = grid.interpolate(now)
+            nearest_phase = grid.nearest_phase(now)
+            return {
+                "moon_illumination": round(values["moon_illumination"] * 100, 1),
+                "moon_image_index": self._calculate_moon_index(now),
+                "nearest_phase": {
+                    "name": nearest_phase[0],
+                    "date": nearest_phase[1].strftime("%Y-%m-%d %H:%M")
+                },
+                "sun_altitude": round(values["sun_altitude"], 1),
+                "sun_azimuth": round(values["sun_azimuth"], 1)
             }
-            
-            # Remove timezone info to match local wall-time expectation of rest of app
-            result = {k: v.replace(tzinfo=None) for k, v in times.items()}
-            
-            # Store in cache
-            self._times_cache[cache_key] = result
-            logger.debug(f"Cached prayer times for {cache_key}")
-            
-            return result
 
-        except Exception as e:
-            logger.error(f"Error calculating prayer times with islamic-times: {e}")
-            return {}
+        self.start_astronomy_precompute(now.date())
+        return self._get_astronomy_data_direct(now)
 
-    def get_astronomy_data(self):
-        """Get Moon Phase, Illumination, and Sun position (cached for 5 minutes)."""
-        now = datetime.now()
-        
+    def _get_astronomy_data_direct(self, now: datetime):
+        """Calculate astronomy data for now without the grid (cached for 5 minutes)."""
         # Return cached data if still fresh
         if (self._astronomy_cache is not None and 
             self._astronomy_cache_time is not None and
@@ -149,6 +315,8 @@ class PrayerCalculator:
         dt = now
         
         try:
+            from islamic_times.islamic_times import ITLocation
+
             it = ITLocation(
                 latitude=float(lat),
                 longitude=float(lon),
@@ -158,19 +326,8 @@ class PrayerCalculator:
             moon = it.moon()
             sun = it.sun()
             
-            # Get phase name
-            # it.moonphases() returns nearest phases (list of tuples)
+            # it.moonphases() returns the nearest phases as (name, datetime) tuples
             phases = it.moonphases()
-            
-            # Simple heuristic for current phase name: find the nearest PREVIOUS phase
-            current_phase_name = "Unknown"
-            # Sort by date
-            sorted_phases = sorted(phases, key=lambda x: x[1])
-            
-            # Logic: If now is after New Moon but before First Quarter -> Waxing Crescent
-            # This is complex to do perfectly with just 4 points. 
-            # For now, let's just return illumination and the nearest *upcoming* phase
-            
             nearest_phase = min(phases, key=lambda x: abs((x[1].replace(tzinfo=None) - dt).total_seconds()))
             
             # Calculate moon index for image (0-29)
@@ -197,28 +354,67 @@ class PrayerCalculator:
             logger.error(f"Error calculating astronomy data: {e}")
             return None
 
-    def get_next_prayer(self):
-        """Determine the next prayer based on current time."""
-        now = datetime.now()
-        today_times = self.calculate_times(date.today())
-        
-        if not today_times:
+    def _day_events(self, day: date) -> list:
+        """Sorted (time, prayer) events for one day, or [] if it failed to calculate."""
+        return sorted((t, name) for name, t in self.calculate_times(day).items())
+
+    def _ensure_timeline(self, now: datetime):
+        """Keep the yesterday/today/tomorrow timeline current.
+
+        Crossing a single day boundary only drops yesterday's events and appends
+        the new tomorrow's; anything else (first use, location change, clock jump)
+        rebuilds all three days.
+        """
+        today = now.date()
+        fingerprint = self.fingerprint()
+        with self._timeline_lock:
+            if self._timeline_day == today and self._timeline_fingerprint == fingerprint:
+                return
+
+            tomorrow = today + timedelta(days=1)
+            if (self._timeline_fingerprint == fingerprint and
+                    self._timeline_day == today - timedelta(days=1)):
+                # Incremental roll: events before yesterday's midnight go, tomorrow comes in
+                cutoff = datetime.combine(today - timedelta(days=1), datetime.min.time())
+                times, names = self._timeline
+                keep = bisect.bisect_left(times, cutoff)
+                events = list(zip(times[keep:], names[keep:]))
+                new_events = self._day_events(tomorrow)
+                complete = bool(new_events)
+                events = sorted(events + new_events)
+            else:
+                days = [self._day_events(today + timedelta(days=d)) for d in (-1, 0, 1)]
+                complete = all(days)
+                events = sorted(e for day_events in days for e in day_events)
+
+            self._timeline = ([t for t, _ in events], [name for _, name in events])
+            self._timeline_fingerprint = fingerprint
+            # Leave the day unset after a failure so the next call retries
+            self._timeline_day = today if complete else None
+            logger.debug(f"Prayer timeline rebuilt for {today} ({len(events)} events)")
+
+    def get_next_prayer(self, now: datetime = None):
+        """Return (name, time) of the first prayer strictly after now."""
+        now = now or datetime.now()
+        self._ensure_timeline(now)
+        times, names = self._timeline
+        i = bisect.bisect_right(times, now)
+        if i >= len(times):
             return None, None
+        return names[i], times[i]
 
-        # Check today's remaining prayers
-        for prayer, time_obj in today_times.items():
-            # Ensure time_obj is naive to match 'now'
-            if time_obj.tzinfo is not None:
-                time_obj = time_obj.replace(tzinfo=None)
-            
-            if time_obj > now:
-                return prayer, time_obj
-        
-        # If none, it's Fajr tomorrow
-        tomorrow = date.today() + timedelta(days=1)
-        tomorrow_times = self.calculate_times(tomorrow)
-        
-        if not tomorrow_times:
-             return None, None
-             
-        return "Fajr", tomorrow_times.get("Fajr")
+    def get_previous_prayer(self, now: datetime = None):
+        """Return (name, time) of the latest prayer at or before now."""
+        now = now or datetime.now()
+        self._ensure_timeline(now)
+        times, names = self._timeline
+        i = bisect.bisect_right(times, now)
+        if i == 0:
+            return None, None
+        return names[i - 1], times[i - 1]
+
+    def time_until_next_prayer(self, now: datetime = None):
+        """Return the timedelta until the next prayer, or None if unknown."""
+        now = now or datetime.now()
+        _, next_time = self.get_next_prayer(now)
+        return next_time - now if next_time else None
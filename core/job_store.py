@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """SQLite record of the scheduler's planned jobs and what happened to them.
+
+    Each row is one planned Athan/reminder/warm-up job with everything needed
+    to re-add it (kind, prayer, run time, settings), plus its status:
+    pending, fired or missed. On restart the scheduler re-adds the pending
+    rows straight from here instead of recalculating prayer times, and rows
+    whose time passed while it was down are reported as missed.
+
+    Uses the standard library sqlite3 module, one short-lived connection per
+    call, so it is safe to use from APScheduler worker threads.
+    """
+
+    # Keep fired/missed history this long
+    HISTORY_DAYS = 7
+
+    def __init__(self, path: str = "cache/jobs.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, kind TEXT NOT NULL, prayer TEXT, run_date TEXT NOT NULL,"
+                " payload TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending', updated TEXT)"
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def replace_pending(self, jobs: list, version: str = None):
+        """Replace every pending job with `jobs` (dicts from AthanScheduler.plan_jobs).
+
+        Jobs already fired or missed keep their row and status: a re-plan
+        during a job's pre-roll still includes it, and it must not become
+        pending again (restore_jobs would replay it after a restart).
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (job["id"], job["kind"], job.get("prayer"), job["run_date"].isoformat(),
+             json.dumps(job, default=_encode), now)
+            for job in jobs
+        ]
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM jobs WHERE status = 'pending'")
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (id, kind, prayer, run_date, payload, status, updated)"
+                " VALUES (?, ?, ?, ?, ?, 'pending', ?)", rows
+            )
+            if version is not None:
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+            cutoff = (datetime.now() - timedelta(days=self.HISTORY_DAYS)).isoformat()
+            db.execute("DELETE FROM jobs WHERE status != 'pending' AND run_date < ?", (cutoff,))
+
+    def pending(self) -> list:
+        """Pending jobs ordered by run time, decoded back into dicts."""
+        with self._lock, self._connect() as db:
+            rows = db.execute("SELECT payload FROM jobs WHERE status = 'pending' ORDER BY run_date").fetchall()
+        return [json.loads(payload, object_hook=_decode) for (payload,) in rows]
+
+    def version(self):
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else None
+
+    def set_status(self, job_id: str, status: str):
+        with self._lock, self._connect() as db:
+            db.execute("UPDATE jobs SET status = ?, updated = ? WHERE id = ?",
+                       (status, datetime.now().isoformat(), job_id))
+
+    def history(self, status: str = None, since: datetime = None) -> list:
+        """(id, kind, prayer, run_date, status) rows, newest first."""
+        query = "SELECT id, kind, prayer, run_date, status FROM jobs WHERE 1 = 1"
+        params = []
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        if since is not None:
+            query += " AND run_date >= ?"
+            params.append(since.isoformat())
+        with self._lock, self._connect() as db:
+            return db.execute(query + " ORDER BY run_date DESC", params).fetchall()
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def _decode(obj: dict):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
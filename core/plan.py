@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+
+class Frozen:
+    """Immutable value object over __slots__, with value equality and hashing."""
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class PrayerPlan(Frozen):
+    """One prayer's settings compiled from the config.
+
+    Audio files are resolved to media URLs (with AudioManager's fallbacks)
+    and offsets to signed timedeltas once per config version, so nothing
+    is looked up when a job fires.
+    """
+
+    __slots__ = ("prayer", "athan_enabled", "athan_url", "athan_volume", "athan_shift",
+                 "reminder_enabled", "reminder_url", "reminder_volume", "reminder_shift",
+                 "reminder_label", "devices")
+
+
+class Trigger(Frozen):
+    """A single scheduled action at an absolute time.
+
+    kind is "athan", "reminder" or "warm". run_date is when the job runs,
+    start_at the instant audio should start (pre-roll) or None to start at
+    once. devices is a frozenset of UUID strings; empty means all enabled
+    devices for an Athan.
+    """
+
+    __slots__ = ("id", "kind", "prayer", "name", "run_date", "start_at",
+                 "url", "image_url", "volume", "devices")
+
+    def play_time(self) -> datetime:
+        return self.start_at or self.run_date
+
+    def to_dict(self) -> dict:
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values["devices"] = sorted(self.devices)
+        return values
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "Trigger":
+        return cls(**dict(values, devices=frozenset(values["devices"])))
+
+
+def signed_shift(minutes, timing: str) -> timedelta:
+    """Offset in minutes applied "before" (default) or "after" the prayer time."""
+    shift = timedelta(minutes=minutes or 0)
+    return shift if timing == "after" else -shift
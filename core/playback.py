@@ -0,0 +1,86 @@
+import threading
+import uuid as uuid_lib
+from collections import OrderedDict
+from datetime import datetime
+
+
+class Playback:
+    """Progress of one Athan/reminder playback, shared with the Cast manager.
+
+    `results` holds the per-device result dicts from CastManager; they are
+    filled in while playback runs, so as_dict() shows live progress.
+    """
+
+    def __init__(self, trigger):
+        self.id = uuid_lib.uuid4().hex[:12]
+        self.kind = trigger.kind
+        self.prayer = trigger.prayer
+        self.name = trigger.name
+        self.start_at = trigger.start_at
+        self.state = "pending"
+        self.created = datetime.now()
+        self.finished = None
+        # Wall-clock timings: job callback start and dispatch to the devices
+        self.callback_at = None
+        self.dispatched_at = None
+        self.error = None
+        self.results = []
+        # concurrent.futures.Future of the playback coroutine (asyncio mode)
+        self.future = None
+
+    def finish(self, error: str = None):
+        statuses = [r["status"] for r in self.results]
+        if error is not None:
+            self.state = "failed"
+        elif "aborted" in statuses:
+            self.state = "stopped"
+        elif "playing" in statuses or not statuses:
+            self.state = "done"
+        else:
+            self.state = "failed"
+        self.error = error
+        self.finished = datetime.now()
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "prayer": self.prayer,
+            "name": self.name,
+            "state": self.state,
+            "start_at": self.start_at.isoformat() if self.start_at else None,
+            "created": self.created.isoformat(),
+            "callback_at": self.callback_at.isoformat() if self.callback_at else None,
+            "dispatched_at": self.dispatched_at.isoformat() if self.dispatched_at else None,
+            "finished": self.finished.isoformat() if self.finished else None,
+            "error": self.error,
+            "devices": [dict(r) for r in self.results],
+        }
+
+
+class PlaybackTracker:
+    """The most recent playbacks by id, for the /api/playback endpoints."""
+
+    MAX_HISTORY = 50
+
+    def __init__(self, max_history: int = None):
+        self.max_history = max_history or self.MAX_HISTORY
+        self._playbacks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, trigger) -> Playback:
+        playback = Playback(trigger)
+        with self._lock:
+            self._playbacks[playback.id] = playback
+            while len(self._playbacks) > self.max_history:
+                self._playbacks.popitem(last=False)
+        return playback
+
+    def get(self, playback_id: str):
+        with self._lock:
+            return self._playbacks.get(playback_id)
+
+    def recent(self) -> list:
+        """Playbacks, newest first."""
+        with self._lock:
+            return list(reversed(self._playbacks.values()))
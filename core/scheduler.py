@@ -1,37 +1,93 @@
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 from core.calculator import PrayerCalculator
+from core.job_store import JobStore
+from core.metrics import MetricsRegistry
+from core.plan import PrayerPlan, Trigger, signed_shift
+from core.playback import Playback, PlaybackTracker
+from core.timetable import PRAYER_NAMES
 from core.audio_manager import AudioManager
 from integrations.cast_manager import CastManager
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import threading
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 class AthanScheduler:
-    def __init__(self, config):
+    # Default seconds a job starts ahead of its play time (audio.preroll_seconds)
+    PREROLL_SECONDS = 10
+    # Default seconds before a job to (re)connect its speakers (devices.warm_up_seconds)
+    WARM_UP_SECONDS = 60
+    # Default hours of jobs kept scheduled ahead (system.job_horizon_hours, 24-72)
+    JOB_HORIZON_HOURS = 48
+    # Default seconds a job may still run late, e.g. right after a restart (system.misfire_grace_seconds)
+    MISFIRE_GRACE_SECONDS = 300
+    # Cover image shown on speakers with a screen
+    IMAGE_PATH = "web/static/img/athan_background.png"
+    JOB_EVENTS = {EVENT_JOB_EXECUTED: "executed", EVENT_JOB_ERROR: "error", EVENT_JOB_MISSED: "missed"}
+    # Config sections the job plan is built from; a change to any other section needs no re-plan
+    PLAN_SECTIONS = frozenset({"location", "prayers", "audio", "devices", "system"})
+
+    def __init__(self, config, audio_manager=None, cast_manager=None, loop=None):
         self.config = config
-        self.scheduler = BackgroundScheduler()
+        # asyncio execution mode: jobs and playback run on this event loop (uvicorn's)
+        self.loop = loop
+        self.scheduler = AsyncIOScheduler(event_loop=loop) if loop is not None else BackgroundScheduler()
         self.calculator = PrayerCalculator(config)
-        self.audio_manager = AudioManager(config)
-        self.cast_manager = CastManager(config)
-        # Helper to track jobs
-        self.today_jobs = []
+        self.audio_manager = audio_manager or AudioManager(config)
+        self.cast_manager = cast_manager or CastManager(config, audio_manager=self.audio_manager)
+        # Currently scheduled horizon jobs: id -> job dict (see plan_jobs)
+        self.planned = {}
+        self._refresh_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._refresh_thread = None
+        self._refresh_thread_lock = threading.Lock()
+        # (settings version, {prayer: PrayerPlan})
+        self._compiled = None
+        self.playbacks = PlaybackTracker()
+        self.metrics = MetricsRegistry()
+        self.metrics_job_events = self.metrics.counter(
+            "athan_scheduler_job_events_total", "APScheduler job outcomes (executed, error, missed)")
+        self.metrics_playbacks = self.metrics.counter(
+            "athan_playbacks_total", "Finished playbacks by kind, source and final state")
+        self.metrics_callback_delay = self.metrics.histogram(
+            "athan_job_callback_delay_seconds", "Job callback start minus its scheduled run time")
+        self.metrics_play_issued_delay = self.metrics.histogram(
+            "athan_play_issued_delay_seconds", "Per device: play command issued minus the time audio was due")
+        self.metrics_playing_delay = self.metrics.histogram(
+            "athan_playing_delay_seconds", "Per device: media session active minus the time audio was due")
+        # Prayers that passed while the scheduler was not running (see restore_jobs)
+        self.missed_jobs = []
+        self.job_store = JobStore(config.get("system", "job_store_path", "cache/jobs.sqlite"))
+        self.scheduler.add_listener(self.on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
 
     def start(self):
-        """Start the scheduler and schedule today's prayers."""
+        """Start the scheduler and schedule the upcoming prayers."""
         logger.info("Starting Scheduler...")
         self.scheduler.start()
         
         # Start the Cast discovery in background
         self.cast_manager.start_discovery()
+
+        # Encode the audio library for casting; re-plan as encodes become ready
+        self.audio_manager.start_pipeline(on_change=self.request_refresh)
+
+        # Re-plan on every config change, from the API or an edit to config.yaml
+        self.config.listeners.append(self.on_config_changed)
         
         # Schedule the daily refresh job
         self.schedule_daily_refresh()
         
-        # Schedule today's prayers immediately
-        self.refresh_prayer_times()
+        # Resume the stored job plan; recalculate only if it is stale
+        if not self.restore_jobs():
+            self.refresh_prayer_times()
 
     def schedule_daily_refresh(self):
         """Schedule the job that recalculates prayer times every night at 12:01 AM."""
@@ -81,87 +137,450 @@ class AthanScheduler:
 
         return settings
 
+    def job_horizon(self) -> timedelta:
+        hours = self.config.get("system", "job_horizon_hours", self.JOB_HORIZON_HOURS)
+        return timedelta(hours=min(max(hours, 24), 72))
+
+    def settings_version(self) -> str:
+        """Hash of the config (and available audio files) that the compiled plans depend on."""
+        payload = json.dumps({
+            "prayers": self.config.get("prayers"),
+            "audio": self.config.get("audio"),
+            "devices": self.config.get("devices"),
+            "audio_files": self.audio_manager.fingerprint(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def plan_version(self) -> str:
+        """Hash of everything that shapes the job plan, stored alongside it."""
+        payload = f"{self.calculator.fingerprint()}:{self.settings_version()}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def compiled_plans(self) -> dict:
+        """{prayer: PrayerPlan}, compiled once per settings version."""
+        version = self.settings_version()
+        plans = self._compiled
+        if plans is None or plans[0] != version:
+            plans = (version, {name: self.compile_plan(name) for name in PRAYER_NAMES})
+            self._compiled = plans
+            logger.debug(f"Compiled prayer plans for settings version {version}")
+        return plans[1]
+
+    def compile_plan(self, prayer_name: str) -> PrayerPlan:
+        """Resolve a prayer's settings into an immutable PrayerPlan."""
+        settings = self.get_prayer_settings(prayer_name)
+        devices = frozenset(str(uuid) for uuid in settings["enabled_devices"] or [])
+        athan_enabled = bool(settings["athan_enabled"])
+        # play_reminder never played reminders without an explicit device list
+        reminder_enabled = bool(settings["reminder_enabled"]) and settings["reminder_offset"] > 0 and bool(devices)
+
+        return PrayerPlan(
+            prayer=prayer_name,
+            athan_enabled=athan_enabled,
+            athan_url=self._resolve_url(self.audio_manager.get_athan_path(settings["athan_audio_file"]))
+            if athan_enabled else None,
+            athan_volume=settings["athan_volume"],
+            athan_shift=signed_shift(settings["athan_offset"], settings["athan_timing"]),
+            reminder_enabled=reminder_enabled,
+            reminder_url=self._resolve_url(self.audio_manager.get_reminder_path(settings["reminder_audio_file"]))
+            if reminder_enabled else None,
+            reminder_volume=settings["reminder_volume"],
+            reminder_shift=signed_shift(settings["reminder_offset"], settings["reminder_timing"]),
+            reminder_label=f"{settings['reminder_timing']} {settings['reminder_offset']}m",
+            devices=devices,
+        )
+
+    def _resolve_url(self, audio_path: str):
+        if self.audio_manager.info(audio_path) is None:
+            logger.warning(f"Audio file not found: {audio_path}")
+            return None
+        return self.cast_manager.media_url(audio_path)
+
     def refresh_prayer_times(self):
-        """Calculate times for today and schedule audio playback."""
-        logger.info("Refreshing prayer times for today...")
+        """Calculate times for the job horizon (48h by default) and schedule audio playback."""
+        logger.info("Refreshing prayer times...")
         
-        # Clear existing prayer jobs if any (except daily_refresh)
-        for job_id in self.today_jobs:
+        with self._refresh_lock:
+            # Calculator returns offset-naive datetimes (local wall-clock time)
+            now = datetime.now()
+            jobs = self.plan_jobs(now, now + self.job_horizon())
+            # Sample today's sun/moon positions off the request path
+            self.calculator.start_astronomy_precompute()
+
+            self.apply_jobs(jobs)
+            self.job_store.replace_pending([job.to_dict() for job in jobs], self.plan_version())
+
+    def request_refresh(self):
+        """Apply a config change in the background and return immediately.
+
+        Requests made while a refresh is running are coalesced into one more
+        refresh, which then sees the latest saved config.
+        """
+        self._refresh_requested.set()
+        with self._refresh_thread_lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(target=self._refresh_worker, name="refresh", daemon=True)
+                self._refresh_thread.start()
+
+    def on_config_changed(self, old: dict, new: dict):
+        """ConfigManager listener: re-plan if a section the jobs depend on changed."""
+        changed = sorted(section for section in set(old) | set(new) if old.get(section) != new.get(section))
+        if not self.PLAN_SECTIONS.intersection(changed):
+            return
+        logger.info(f"Configuration changed ({', '.join(changed)}), re-planning jobs")
+        self.request_refresh()
+
+    def _refresh_worker(self):
+        while True:
+            self._refresh_requested.wait()
+            self._refresh_requested.clear()
+            try:
+                # Drop cached times/astronomy only if location-relevant settings changed
+                self.calculator.on_config_changed()
+                self.refresh_prayer_times()
+            except Exception as e:
+                logger.error(f"Error applying configuration change: {e}")
+
+    def plan_jobs(self, now: datetime, horizon_end: datetime) -> list:
+        """Triggers for every Athan/reminder (and its warm-up) in (now, horizon_end]."""
+        plans = self.compiled_plans()
+        image_url = self.cast_manager.image_url(self.IMAGE_PATH)
+        jobs = []
+        day = now.date()
+        while day <= horizon_end.date():
+            # Calculate new times
+            times = self.calculator.calculate_times(day)
+            for prayer_name, prayer_time in times.items():
+                jobs.extend(self._plan_prayer(plans[prayer_name], prayer_time, now, horizon_end, image_url))
+            day += timedelta(days=1)
+        jobs.sort(key=lambda job: job.run_date)
+        return jobs
+
+    def _plan_prayer(self, plan: PrayerPlan, prayer_time: datetime, now: datetime, horizon_end: datetime,
+                     image_url: str) -> list:
+        jobs = []
+        suffix = prayer_time.strftime("%Y%m%d")
+
+        # Decoupled Logic: Continue if EITHER Athan OR Reminder is enabled
+        if not plan.athan_enabled and not plan.reminder_enabled:
+            logger.debug(f"Skipping {plan.prayer} (All Disabled)")
+            return jobs
+
+        # Only schedule Athan if specifically enabled
+        if plan.athan_enabled:
+            athan_time = prayer_time + plan.athan_shift
+            if now < athan_time <= horizon_end:
+                # Athan (pre-rolled so it sounds exactly at athan_time)
+                run_date, start_at = self.preroll_times(athan_time)
+                jobs.append(Trigger(
+                    id=f"athan_{plan.prayer}_{suffix}", kind="athan", prayer=plan.prayer,
+                    name=f"Athan for {plan.prayer}", run_date=run_date, start_at=start_at,
+                    url=plan.athan_url, image_url=image_url, volume=plan.athan_volume, devices=plan.devices,
+                ))
+
+        # Schedule Reminder independently
+        if plan.reminder_enabled:
+            rem_time = prayer_time + plan.reminder_shift
+            if now < rem_time <= horizon_end: # Only schedule if reminder time is in the future
+                run_date, start_at = self.preroll_times(rem_time)
+                jobs.append(Trigger(
+                    id=f"reminder_{plan.prayer}_{suffix}", kind="reminder", prayer=plan.prayer,
+                    name=f"Reminder for {plan.prayer} ({plan.reminder_label})", run_date=run_date, start_at=start_at,
+                    url=plan.reminder_url, image_url=image_url, volume=plan.reminder_volume, devices=plan.devices,
+                ))
+
+        for job in list(jobs):
+            warm_up = self.warm_up_job(job, now)
+            if warm_up is not None:
+                jobs.append(warm_up)
+        return jobs
+
+    def preroll_times(self, play_time: datetime) -> tuple:
+        """Return (job run_date, start_at) for something that should sound at play_time.
+
+        With audio.preroll_seconds > 0 the job runs that much earlier and passes
+        start_at so the Cast layer can preload and start exactly on time. The
+        result depends only on play_time, so a refresh inside the pre-roll
+        window plans the same trigger; a run_date already past just runs at once.
+        """
+        preroll = self.config.get("audio", "preroll_seconds", self.PREROLL_SECONDS) or 0
+        if preroll > 0:
+            return play_time - timedelta(seconds=preroll), play_time
+        return play_time, None
+
+    def warm_up_job(self, job: Trigger, now: datetime):
+        """Trigger that connects to a job's speakers and loads its audio devices.warm_up_seconds before it runs."""
+        warm_up = self.config.get("devices", "warm_up_seconds", self.WARM_UP_SECONDS) or 0
+        warm_time = job.run_date - timedelta(seconds=warm_up)
+        if warm_up <= 0 or warm_time <= now:
+            return None
+        return Trigger(
+            id=f"warm_{job.id}", kind="warm", prayer=job.prayer, name=f"Warm connections for {job.id}",
+            run_date=warm_time, start_at=None, url=job.url, image_url=None, volume=None, devices=job.devices,
+        )
+
+    def warm_up(self, trigger: Trigger):
+        """Run a warm job: load the audio into memory, then connect the speakers."""
+        self.audio_manager.prewarm(self.audio_manager.media_key_from_url(trigger.url))
+        self.cast_manager.warm_connections(sorted(trigger.devices))
+
+    def apply_jobs(self, jobs: list) -> dict:
+        """Bring the scheduled horizon jobs in line with `jobs`, touching only what changed.
+
+        Jobs are compared by id (kind, prayer and date) and content, so a
+        change to one prayer's settings only replaces that prayer's jobs.
+        Returns counts of added, removed, modified and unchanged jobs.
+        """
+        now = datetime.now()
+        new_plan = {job.id: job for job in jobs}
+        counts = {"added": 0, "removed": 0, "modified": 0, "unchanged": 0}
+
+        for job_id, old_job in list(self.planned.items()):
+            if job_id in new_plan:
+                continue
+            del self.planned[job_id]
+            # Past-due jobs (e.g. restored within the misfire grace) are left to fire
+            if old_job.run_date <= now:
+                continue
             try:
                 self.scheduler.remove_job(job_id)
+                counts["removed"] += 1
             except Exception:
                 pass # Job might have already run
-        self.today_jobs = []
 
-        # Calculate new times
-        times = self.calculator.calculate_times()
-        # Calculator returns offset-naive datetimes (local wall-clock time)
+        for job_id, job in new_plan.items():
+            old_job = self.planned.get(job_id)
+            if old_job == job:
+                counts["unchanged"] += 1
+                continue
+            if old_job is not None and old_job.run_date <= now < old_job.play_time():
+                # Already fired and pre-rolling: re-adding it would play it twice
+                counts["unchanged"] += 1
+                continue
+            self.add_job(job)
+            counts["modified" if old_job is not None else "added"] += 1
+
+        logger.info(f"Jobs: {counts['added']} added, {counts['removed']} removed, "
+                    f"{counts['modified']} modified, {counts['unchanged']} unchanged")
+        return counts
+
+    def add_job(self, job: Trigger):
+        if job.kind == "warm":
+            func, args = self.warm_up, [job]
+        else:
+            func, args = (self.fire_async if self.loop is not None else self.fire), [job]
+
+        self.scheduler.add_job(
+            func,
+            'date',
+            run_date=job.run_date,
+            args=args,
+            id=job.id,
+            name=job.name,
+            replace_existing=True,
+            misfire_grace_time=self.config.get("system", "misfire_grace_seconds", self.MISFIRE_GRACE_SECONDS),
+            coalesce=True
+        )
+        self.planned[job.id] = job
+        if job.kind != "warm":
+            logger.info(f"Scheduled {job.name} at {job.play_time()}")
+
+    def restore_jobs(self) -> bool:
+        """Re-add pending jobs from the job store without recalculating.
+
+        Jobs whose time passed beyond the misfire grace while we were down are
+        marked missed and reported. Returns True if the stored plan matches the
+        current config and still covers the next 24 hours, i.e. no immediate
+        refresh is needed.
+        """
         now = datetime.now()
+        grace = timedelta(seconds=self.config.get("system", "misfire_grace_seconds", self.MISFIRE_GRACE_SECONDS))
+        try:
+            jobs = [Trigger.from_dict(job) for job in self.job_store.pending()]
+            version = self.job_store.version()
+        except Exception as e:
+            logger.error(f"Error reading job store: {e}")
+            return False
 
-        for prayer_name, prayer_time in times.items():
-            settings = self.get_prayer_settings(prayer_name)
+        upcoming = []
+        for job in jobs:
+            if job.run_date < now - grace:
+                self.job_store.set_status(job.id, "missed")
+                self.metrics_job_events.inc(event="missed_while_down")
+                if job.kind != "warm":
+                    self.missed_jobs.append({"id": job.id, "prayer": job.prayer, "kind": job.kind,
+                                             "time": job.play_time()})
+                    logger.warning(f"MISSED: {job.name} at {job.play_time()} (scheduler was not running)")
+            else:
+                upcoming.append(job)
 
-            # Decoupled Logic: Continue if EITHER Athan OR Reminder is enabled
-            if not settings["athan_enabled"] and not settings["reminder_enabled"]:
-                logger.debug(f"Skipping {prayer_name} (All Disabled)")
-                continue
+        self.apply_jobs(upcoming)
+        logger.info(f"Restored {len(upcoming)} jobs from the job store")
 
-            # Only schedule Athan if specifically enabled
-            if settings["athan_enabled"]:
-                # Calculate adjusted athan time
-                ath_offset = settings.get("athan_offset", 0)
-                ath_timing = settings.get("athan_timing", "before")
-                
-                if ath_timing == "after":
-                    athan_time = prayer_time + timedelta(minutes=ath_offset)
-                else:
-                    athan_time = prayer_time - timedelta(minutes=ath_offset)
-
-                if athan_time > now:
-                    # Schedule Athan
-                    athan_job_id = f"athan_{prayer_name}"
-                    
-                    self.scheduler.add_job(
-                        self.play_athan,
-                        'date',
-                        run_date=athan_time,
-                        args=[prayer_name, settings], 
-                        id=athan_job_id,
-                        name=f"Athan for {prayer_name}",
-                        replace_existing=True
-                    )
-                    self.today_jobs.append(athan_job_id)
-                    logger.info(f"Scheduled {prayer_name} at {athan_time} (offset: {ath_timing} {ath_offset}m)")
-
-            # Schedule Reminder independently?
-            if settings["reminder_enabled"] and settings["reminder_offset"] > 0:
-                offset = settings["reminder_offset"]
-                timing = settings["reminder_timing"]
-                
-                if timing == "after":
-                    rem_time = prayer_time + timedelta(minutes=offset)
-                else: # "before"
-                    rem_time = prayer_time - timedelta(minutes=offset)
-
-                if rem_time > now: # Only schedule if reminder time is in the future
-                    rem_job_id = f"reminder_{prayer_name}"
-                    
-                    self.scheduler.add_job(
-                        self.play_reminder,
-                        'date',
-                        run_date=rem_time,
-                        args=[prayer_name, settings],
-                        id=rem_job_id,
-                        name=f"Reminder for {prayer_name}",
-                        replace_existing=True
-                    )
-                    self.today_jobs.append(rem_job_id)
-                    logger.info(f"Scheduled reminder for {prayer_name} ({timing} {offset}m) at {rem_time}")
-
-    def play_athan(self, prayer_name: str, prayer_settings: dict):
-        """Trigger the Athan playback."""
-        logger.info(f"TRIGGER: Time for {prayer_name} Prayer!")
-        
+        covered = bool(upcoming) and upcoming[-1].run_date >= now + timedelta(hours=24)
+        return version == self.plan_version() and covered
+
+    def on_job_event(self, event):
+        """Record in the job store whether a horizon job fired or was missed."""
+        self.metrics_job_events.inc(event=self.JOB_EVENTS.get(event.code, "other"))
+        if event.job_id not in self.planned:
+            return
+        if event.code == EVENT_JOB_MISSED:
+            logger.warning(f"MISSED: job {event.job_id} scheduled for {event.scheduled_run_time}")
+            self.job_store.set_status(event.job_id, "missed")
+        else:
+            self.job_store.set_status(event.job_id, "fired")
+
+    def fire(self, trigger: Trigger, playback: Playback = None) -> Playback:
+        """Run a scheduled Athan or reminder straight from its compiled trigger."""
+        playback = playback or self.playbacks.create(trigger)
+        if not self._begin(trigger, playback):
+            return playback
+
+        try:
+            playback.results = self.cast_manager.play_url(
+                trigger.url,
+                trigger.image_url,
+                volume=trigger.volume,
+                target_devices=trigger.devices,
+                title=f"{trigger.prayer} {trigger.kind.capitalize()}",
+                start_at=trigger.start_at
+            )
+        except Exception as e:
+            logger.error(f"Error playing {trigger.name}: {e}")
+            self._finish(trigger, playback, error=str(e))
+            raise
+        self._finish(trigger, playback)
+        return playback
+
+    async def fire_async(self, trigger: Trigger, playback: Playback = None) -> Playback:
+        """fire() for the asyncio execution mode; runs on the event loop."""
+        playback = playback or self.playbacks.create(trigger)
+        if not self._begin(trigger, playback):
+            return playback
+
+        try:
+            await self.cast_manager.play_url_async(
+                trigger.url,
+                trigger.image_url,
+                volume=trigger.volume,
+                target_devices=trigger.devices,
+                title=f"{trigger.prayer} {trigger.kind.capitalize()}",
+                start_at=trigger.start_at,
+                results=playback.results
+            )
+        except Exception as e:
+            logger.error(f"Error playing {trigger.name}: {e}")
+            self._finish(trigger, playback, error=str(e))
+            raise
+        self._finish(trigger, playback)
+        return playback
+
+    def _begin(self, trigger: Trigger, playback: Playback) -> bool:
+        playback.callback_at = datetime.now()
+        self.metrics_callback_delay.observe((playback.callback_at - trigger.run_date).total_seconds(),
+                                            kind=trigger.kind, source=self._source(trigger))
+        if trigger.start_at is not None:
+            logger.info(f"PRE-ROLL: {trigger.name} starts at {trigger.start_at}")
+        else:
+            logger.info(f"TRIGGER: {trigger.name}")
+
+        if trigger.url is None:
+            logger.warning(f"No audio file for {trigger.name}, skipping")
+            self._finish(trigger, playback, error="audio file not found")
+            return False
+
+        playback.state = "playing"
+        playback.dispatched_at = datetime.now()
+        return True
+
+    def _finish(self, trigger: Trigger, playback: Playback, error: str = None):
+        """Close the playback record and record its lateness metrics."""
+        playback.finish(error=error)
+        labels = {"kind": trigger.kind, "source": self._source(trigger)}
+        self.metrics_playbacks.inc(state=playback.state, **labels)
+        if playback.dispatched_at is None:
+            return
+
+        # Device timings are seconds since dispatch; lateness is against the instant audio was due
+        due = trigger.play_time()
+        offset = (playback.dispatched_at - due).total_seconds()
+        for result in playback.results:
+            if result.get("started_s") is not None:
+                self.metrics_play_issued_delay.observe(offset + result["started_s"], **labels)
+            if result.get("active_s") is not None:
+                self.metrics_playing_delay.observe(offset + result["active_s"], **labels)
+
+    @staticmethod
+    def _source(trigger: Trigger) -> str:
+        return "manual" if trigger.id.startswith("manual_") else "scheduled"
+
+    def metric_families(self) -> list:
+        """Scheduler, calculator cache and Cast device state for MetricsRegistry.render()."""
+        kinds = {}
+        for job in list(self.planned.values()):
+            kinds[job.kind] = kinds.get(job.kind, 0) + 1
+        cache = self.calculator.cache_stats()
+        devices = self.cast_manager.device_states()
+
+        memory = self.audio_manager.byte_cache.stats()
+
+        families = [
+            ("athan_scheduled_jobs", "gauge", "Jobs currently scheduled, by kind",
+             [({"kind": kind}, count) for kind, count in sorted(kinds.items())]),
+            ("athan_missed_on_restart", "gauge", "Prayers that passed while the scheduler was not running",
+             [({}, len(self.missed_jobs))]),
+            ("athan_times_cache_lookups_total", "counter", "Prayer times cache lookups",
+             [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])]),
+            ("athan_times_cache_evictions_total", "counter", "Prayer times cache evictions",
+             [({}, cache["evictions"])]),
+            ("athan_times_cache_hit_ratio", "gauge", "Prayer times cache hit ratio since start",
+             [({}, cache["hit_rate"])]),
+            ("athan_cast_device_connected", "gauge", "1 if the Cast device's connection is up",
+             [({"uuid": d["uuid"], "name": d["name"]}, int(d["connected"])) for d in devices]),
+            ("athan_cast_devices", "gauge", "Known Cast devices, by connection state",
+             [({"state": "connected"}, sum(d["connected"] for d in devices)),
+              ({"state": "disconnected"}, sum(not d["connected"] for d in devices))]),
+            ("athan_active_fades", "gauge", "Volume ramps in progress", [({}, self.cast_manager.fader.active())]),
+            ("athan_audio_memory_cache_lookups_total", "counter", "Pre-warmed audio cache lookups by the media endpoint",
+             [({"result": "hit"}, memory["hits"]), ({"result": "miss"}, memory["misses"])]),
+            ("athan_audio_memory_cache_bytes", "gauge", "Bytes of audio held in memory", [({}, memory["bytes"])]),
+        ]
+        pool = self.cast_manager.pool
+        if pool is not None:
+            families.append(("athan_cast_pool_connections_total", "counter", "Cast connection pool activity",
+                             [({"event": event}, count) for event, count in sorted(pool.stats.items())]))
+        return families
+
+    def launch(self, trigger: Trigger) -> Playback:
+        """Start a playback and return its progress record.
+
+        In asyncio mode this returns straight away while the playback runs on
+        the event loop; otherwise it returns once the devices have started.
+        """
+        playback = self.playbacks.create(trigger)
+        if self.loop is not None:
+            playback.future = asyncio.run_coroutine_threadsafe(self.fire_async(trigger, playback), self.loop)
+        else:
+            self.fire(trigger, playback)
+        return playback
+
+    def manual_trigger(self, kind: str, prayer_name: str, url, volume, devices, start_at: datetime = None,
+                       label: str = None) -> Trigger:
+        """Trigger for a playback started by hand (test buttons) rather than by the plan."""
+        now = datetime.now()
+        name = f"{kind.capitalize()} for {prayer_name}" + (f" ({label})" if label else "")
+        return Trigger(
+            id=f"manual_{kind}_{prayer_name}_{now:%Y%m%d%H%M%S}", kind=kind, prayer=prayer_name, name=name,
+            run_date=now, start_at=start_at, url=url, image_url=self.cast_manager.image_url(self.IMAGE_PATH),
+            volume=volume, devices=frozenset(str(uuid) for uuid in devices or []),
+        )
+
+    def play_athan(self, prayer_name: str, prayer_settings: dict, start_at: datetime = None) -> Playback:
+        """Trigger the Athan playback (at start_at if given, else immediately).
+
+        Used for manual/test playback; scheduled jobs go through fire().
+        """
         # Get Audio File
         # Determine audio source
         audio_file = prayer_settings.get("athan_audio_file")
@@ -170,56 +589,53 @@ class AthanScheduler:
         
         logger.info(f"Playing Athan for {prayer_name} using {audio_path}")
 
-        devices = prayer_settings.get("enabled_devices", [])
-        volume = prayer_settings.get("athan_volume", 0.5)
-
-        # Play on specified devices
-        self.cast_manager.play_audio(
-            target_devices=devices, 
-            audio_path=audio_path, 
-            volume=volume,
-            title=f"{prayer_name} Athan",
-            image_path="web/static/img/athan_background.png"
-        )
+        return self.launch(self.manual_trigger(
+            "athan", prayer_name,
+            url=self._resolve_url(audio_path),
+            volume=prayer_settings.get("athan_volume", 0.5),
+            # Play on specified devices
+            devices=prayer_settings.get("enabled_devices", []),
+            start_at=start_at
+        ))
         
-    def play_reminder(self, prayer_name: str, settings: dict):
+    def play_reminder(self, prayer_name: str, settings: dict, start_at: datetime = None):
         """
-        Trigger a reminder.
+        Trigger a reminder (at start_at if given, else immediately).
         settings expects: reminder_enabled, enabled_devices, reminder_offset, reminder_timing, volume, reminder_audio_file
+        Returns the Playback, or None if the reminder is disabled or has no devices.
         """
         if not settings.get("reminder_enabled"):
-            return
+            return None
 
         devices = settings.get("enabled_devices", [])
         if not devices:
-            return
+            return None
 
         minutes = settings.get("reminder_offset", 0)
         timing = settings.get("reminder_timing", "before")
-        volume = settings.get("reminder_volume", 0.3)
 
-        logger.info(f"TRIGGER: Reminder for {prayer_name} ({timing} {minutes}m)")
-        
-        # Determine Audio File
-        rem_file = settings.get("reminder_audio_file")
-        
         # Resolve Path (AudioManager handles fallback to beep.mp3)
-        audio_path_to_play = self.audio_manager.get_reminder_path(rem_file)
-        
-        # Play on specified devices
-        self.cast_manager.play_audio(
-            target_devices=devices, 
-            audio_path=audio_path_to_play, 
-            volume=volume,
-            title=f"{prayer_name} Reminder",
-            image_path="web/static/img/athan_background.png"
-        )
+        audio_path_to_play = self.audio_manager.get_reminder_path(settings.get("reminder_audio_file"))
+
+        return self.launch(self.manual_trigger(
+            "reminder", prayer_name,
+            url=self._resolve_url(audio_path_to_play),
+            volume=settings.get("reminder_volume", 0.3),
+            devices=devices,
+            start_at=start_at,
+            label=f"{timing} {minutes}m"
+        ))
 
     def stop_all(self, target_devices: list = None):
         """Stop playback on devices.
         
         Args:
             target_devices: Optional list of UUID strings. If provided, only stop on these.
+        Returns the per-device stop results. In asyncio mode the stop runs on
+        the event loop and this returns None at once.
         """
         logger.info("Stopping audio playback...")
-        self.cast_manager.stop_all(target_devices=target_devices)
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self.cast_manager.stop_all_async(target_devices=target_devices), self.loop)
+            return None
+        return self.cast_manager.stop_all(target_devices=target_devices)
@@ -0,0 +1,36 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Boot milestones measured from process start (seconds, monotonic clock).
+
+    Each milestone is recorded the first time it is marked; later marks are
+    ignored, so hot paths (e.g. every HTTP response) can call mark() freely.
+    """
+
+    def __init__(self, boot_time: float = None):
+        self.boot_time = time.monotonic() if boot_time is None else boot_time
+        self.milestones = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str) -> bool:
+        """Record a milestone; returns True only the first time."""
+        if name in self.milestones:
+            return False
+        with self._lock:
+            if name in self.milestones:
+                return False
+            self.milestones[name] = round(time.monotonic() - self.boot_time, 3)
+        logger.info(f"Startup: {name} after {self.milestones[name]:.2f}s")
+        return True
+
+    def as_dict(self) -> dict:
+        return dict(self.milestones)
+
+    def log_summary(self):
+        summary = ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.milestones.items())
+        logger.info(f"Startup timings: {summary}")
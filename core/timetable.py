@@ -0,0 +1,198 @@
+import numpy as np
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+PRAYER_NAMES = ("Fajr", "Sunrise", "Dhuhr", "Asr", "Maghrib", "Isha")
+
+
+class PrayerTable:
+    """Columnar prayer timetable for a contiguous range of dates.
+
+    Times are stored as float64 seconds after local midnight of each row's
+    date (one column per prayer, NaN where a time could not be calculated).
+    This keeps a full year at ~17 KB and lets callers slice columns without
+    building datetime objects.
+    """
+
+    def __init__(self, start: date, seconds: np.ndarray):
+        seconds = np.asarray(seconds, dtype=np.float64)
+        if seconds.ndim != 2 or seconds.shape[1] != len(PRAYER_NAMES):
+            raise ValueError(f"Expected an (N, {len(PRAYER_NAMES)}) array, got {seconds.shape}")
+        self.start = start
+        self.seconds = seconds
+
+    @classmethod
+    def empty(cls, start: date, days: int) -> "PrayerTable":
+        return cls(start, np.full((days, len(PRAYER_NAMES)), np.nan))
+
+    def __len__(self):
+        return self.seconds.shape[0]
+
+    @property
+    def end(self) -> date:
+        """Last date (inclusive) covered by the table."""
+        return self.start + timedelta(days=len(self) - 1)
+
+    def __contains__(self, day: date) -> bool:
+        return 0 <= (day - self.start).days < len(self)
+
+    def dates(self) -> list:
+        return [self.start + timedelta(days=i) for i in range(len(self))]
+
+    def column(self, prayer_name: str) -> np.ndarray:
+        """Seconds-after-midnight for one prayer across all rows."""
+        return self.seconds[:, PRAYER_NAMES.index(prayer_name)]
+
+    def set_row(self, day: date, times: dict):
+        """Store a {prayer: naive datetime} dict for the given date."""
+        midnight = datetime.combine(day, datetime.min.time())
+        row = self.seconds[(day - self.start).days]
+        for i, name in enumerate(PRAYER_NAMES):
+            t = times.get(name)
+            row[i] = (t - midnight).total_seconds() if t is not None else np.nan
+
+    def row(self, day: date) -> dict:
+        """Return {prayer: naive datetime} for a date, or {} if not calculated."""
+        if day not in self:
+            raise KeyError(day)
+        row = self.seconds[(day - self.start).days]
+        if np.isnan(row).all():
+            return {}
+        midnight = datetime.combine(day, datetime.min.time())
+        return {
+            name: midnight + timedelta(seconds=float(row[i]))
+            for i, name in enumerate(PRAYER_NAMES)
+            if not np.isnan(row[i])
+        }
+
+    def rows(self):
+        """Iterate over (date, times dict) pairs."""
+        for day in self.dates():
+            yield day, self.row(day)
+
+    def slice(self, start: date, end: date) -> "PrayerTable":
+        """Sub-table for start..end (inclusive), clipped to the dates covered."""
+        start = max(start, self.start)
+        first = (start - self.start).days
+        last = (min(end, self.end) - self.start).days
+        return PrayerTable(start, self.seconds[first:last + 1])
+
+    @classmethod
+    def concat(cls, tables: list) -> "PrayerTable":
+        """Join consecutive tables (each starting the day after the previous ends)."""
+        return cls(tables[0].start, np.concatenate([t.seconds for t in tables]))
+
+
+def location_fingerprint(settings: dict) -> str:
+    """Stable short hash of the settings that affect calculated prayer times."""
+    payload = json.dumps({"format": TimetableStore.FORMAT_VERSION, **settings}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class TimetableStore:
+    """Disk-backed store of yearly PrayerTables keyed by location fingerprint.
+
+    Layout: <base_dir>/<fingerprint>/<year>.npy plus a settings.json describing
+    the fingerprint. Each fingerprint has its own directory, so a settings change
+    simply reads a different directory and switching back reuses the old one.
+    Only the least recently used fingerprints beyond MAX_FINGERPRINTS are removed.
+    """
+
+    # Bump when the on-disk layout or calculation changes; it is part of the fingerprint
+    FORMAT_VERSION = 1
+    # Network timetables (one fingerprint per site) share the store with the main location
+    MAX_FINGERPRINTS = 128
+
+    def __init__(self, base_dir: str = "cache/timetables"):
+        self.base_dir = base_dir
+
+    def _dir(self, fingerprint: str) -> str:
+        return os.path.join(self.base_dir, fingerprint)
+
+    def _path(self, fingerprint: str, year: int) -> str:
+        return os.path.join(self._dir(fingerprint), f"{year}.npy")
+
+    def load_year(self, fingerprint: str, year: int):
+        """Return the memory-mapped PrayerTable for a year, or None if not stored."""
+        path = self._path(fingerprint, year)
+        if not os.path.isfile(path):
+            return None
+
+        start = date(year, 1, 1)
+        days = (date(year + 1, 1, 1) - start).days
+        try:
+            seconds = np.load(path, mmap_mode="r", allow_pickle=False)
+            if seconds.shape != (days, len(PRAYER_NAMES)):
+                raise ValueError(f"unexpected shape {seconds.shape}")
+        except Exception as e:
+            # Only this file is bad; drop it so it gets recalculated
+            logger.warning(f"Discarding unreadable timetable {path}: {e}")
+            self._remove(path)
+            return None
+
+        # Touch the directory so pruning keeps recently used fingerprints
+        try:
+            os.utime(self._dir(fingerprint))
+        except OSError:
+            pass
+        logger.debug(f"Loaded timetable {path}")
+        return PrayerTable(start, seconds)
+
+    def save_year(self, fingerprint: str, table: PrayerTable, settings: dict = None):
+        """Persist a full-year table atomically (temp file + rename)."""
+        year = table.start.year
+        if table.start != date(year, 1, 1) or table.end != date(year, 12, 31):
+            raise ValueError(f"Table {table.start}..{table.end} is not a full calendar year")
+
+        directory = self._dir(fingerprint)
+        is_new = not os.path.isdir(directory)
+        path = self._path(fingerprint, year)
+        temp_path = path + ".tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if settings is not None:
+                with open(os.path.join(directory, "settings.json"), "w") as f:
+                    json.dump(settings, f, sort_keys=True, default=str)
+            with open(temp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(table.seconds), allow_pickle=False)
+            os.replace(temp_path, path)
+            logger.debug(f"Saved timetable {path}")
+        except Exception as e:
+            logger.error(f"Error saving timetable {path}: {e}")
+            self._remove(temp_path)
+            return
+
+        if is_new:
+            self.prune()
+
+    def invalidate(self, fingerprint: str, year: int = None):
+        """Remove one stored year, or every year for a fingerprint."""
+        if year is not None:
+            self._remove(self._path(fingerprint, year))
+        else:
+            shutil.rmtree(self._dir(fingerprint), ignore_errors=True)
+
+    def prune(self, keep: int = None):
+        """Remove the least recently used fingerprints beyond `keep`."""
+        keep = self.MAX_FINGERPRINTS if keep is None else keep
+        try:
+            entries = [e for e in os.scandir(self.base_dir) if e.is_dir()]
+        except FileNotFoundError:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries[keep:]:
+            logger.info(f"Pruning cached timetables for {entry.name}")
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
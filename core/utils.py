@@ -1,7 +1,88 @@
-from datetime import date
+from datetime import date, timedelta
 import math
+import threading
+import numpy as np
 
-def gregorian_to_hijri(g_date: date):
+# Range covered by the precomputed Hijri lookup table (inclusive)
+HIJRI_TABLE_START = date(1900, 1, 1)
+HIJRI_TABLE_END = date(2100, 12, 31)
+
+# Offset between date.toordinal() and the Julian Day Number of that date
+JD_ORDINAL_OFFSET = 1721425
+
+HIJRI_MONTHS = ["Muharram", "Safar", "Rabi' al-Awwal", "Rabi' al-Thani", "Jumada al-Ula", "Jumada al-Thani",
+                "Rajab", "Sha'ban", "Ramadan", "Shawwal", "Dhu al-Qi'dah", "Dhu al-Hijjah"]
+
+_hijri_table = None
+_hijri_table_lock = threading.Lock()
+
+
+def gregorian_to_hijri(g_date: date, offset: int = 0):
+    """
+    Converts Gregorian Date to Hijri Date using the Kuwaiti Algorithm.
+    `offset` shifts the result by whole days (location.hijri_offset).
+    Dates between HIJRI_TABLE_START and HIJRI_TABLE_END are O(1) lookups.
+    Returns: (year, month_index, day)
+    """
+    table = _get_hijri_table()
+    index = g_date.toordinal() + offset - HIJRI_TABLE_START.toordinal()
+    if 0 <= index < len(table):
+        iy, im, id = table[index]
+        return int(iy), int(im), int(id)
+    return _gregorian_to_hijri_scalar(g_date + timedelta(days=offset))
+
+
+def gregorian_to_hijri_array(ordinals) -> np.ndarray:
+    """
+    Vectorised Kuwaiti Algorithm for Gregorian dates given as date.toordinal() values
+    (Gregorian calendar, i.e. after 1582). Returns an (N, 3) int array of (year, month, day).
+    """
+    jd = np.asarray(ordinals, dtype=np.int64) + JD_ORDINAL_OFFSET
+
+    iyear = 10631.0 / 30.0
+    epochastro = 1948084
+    shift1 = 8.01 / 60.0
+
+    z = (jd - epochastro).astype(np.float64)
+    cyc = np.floor(z / 10631.0)
+    z = z - 10631 * cyc
+    j = np.floor((z - shift1) / iyear)
+    iy = 30 * cyc + j
+    z = z - np.floor(j * iyear + shift1)
+    im = np.floor((z + 28.5001) / 29.5)
+    im = np.where(im == 13, 12, im)
+    id = z - np.floor(29.5001 * im - 29)
+
+    return np.stack([iy, im, id], axis=-1).astype(np.int32)
+
+
+def _get_hijri_table() -> np.ndarray:
+    """Lazily build the (days, 3) Hijri lookup table for the supported range."""
+    global _hijri_table
+    if _hijri_table is None:
+        with _hijri_table_lock:
+            if _hijri_table is None:
+                ordinals = np.arange(HIJRI_TABLE_START.toordinal(), HIJRI_TABLE_END.toordinal() + 1)
+                _hijri_table = gregorian_to_hijri_array(ordinals).astype(np.int16)
+    return _hijri_table
+
+
+def hijri_calendar(start: date, end: date, offset: int = 0) -> list:
+    """Hijri dates for every Gregorian date from start to end (inclusive)."""
+    ordinals = np.arange(start.toordinal(), end.toordinal() + 1) + offset
+    table = _get_hijri_table()
+    index = ordinals - HIJRI_TABLE_START.toordinal()
+    if index[0] >= 0 and index[-1] < len(table):
+        hijri = table[index]
+    else:
+        hijri = gregorian_to_hijri_array(ordinals)
+    return [
+        (date.fromordinal(int(o - offset)), int(iy), int(im), int(id))
+        for o, (iy, im, id) in zip(ordinals, hijri)
+    ]
+
+
+def _gregorian_to_hijri_scalar(g_date: date):
     """
     Converts Gregorian Date to Hijri Date using the Kuwaiti Algorithm.
     Returns: (year, month_index, day)
@@ -70,8 +151,6 @@ def gregorian_to_hijri(g_date: date):
 
 def format_hijri(iy, im, id):
     """Formats Hijri date as string."""
-    months = ["Muharram", "Safar", "Rabi' al-Awwal", "Rabi' al-Thani", "Jumada al-Ula", "Jumada al-Thani", 
-              "Rajab", "Sha'ban", "Ramadan", "Shawwal", "Dhu al-Qi'dah", "Dhu al-Hijjah"]
     # Ensure index is within bounds (1-12)
     m_idx = max(0, min(im - 1, 11))
-    return f"{int(id)} {months[m_idx]} {iy}"
+    return f"{int(id)} {HIJRI_MONTHS[m_idx]} {iy}"
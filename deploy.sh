@@ -6,7 +6,7 @@ PI_HOST="${2:-192.168.86.36}"
 PI_PASS="${3:-}"
 HOST="${PI_USER}@${PI_HOST}"
 REMOTE_DIR="~/Home-Athan"
-EXCLUDES=("--exclude" ".git" "--exclude" ".DS_Store" "--exclude" "venv" "--exclude" "__pycache__" "--exclude" ".agent" "--exclude" ".gemini" "--exclude" ".dockerignore" "--exclude" "audio" "--exclude" "deploy.sh")
+EXCLUDES=("--exclude" ".git" "--exclude" ".DS_Store" "--exclude" "venv" "--exclude" "__pycache__" "--exclude" ".agent" "--exclude" ".gemini" "--exclude" ".dockerignore" "--exclude" "audio" "--exclude" "cache" "--exclude" "deploy.sh")
 
 # Helper to run commands
 run_ssh() {
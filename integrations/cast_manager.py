@@ -1,19 +1,44 @@
+import asyncio
 import pychromecast
 import logging
 import socket
 import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import quote
+from integrations.cast_pool import CastConnectionPool
+from integrations.fade import FadeEngine
 
 logger = logging.getLogger(__name__)
 
 class CastManager:
-    def __init__(self, config):
+    # Default worker count for parallel playback (devices.max_parallel)
+    MAX_PARALLEL_CASTS = 8
+    # Seconds a connected device waits for the others before starting anyway
+    SYNC_TIMEOUT = 3.0
+    # Default fade-in length in seconds (audio.fade_duration)
+    FADE_DURATION = 5.0
+    # Default seconds stop_all waits for all devices together (devices.stop_deadline)
+    STOP_DEADLINE = 1.0
+    # Workers shared by every stop_all call; well above the number of speakers in a home
+    STOP_WORKERS = 32
+
+    def __init__(self, config, audio_manager=None):
         self.config = config
+        # Used to serve optimised encodes in place of the originals (optional)
+        self.audio_manager = audio_manager
         self.devices = {}
         self.browser = None
         self.local_ip = self.get_local_ip()
         self.stop_event = threading.Event()
+        self.pool = None
+        self.fader = FadeEngine()
+        self._executor = None
+        self._executor_workers = 0
+        self._executor_lock = threading.Lock()
+        self._stop_executor = None
 
     def get_local_ip(self):
         """Get the local IP address of this machine."""
@@ -34,6 +59,9 @@ class CastManager:
         import zeroconf
         
         self.zconf = zeroconf.Zeroconf()
+        # Devices are the pool's long-lived connections
+        self.pool = CastConnectionPool(self.zconf)
+        self.devices = self.pool.casts
         
         class DeviceListener(SimpleCastListener):
             def __init__(self, manager):
@@ -50,58 +78,97 @@ class CastManager:
             def remove_cast(self, uuid, service, cast):
                 if uuid in self.manager.devices:
                     logger.info(f"Cast device removed: {uuid}")
-                    self.manager.devices.pop(uuid, None)
+                    self.manager.pool.remove(uuid)
 
         self.listener = DeviceListener(self)
         self.browser = CastBrowser(self.listener, self.zconf)
         self.browser.start_discovery()
+        self.pool.start_health_checks(self.config.get("devices", "health_interval", CastConnectionPool.HEALTH_INTERVAL))
         logger.info("Started CastBrowser discovery...")
 
     def _process_device_update(self, uuid):
         """Update our internal device list from the browser."""
         # browser.devices is a dict of uuid -> CastInfo (named tuple)
-        # We must convert it to a Chromecast object to control it.
+        # The pool keeps one Chromecast object (and connection) per device and
+        # only rebuilds it if the device's address changed.
         try:
-            from pychromecast import get_chromecast_from_cast_info
-            
             if uuid in self.browser.devices:
                 cast_info = self.browser.devices[uuid]
-                # Create the Chromecast object
-                cast = get_chromecast_from_cast_info(cast_info, self.zconf)
+                is_new = uuid not in self.devices
+                cast = self.pool.acquire(uuid, cast_info)
                 
-                if uuid not in self.devices:
+                if is_new:
                     logger.info(f"Found New Cast device: {cast.name} ({uuid})")
-                
-                self.devices[uuid] = cast
         except Exception as e:
             logger.error(f"Error processing device update for {uuid}: {e}")
 
-    def play_audio(self, audio_path: str, volume: float = None, target_devices: list = None, title: str = None, image_path: str = None):
+    def device_states(self) -> list:
+        """uuid, name and connection state of every known device."""
+        return [
+            {"uuid": str(uuid), "name": cast.name, "connected": CastConnectionPool.is_connected(cast)}
+            for uuid, cast in list(self.devices.items())
+        ]
+
+    def warm_connections(self, target_devices: list = None, timeout: float = None) -> int:
+        """Connect to the target (default: enabled) devices ahead of playback.
+
+        Returns the number of those devices that are connected.
+        """
+        if target_devices is None or len(target_devices) == 0:
+            target_devices = self.config.get("devices", "enabled_devices", []) or None
+        if self.pool is not None:
+            return self.pool.warm(target_devices, timeout)
+
+        # No pool (discovery not started): just make sure each device is connected
+        connected = 0
+        for uuid, cast in list(self.devices.items()):
+            if target_devices and str(uuid) not in target_devices:
+                continue
+            try:
+                cast.wait(timeout=timeout or CastConnectionPool.CONNECT_TIMEOUT)
+                connected += 1
+            except Exception as e:
+                logger.warning(f"Could not connect to {cast.name}: {e}")
+        return connected
+
+    def play_audio(self, audio_path: str, volume: float = None, target_devices: list = None, title: str = None, image_path: str = None,
+                   start_at: datetime = None):
         """
         Play the audio on enabled devices.
         audio_path: local file path e.g. 'audio/fajr.mp3'
         volume: optional float 0.0 to 1.0 override
-        target_devices: optional list of UUID strings. If provided, plays ONLY on these. 
+        target_devices: optional list (or set) of UUID strings. If provided, plays ONLY on these. 
                         If None, uses global enabled_devices.
         title: Optional title for the cast media
         image_path: Optional local path to an image file (relative to web root or absolute?) - lets assume relative to web root or static
                     Actually better if it receives a web/static relative path or just filename in img dir.
-        """
-        # Clear stop event at start of new playback
-        self.stop_event.clear()
-
-        if not self.config.get("devices", "cast_enabled", True):
-            logger.info("Casting is disabled in config.")
-            return
 
+        start_at: Optional naive local datetime. Devices connect and load the media
+                  paused at zero volume straight away, then all press play at start_at.
+        Devices are started in parallel unless devices.parallel_dispatch is false.
+        Returns a list of per-device result dicts (status, error, timings).
+        """
         if not audio_path or not os.path.exists(audio_path):
+            # Clear stop event at start of new playback
+            self.stop_event.clear()
             logger.warning(f"Audio file not found: {audio_path}")
-            return
+            return []
+
+        return self.play_url(self.media_url(audio_path), self.image_url(image_path), volume=volume,
+                             target_devices=target_devices, title=title, start_at=start_at)
 
+    def media_url(self, audio_path: str) -> str:
+        """URL the speakers fetch a local audio file from (served at /audio)."""
         # Convert local path to URL
         # We assume the web server is running on the configured port
         port = self.config.get("system", "web_port", 8000)
 
+        if self.audio_manager is not None:
+            # Content-addressed URL (optimised encode once it exists); speakers may cache it forever
+            key = self.audio_manager.media_key(audio_path)
+            if key is not None:
+                return f"http://{self.local_ip}:{port}/media/{key}/{quote(os.path.basename(audio_path))}"
+
         # Calculate relative path from 'audio' directory to handle subfolders
         # audio_path might be 'audio/athan/file.mp3' -> relative = 'athan/file.mp3'
         try:
@@ -124,22 +191,138 @@ class CastManager:
         
         # Ensure we bind to 0.0.0.0 effectively, so use local_ip
         # URL structure: http://IP:8000/audio/relativePath
-        url = f"http://{self.local_ip}:{port}/audio/{relative_path}"
-        
-        image_url = None
-        if image_path:
-             # If passed as 'web/static/img/BG.png', we serve it via /static/img/BG.png
-             # Assuming app.py mounts /static -> web/static
-             # If input is 'athan_background.png', assuming it is in web/static/img/
-             if "web/static/" in image_path:
-                 relative_path = image_path.split("web/static/")[1] # e.g. img/athan_background.png
-                 image_url = f"http://{self.local_ip}:{port}/static/{relative_path}"
-             else:
-                 # Fallback/Safe assumption
-                  image_url = f"http://{self.local_ip}:{port}/static/img/{os.path.basename(image_path)}"
+        return f"http://{self.local_ip}:{port}/audio/{relative_path}"
+
+    def image_url(self, image_path: str = None):
+        """URL for the cover image shown on speakers with a screen, or None."""
+        if not image_path:
+            return None
+        port = self.config.get("system", "web_port", 8000)
+        # If passed as 'web/static/img/BG.png', we serve it via /static/img/BG.png
+        # Assuming app.py mounts /static -> web/static
+        # If input is 'athan_background.png', assuming it is in web/static/img/
+        if "web/static/" in image_path:
+            relative_path = image_path.split("web/static/")[1] # e.g. img/athan_background.png
+            return f"http://{self.local_ip}:{port}/static/{relative_path}"
+        # Fallback/Safe assumption
+        return f"http://{self.local_ip}:{port}/static/img/{os.path.basename(image_path)}"
+
+    def play_url(self, url: str, image_url: str = None, volume: float = None, target_devices=None,
+                 title: str = None, start_at: datetime = None) -> list:
+        """Play an already resolved media URL; see play_audio for the arguments.
+
+        Used directly by scheduled jobs, whose URLs are resolved when the plan is compiled.
+        """
+        # Clear stop event at start of new playback
+        self.stop_event.clear()
+
+        if not self.config.get("devices", "cast_enabled", True):
+            logger.info("Casting is disabled in config.")
+            return []
 
         logger.info(f"Casting URL: {url} | Title: {title} | Image: {image_url}")
         
+        targets = self._select_targets(target_devices)
+        if not targets:
+            return []
+
+        media = {"url": url, "title": title, "image_url": image_url, "volume": volume, "start_at": start_at}
+        # A coordinated start needs every device waiting concurrently
+        parallel = self.config.get("devices", "parallel_dispatch", True) or start_at is not None
+        if parallel and len(targets) > 1:
+            results = self._play_parallel(targets, media)
+        else:
+            dispatch_start = time.monotonic()
+            results = []
+            for uuid, cast in targets:
+                # Check stop event before starting each device
+                if self.stop_event.is_set():
+                    logger.info("Playback aborted by stop signal.")
+                    break
+                results.append(self._play_on_device(uuid, cast, media, dispatch_start))
+
+        self._log_dispatch(results)
+        return results
+
+    async def play_url_async(self, url: str, image_url: str = None, volume: float = None, target_devices=None,
+                             title: str = None, start_at: datetime = None, results: list = None) -> list:
+        """Coroutine version of play_url for the asyncio execution mode.
+
+        Blocking Cast calls run on the shared playback pool, but the wait
+        for the other devices and for start_at is awaited on the event loop,
+        so no worker thread is held during the pre-roll. Per-device result
+        dicts are appended to `results` (if given) as soon as dispatch starts
+        and filled in as playback progresses.
+        """
+        self.stop_event.clear()
+        results = [] if results is None else results
+
+        if not self.config.get("devices", "cast_enabled", True):
+            logger.info("Casting is disabled in config.")
+            return results
+
+        logger.info(f"Casting URL: {url} | Title: {title} | Image: {image_url}")
+        targets = self._select_targets(target_devices)
+        if not targets:
+            return results
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        media = {"url": url, "title": title, "image_url": image_url, "volume": volume, "start_at": start_at}
+        dispatch_start = time.monotonic()
+        all_prepared = asyncio.Event()
+        gate = asyncio.Event()
+        remaining = len(targets)
+
+        async def open_gate():
+            if start_at is not None:
+                delay = (start_at - datetime.now()).total_seconds()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                try:
+                    # Same rule as the thread barrier: a slow device releases the others
+                    await asyncio.wait_for(all_prepared.wait(), self.SYNC_TIMEOUT)
+                except asyncio.TimeoutError:
+                    pass
+            gate.set()
+
+        async def play(cast, result):
+            nonlocal remaining
+            try:
+                state = await loop.run_in_executor(executor, self._prepare_device, cast, media, dispatch_start, result)
+            except Exception as e:
+                logger.error(f"Failed to cast to {cast.name}: {e}")
+                result["status"] = "failed"
+                result["error"] = str(e)
+                state = None
+            finally:
+                remaining -= 1
+                if remaining == 0:
+                    all_prepared.set()
+
+            if state is not None:
+                await gate.wait()
+                try:
+                    await loop.run_in_executor(executor, self._start_device, cast, media, dispatch_start, result, state)
+                except Exception as e:
+                    logger.error(f"Failed to cast to {cast.name}: {e}")
+                    result["status"] = "failed"
+                    result["error"] = str(e)
+            result["elapsed_s"] = round(time.monotonic() - dispatch_start, 3)
+
+        players = []
+        for uuid, cast in targets:
+            result = self._new_result(uuid, cast)
+            results.append(result)
+            players.append(play(cast, result))
+        await asyncio.gather(open_gate(), *players)
+
+        self._log_dispatch(results)
+        return results
+
+    def _select_targets(self, target_devices=None) -> list:
+        """(uuid, cast) pairs to play on; see play_audio for target_devices."""
         # Determine which devices to use
         if target_devices is not None:
             # target_devices might be empty list [] -> means play on NO devices
@@ -148,114 +331,330 @@ class CastManager:
             # Fallback to global config
             effective_devices = self.config.get("devices", "enabled_devices", [])
         
-        for uuid, cast in self.devices.items():
+        targets = []
+        for uuid, cast in list(self.devices.items()):
             # Check if this specific device is enabled
-            should_play = True
             if effective_devices and len(effective_devices) > 0:
                  if str(uuid) not in effective_devices:
-                     should_play = False
-            
-            if not should_play:
-                logger.debug(f"Skipping {cast.name} (Not in target list)")
-                continue
+                     logger.debug(f"Skipping {cast.name} (Not in target list)")
+                     continue
+            targets.append((uuid, cast))
+        return targets
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Shared bounded pool for per-device playback (created on first use)."""
+        with self._executor_lock:
+            if self._executor is None:
+                workers = self.config.get("devices", "max_parallel", self.MAX_PARALLEL_CASTS)
+                self._executor_workers = max(1, int(workers))
+                self._executor = ThreadPoolExecutor(max_workers=self._executor_workers, thread_name_prefix="cast")
+            return self._executor
+
+    def _play_parallel(self, targets: list, media: dict) -> list:
+        """Start playback on all targets at once.
+
+        Each device connects and sets its volume on its own worker, then all
+        workers wait at a barrier so play_media goes out together. The barrier
+        is only used when every target gets its own worker; a device that has
+        not connected within SYNC_TIMEOUT releases the others.
+        """
+        if media.get("start_at") is not None:
+            # Pre-rolled playback is aligned by the clock instead
+            return self._play_preroll(targets, media)
+
+        executor = self._get_executor()
+        barrier = None
+        if len(targets) <= self._executor_workers:
+            barrier = threading.Barrier(len(targets), timeout=self.SYNC_TIMEOUT)
+
+        dispatch_start = time.monotonic()
+        futures = {
+            executor.submit(self._play_on_device, uuid, cast, media, dispatch_start, barrier): (uuid, cast)
+            for uuid, cast in targets
+        }
+        results = []
+        for future, (uuid, cast) in futures.items():
             try:
-                # Check stop event before starting each device
-                if self.stop_event.is_set():
-                    logger.info("Playback aborted by stop signal.")
-                    break
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Failed to cast to {cast.name}: {e}")
+                results.append({"uuid": str(uuid), "name": cast.name, "status": "failed", "error": str(e)})
+        return results
 
-                logger.info(f"Casting to {cast.name}...")
-                cast.wait() # ensure connected
-                mc = cast.media_controller
-                
-                # Determine target volume. If not specified, use current volume or default to 0.5
-                target_vol = volume if volume is not None else cast.status.volume_level if cast.status and cast.status.volume_level is not None else 0.5
+    def _play_preroll(self, targets: list, media: dict) -> list:
+        """Prepare every target on the pool, then start them all at media["start_at"].
 
-                # Metadata setup
-                # pychromecast play_media(url, content_type, title=None, thumb=None, ...)
-                # thumb is expected to be a URL string or None
-                
-                # Smart Fade In
-                # If fade_in is enabled in config (default True)
-                if self.config.get("audio", "fade_in", True):
-                    # Start at 0
-                    cast.set_volume(0.0)
-                    start_volume = 0.0
-                    steps = 10
-                    step_delay = 0.5 # 5 seconds total fade
-                    volume_step = target_vol / steps
-                    
-                    mc.play_media(url, content_type='audio/mp3', title=title, thumb=image_url)
-                    mc.block_until_active(timeout=10) # Increased timeout
-                    
-                    # Verify state before fading in
-                    if mc.status.player_state in ('IDLE', 'UNKNOWN') and mc.status.content_id != url:
-                        logger.warning(f"Media failed to load on {cast.name}, skipping fade-in.")
-                        # Restore volume just in case? Or leave it?
-                        # If we leave it at 0, it's silent. If we set it to target, it might blare.
-                        # Safe to abort.
-                    else:
-                        current_vol = 0.0
-                        for i in range(steps):
-                            # Check stop event INSIDE loop
-                            if self.stop_event.is_set():
-                                logger.info(f"Fade-in interrupted on {cast.name}")
-                                break
-                            
-                            time.sleep(step_delay)
-                            current_vol += volume_step
-                            if current_vol > target_vol:
-                                current_vol = target_vol
-                            cast.set_volume(current_vol)
-                else:
-                    # Instant volume set
-                    cast.set_volume(target_vol)
-                    mc.play_media(url, content_type='audio/mp3', title=title, thumb=image_url)
-                    mc.block_until_active()
+        The wait for start_at happens on this thread, not on a pool worker,
+        so targets beyond devices.max_parallel are preloaded during the
+        pre-roll too and start on time with the rest.
+        """
+        executor = self._get_executor()
+        start_at = media["start_at"]
+        dispatch_start = time.monotonic()
+        results = [self._new_result(uuid, cast) for uuid, cast in targets]
+        prepared = [
+            (executor.submit(self._prepare_device, cast, media, dispatch_start, result), cast, result)
+            for (uuid, cast), result in zip(targets, results)
+        ]
+
+        ready = []
+        for future, cast, result in prepared:
+            try:
+                ready.append((cast, result, future.result()))
+            except Exception as e:
+                logger.error(f"Failed to cast to {cast.name}: {e}")
+                result["status"] = "failed"
+                result["error"] = str(e)
+                result["elapsed_s"] = round(time.monotonic() - dispatch_start, 3)
+
+        delay = (start_at - datetime.now()).total_seconds()
+        if delay > 0:
+            # Returns early if stop_all() is called during the pre-roll
+            self.stop_event.wait(delay)
+
+        started = [
+            (executor.submit(self._start_device, cast, media, dispatch_start, result, state), cast, result)
+            for cast, result, state in ready
+        ]
+        for future, cast, result in started:
+            try:
+                future.result()
             except Exception as e:
                 logger.error(f"Failed to cast to {cast.name}: {e}")
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["elapsed_s"] = round(time.monotonic() - dispatch_start, 3)
+        return results
+
+    def _play_on_device(self, uuid, cast, media: dict, dispatch_start: float, barrier: threading.Barrier = None) -> dict:
+        """Connect, load and (optionally) fade in on one device.
+
+        Returns a result dict with the status and timings in seconds since dispatch_start.
+        """
+        result = self._new_result(uuid, cast)
+        try:
+            state = self._prepare_device(cast, media, dispatch_start, result)
+
+            start_at = media.get("start_at")
+            if start_at is not None:
+                delay = (start_at - datetime.now()).total_seconds()
+                if delay > 0:
+                    # Returns early if stop_all() is called during the pre-roll
+                    self.stop_event.wait(delay)
+            elif barrier is not None:
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    # Another device is slow or failed; don't hold this one back
+                    pass
+
+            self._start_device(cast, media, dispatch_start, result, state)
+        except Exception as e:
+            logger.error(f"Failed to cast to {cast.name}: {e}")
+            result["status"] = "failed"
+            result["error"] = str(e)
+            if barrier is not None:
+                # Release the other devices now rather than after SYNC_TIMEOUT
+                barrier.abort()
+        result["elapsed_s"] = round(time.monotonic() - dispatch_start, 3)
+        return result
+
+    @staticmethod
+    def _new_result(uuid, cast) -> dict:
+        return {"uuid": str(uuid), "name": cast.name, "status": "pending", "error": None}
+
+    def _prepare_device(self, cast, media: dict, dispatch_start: float, result: dict) -> dict:
+        """Connect and get one device ready to start: silent, or preloaded for a pre-roll.
+
+        Returns the state _start_device needs (target volume, fade, preloaded).
+        """
+        url = media["url"]
+        logger.info(f"Casting to {cast.name}...")
+        result["status"] = "connecting"
+        # Ensure connected; an unreachable device fails instead of holding a pool worker
+        cast.wait(timeout=CastConnectionPool.CONNECT_TIMEOUT)
+        result["connected_s"] = round(time.monotonic() - dispatch_start, 3)
+        mc = cast.media_controller
+        
+        # Determine target volume. If not specified, use current volume or default to 0.5
+        volume = media["volume"]
+        target_vol = volume if volume is not None else cast.status.volume_level if cast.status and cast.status.volume_level is not None else 0.5
+
+        # Smart Fade In
+        # If fade_in is enabled in config (default True)
+        fade_in = self.config.get("audio", "fade_in", True)
 
-    def stop_all(self, target_devices: list = None):
+        preloaded = False
+        if media.get("start_at") is not None:
+            # Pre-roll: load the media paused and silent now, press play at start_at
+            cast.set_volume(0.0)
+            mc.play_media(url, content_type='audio/mp3', title=media["title"], thumb=media["image_url"], autoplay=False)
+            mc.block_until_active(timeout=10)
+            preloaded = mc.status.content_id == url
+            result["preloaded_s"] = round(time.monotonic() - dispatch_start, 3)
+            if not preloaded:
+                logger.warning(f"Pre-roll did not load on {cast.name}, will load at start time.")
+        else:
+            # Start at 0 for a fade, otherwise go straight to the target volume
+            cast.set_volume(0.0 if fade_in else target_vol)
+        result["status"] = "ready"
+        return {"target_vol": target_vol, "fade_in": fade_in, "preloaded": preloaded}
+
+    def _start_device(self, cast, media: dict, dispatch_start: float, result: dict, state: dict):
+        """Start playback on a prepared device and hand any fade-in to the fade engine."""
+        url = media["url"]
+        mc = cast.media_controller
+        start_at = media.get("start_at")
+        target_vol, fade_in = state["target_vol"], state["fade_in"]
+
+        if self.stop_event.is_set():
+            logger.info(f"Playback aborted by stop signal on {cast.name}.")
+            result["status"] = "aborted"
+            return
+
+        if start_at is not None:
+            # How far after the scheduled instant the start commands went out
+            result["late_s"] = round((datetime.now() - start_at).total_seconds(), 3)
+        if state["preloaded"]:
+            if not fade_in:
+                cast.set_volume(target_vol)
+            mc.play()
+        else:
+            if start_at is not None and not fade_in:
+                cast.set_volume(target_vol)
+            # Metadata setup
+            # pychromecast play_media(url, content_type, title=None, thumb=None, ...)
+            # thumb is expected to be a URL string or None
+            mc.play_media(url, content_type='audio/mp3', title=media["title"], thumb=media["image_url"])
+        result["started_s"] = round(time.monotonic() - dispatch_start, 3)
+        mc.block_until_active(timeout=10) # Increased timeout
+        result["active_s"] = round(time.monotonic() - dispatch_start, 3)
+        result["status"] = "playing"
+
+        if fade_in:
+            # Verify state before fading in
+            if mc.status.player_state in ('IDLE', 'UNKNOWN') and mc.status.content_id != url:
+                logger.warning(f"Media failed to load on {cast.name}, skipping fade-in.")
+                # If we leave it at 0, it's silent. If we set it to target, it might blare.
+                # Safe to abort.
+                result["status"] = "failed"
+                result["error"] = "media did not load"
+            else:
+                # Ramp up on the shared fade engine; this worker is free straight away
+                self.fader.start(
+                    result["uuid"], cast, target_vol,
+                    duration=self.config.get("audio", "fade_duration", self.FADE_DURATION),
+                    curve=self.config.get("audio", "fade_curve", "linear")
+                )
+
+    def _log_dispatch(self, results: list):
+        started = [r["started_s"] for r in results if "started_s" in r]
+        ok = sum(1 for r in results if r["status"] == "playing")
+        spread = f", start spread {max(started) - min(started):.3f}s" if started else ""
+        logger.info(f"Playback started on {ok}/{len(results)} devices{spread}")
+
+    def stop_all(self, target_devices: list = None, deadline: float = None) -> list:
         """Stop playback and quit app on devices.
         
         Args:
             target_devices: Optional list of UUID strings. If provided, only stop on these.
                            If None, stops on ALL devices.
+            deadline: Seconds to wait for all devices together (default devices.stop_deadline).
+
+        Every device is stopped at the same time on the shared stop pool, so
+        reachable speakers never wait on unreachable ones. Returns a result
+        dict per device; devices that have not answered by the deadline are
+        reported as "timeout" and left to finish in the background.
         """
         self.stop_event.set() # Signal all loops to stop
+        # Stop volume ramps before anything touches the network
+        self.fader.cancel(target_devices if target_devices else None)
+        deadline = self.config.get("devices", "stop_deadline", self.STOP_DEADLINE) if deadline is None else deadline
         
         # Determine which devices to stop
         if target_devices is not None and len(target_devices) > 0:
             logger.info(f"Stopping audio on {len(target_devices)} targeted devices...")
         else:
             logger.info(f"Stopping all audio on {len(self.devices)} devices...")
-        
-        for uuid, cast in self.devices.items():
+
+        targets = []
+        for uuid, cast in list(self.devices.items()):
             # If target_devices specified, only stop on those
             if target_devices is not None and len(target_devices) > 0:
                 if str(uuid) not in target_devices:
                     logger.debug(f"Skipping {cast.name} (not in target list)")
                     continue
-            
-            try:
-                # CRITICAL: Must wait for connection before sending commands
-                cast.wait(timeout=5)
-                logger.debug(f"Connection established to {cast.name}")
-            except Exception as e:
-                logger.warning(f"Could not connect to {cast.name} for stop: {e}")
-                continue  # Skip this device if we can't connect
-            
-            # Stop Media
-            try:
-                cast.media_controller.stop()
-                logger.debug(f"Stop command sent to {cast.name}")
-            except Exception as e:
-                # It's common for stop to fail if nothing is playing (no active session)
-                logger.debug(f"Stop command on {cast.name} ignored: {e}")
+            targets.append((uuid, cast))
+        if not targets:
+            return []
 
-            # Quit the App (Force kill) - ensure we try this even if stop failed
-            try:
-                cast.quit_app()
-                logger.info(f"Stopped {cast.name}")
-            except Exception as e:
-                logger.warning(f"Could not quit app on {cast.name}: {e}")
+        started = time.monotonic()
+        executor = self._get_stop_executor()
+        futures = {
+            executor.submit(self._stop_device, cast, started + deadline, started): (uuid, cast)
+            for uuid, cast in targets
+        }
+        # Workers still stuck on an unreachable device are not waited for
+        done, _ = wait(futures, timeout=deadline)
+
+        results = []
+        for future, (uuid, cast) in futures.items():
+            result = {"uuid": str(uuid), "name": cast.name}
+            if future in done:
+                result.update(future.result())
+            else:
+                logger.warning(f"No stop confirmation from {cast.name} within {deadline}s")
+                result.update(status="timeout", error=f"no reply within {deadline}s", elapsed_s=None)
+            results.append(result)
+
+        stopped = sum(1 for r in results if r["status"] == "stopped")
+        logger.info(f"Stopped {stopped}/{len(results)} devices in {time.monotonic() - started:.3f}s")
+        return results
+
+    def _get_stop_executor(self) -> ThreadPoolExecutor:
+        """Pool for stop_all, separate from playback so a stop never queues behind a play."""
+        with self._executor_lock:
+            if self._stop_executor is None:
+                self._stop_executor = ThreadPoolExecutor(max_workers=self.STOP_WORKERS,
+                                                         thread_name_prefix="cast-stop")
+            return self._stop_executor
+
+    def _stop_device(self, cast, deadline_at: float, started: float) -> dict:
+        """Stop media and quit the app on one device; returns status, error and elapsed_s."""
+        result = {"status": "failed", "error": None}
+        try:
+            # CRITICAL: Must wait for connection before sending commands
+            cast.wait(timeout=max(0.0, deadline_at - time.monotonic()))
+            logger.debug(f"Connection established to {cast.name}")
+        except Exception as e:
+            logger.warning(f"Could not connect to {cast.name} for stop: {e}")
+            result.update(status="unreachable", error=str(e) or type(e).__name__)
+            result["elapsed_s"] = round(time.monotonic() - started, 3)
+            return result  # Skip this device if we can't connect
+        
+        # Stop Media
+        try:
+            cast.media_controller.stop()
+            logger.debug(f"Stop command sent to {cast.name}")
+        except Exception as e:
+            # It's common for stop to fail if nothing is playing (no active session)
+            logger.debug(f"Stop command on {cast.name} ignored: {e}")
+
+        # Quit the App (Force kill) - ensure we try this even if stop failed
+        try:
+            cast.quit_app()
+            logger.info(f"Stopped {cast.name}")
+            result["status"] = "stopped"
+        except Exception as e:
+            logger.warning(f"Could not quit app on {cast.name}: {e}")
+            result["error"] = str(e)
+        result["elapsed_s"] = round(time.monotonic() - started, 3)
+        return result
+
+    async def stop_all_async(self, target_devices: list = None, deadline: float = None) -> list:
+        """Coroutine version of stop_all for the asyncio execution mode."""
+        # Signal running playbacks straight away, before waiting for a worker
+        self.stop_event.set()
+        loop = asyncio.get_running_loop()
+        # Not the playback pool, so a stop never queues behind the playback it is stopping
+        return await loop.run_in_executor(None, self.stop_all, target_devices, deadline)
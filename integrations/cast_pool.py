@@ -0,0 +1,146 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+class CastConnectionPool:
+    """One long-lived Chromecast connection per device UUID.
+
+    Discovery updates (add_cast/update_cast) reuse the existing Chromecast
+    object as long as the device's host and port are unchanged, so its socket
+    stays open instead of being rebuilt and reconnected at playback time.
+    A background health check recreates connections whose socket thread has
+    died; pychromecast's socket client handles transient reconnects itself.
+    """
+
+    HEALTH_INTERVAL = 30
+    CONNECT_TIMEOUT = 10
+
+    def __init__(self, zconf, factory=None):
+        self.zconf = zconf
+        # uuid -> Chromecast; CastManager.devices is this same dict
+        self.casts = {}
+        self._infos = {}
+        self._factory = factory or self._default_factory
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"created": 0, "reused": 0, "recreated": 0}
+
+    def _default_factory(self, cast_info):
+        from pychromecast import get_chromecast_from_cast_info
+        return get_chromecast_from_cast_info(cast_info, self.zconf)
+
+    def acquire(self, uuid, cast_info):
+        """Return the pooled Chromecast for uuid, creating it only if needed."""
+        with self._lock:
+            cast = self.casts.get(uuid)
+            old_info = self._infos.get(uuid)
+            if cast is not None and old_info is not None and \
+                    (old_info.host, old_info.port) == (cast_info.host, cast_info.port):
+                self._infos[uuid] = cast_info
+                self.stats["reused"] += 1
+                return cast
+
+            if cast is not None:
+                logger.info(f"Cast device {cast.name} moved to {cast_info.host}:{cast_info.port}, reconnecting")
+                self._disconnect(cast)
+            return self._create(uuid, cast_info)
+
+    def _create(self, uuid, cast_info):
+        cast = self._factory(cast_info)
+        # Connect in the background (non-blocking); wait() later is then instant
+        cast.start()
+        self.casts[uuid] = cast
+        self._infos[uuid] = cast_info
+        self.stats["created"] += 1
+        return cast
+
+    def remove(self, uuid):
+        with self._lock:
+            cast = self.casts.pop(uuid, None)
+            self._infos.pop(uuid, None)
+        if cast is not None:
+            self._disconnect(cast)
+
+    @staticmethod
+    def _disconnect(cast):
+        try:
+            cast.disconnect(timeout=0)
+        except Exception as e:
+            logger.debug(f"Error disconnecting {cast.name}: {e}")
+
+    @staticmethod
+    def is_connected(cast) -> bool:
+        socket_client = getattr(cast, "socket_client", None)
+        return bool(socket_client is not None and socket_client.is_connected)
+
+    def check_health(self) -> int:
+        """Recreate connections whose socket thread has stopped; returns how many."""
+        recreated = 0
+        with self._lock:
+            for uuid, cast in list(self.casts.items()):
+                if self.is_connected(cast):
+                    continue
+                socket_client = getattr(cast, "socket_client", None)
+                if socket_client is not None and socket_client.is_alive():
+                    # Still retrying on its own
+                    logger.debug(f"Cast device {cast.name} is reconnecting")
+                    continue
+                logger.warning(f"Connection to {cast.name} lost, recreating")
+                self._disconnect(cast)
+                try:
+                    self._create(uuid, self._infos[uuid])
+                    self.stats["recreated"] += 1
+                    recreated += 1
+                except Exception as e:
+                    logger.error(f"Error recreating connection to {cast.name}: {e}")
+        return recreated
+
+    def warm(self, uuids=None, timeout: float = None) -> int:
+        """Block until the given (default: all) devices are connected or timeout.
+
+        Returns the number of those devices connected afterwards.
+        """
+        timeout = self.CONNECT_TIMEOUT if timeout is None else timeout
+        with self._lock:
+            casts = [cast for uuid, cast in self.casts.items() if uuids is None or str(uuid) in uuids]
+
+        pending = [cast for cast in casts if not self.is_connected(cast)]
+        if pending:
+            logger.info(f"Warming connections to {len(pending)} device(s)...")
+            with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="cast-warm") as executor:
+                futures = [executor.submit(self._wait, cast, timeout) for cast in pending]
+                wait(futures, timeout=timeout + 1)
+        return sum(1 for cast in casts if self.is_connected(cast))
+
+    @staticmethod
+    def _wait(cast, timeout: float):
+        try:
+            cast.wait(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Could not connect to {cast.name}: {e}")
+
+    def start_health_checks(self, interval: float = None):
+        interval = self.HEALTH_INTERVAL if interval is None else interval
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def _run():
+            while not self._stop.wait(interval):
+                try:
+                    self.check_health()
+                except Exception as e:
+                    logger.error(f"Error checking Cast connections: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=_run, name="cast-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            for uuid in list(self.casts):
+                self.remove(uuid)
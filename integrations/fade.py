@@ -0,0 +1,118 @@
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Volume shape over the ramp, mapping elapsed fraction (0..1) to volume fraction (0..1)
+CURVES = {
+    "linear": lambda x: x,
+    # Slow start, fast finish; closer to how loudness is perceived
+    "exponential": lambda x: x * x,
+    # Fast start, slow finish
+    "logarithmic": math.sqrt,
+    "s_curve": lambda x: x * x * (3 - 2 * x),
+}
+
+
+class Ramp:
+    """One device's volume ramp; `done` is set when it finishes or is cancelled."""
+
+    def __init__(self, cast, start_volume: float, target_volume: float, duration: float, curve: str):
+        self.cast = cast
+        self.start_volume = start_volume
+        self.target_volume = target_volume
+        self.duration = duration
+        self.curve = CURVES.get(curve, CURVES["linear"])
+        self.started = time.monotonic()
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def volume_at(self, now: float) -> tuple:
+        """Return (volume, finished) for the monotonic time `now`."""
+        fraction = 1.0 if self.duration <= 0 else min(1.0, (now - self.started) / self.duration)
+        volume = self.start_volume + (self.target_volume - self.start_volume) * self.curve(fraction)
+        return volume, fraction >= 1.0
+
+
+class FadeEngine:
+    """Drives volume ramps for every fading device from one timer thread.
+
+    Callers start a ramp and return straight away; the engine thread wakes
+    every `tick` seconds while ramps are active, sets each device's volume
+    from the elapsed time and sleeps when nothing is fading. Ramps are keyed
+    by device, so starting a new one replaces the old, and cancel() takes
+    effect before the next volume step.
+    """
+
+    TICK_SECONDS = 0.5
+
+    def __init__(self, tick: float = None):
+        self.tick = self.TICK_SECONDS if tick is None else tick
+        self._ramps = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self, key, cast, target_volume: float, duration: float, curve: str = "linear",
+              start_volume: float = 0.0) -> Ramp:
+        if curve not in CURVES:
+            logger.warning(f"Unknown fade curve '{curve}', using linear")
+        ramp = Ramp(cast, start_volume, target_volume, duration, curve)
+        with self._cond:
+            previous = self._ramps.get(key)
+            if previous is not None:
+                self._finish(previous, cancelled=True)
+            self._ramps[key] = ramp
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="fade-engine", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return ramp
+
+    def cancel(self, keys=None) -> int:
+        """Cancel ramps for the given keys (default: all); returns how many."""
+        with self._cond:
+            cancelled = [k for k in self._ramps if keys is None or k in keys]
+            for key in cancelled:
+                self._finish(self._ramps.pop(key), cancelled=True)
+            self._cond.notify()
+        if cancelled:
+            logger.info(f"Cancelled {len(cancelled)} fade(s)")
+        return len(cancelled)
+
+    def active(self) -> int:
+        with self._cond:
+            return len(self._ramps)
+
+    @staticmethod
+    def _finish(ramp: Ramp, cancelled: bool = False):
+        ramp.cancelled = ramp.cancelled or cancelled
+        ramp.done.set()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._ramps:
+                    self._cond.wait()
+                ramps = list(self._ramps.items())
+
+            now = time.monotonic()
+            for key, ramp in ramps:
+                if ramp.cancelled:
+                    continue
+                volume, finished = ramp.volume_at(now)
+                try:
+                    ramp.cast.set_volume(volume)
+                except Exception as e:
+                    logger.warning(f"Fade step failed on {ramp.cast.name}: {e}")
+                    finished = True
+                if finished:
+                    with self._cond:
+                        if self._ramps.get(key) is ramp:
+                            del self._ramps[key]
+                    self._finish(ramp)
+
+            with self._cond:
+                if self._ramps:
+                    self._cond.wait(self.tick)
@@ -1,7 +1,15 @@
+import time
+
+# Taken before any heavy import so startup timings cover the whole boot
+BOOT_TIME = time.monotonic()
+
+import asyncio
 import logging
 import sys
+import threading
 import uvicorn
-from core.scheduler import AthanScheduler
+from core.startup import StartupReport
+from core.audio_manager import AudioManager
 from web.app import create_app
 from config.config_manager import ConfigManager
 
@@ -13,21 +21,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger("main")
 
+# system.execution_mode: "threads" runs the scheduler on its own thread pool,
+# "asyncio" runs jobs and playback on uvicorn's event loop
+EXECUTION_MODES = ("threads", "asyncio")
+
+def warm_up(app, config, startup: StartupReport, loop=None):
+    """Load the scheduler stack (APScheduler, islamic-times, pychromecast) and start it.
+
+    Runs in a background thread once the web server is up, so the dashboard
+    is reachable while the heavy modules import.
+    """
+    try:
+        from core.scheduler import AthanScheduler
+        startup.mark("scheduler_imported")
+
+        scheduler = AthanScheduler(config, audio_manager=app.state.audio_manager, loop=loop)
+        scheduler.start()
+        app.state.scheduler = scheduler
+        startup.mark("scheduler_ready")
+    except Exception as e:
+        logger.error(f"Error starting scheduler: {e}")
+    startup.log_summary()
+
 def main():
+    startup = StartupReport(BOOT_TIME)
     logger.info("Starting Home Athan Automation System...")
-    
+
     # 1. Load Configuration
     config = ConfigManager()
-    
-    # 2. Start Scheduler
-    scheduler = AthanScheduler(config)
-    scheduler.start()
-    
-    # 3. Create Web App
-    app = create_app(config, scheduler)
-    
-    # 4. Run Server
-    # Note: In production, this might be run via gunicorn/uvicorn directly, 
+    # Hot-reload edits to config.yaml without a restart
+    config.start_watching(config.get("system", "config_poll_seconds", ConfigManager.POLL_SECONDS))
+
+    # 2. Create Web App (the scheduler is attached once warm-up finishes)
+    app = create_app(config, audio_manager=AudioManager(config), startup=startup)
+
+    mode = config.get("system", "execution_mode", "threads")
+    if mode not in EXECUTION_MODES:
+        logger.warning(f"Unknown execution mode '{mode}', using threads")
+        mode = "threads"
+    logger.info(f"Execution mode: {mode}")
+
+    @app.on_event("startup")
+    async def start_warm_up():
+        startup.mark("server_started")
+        loop = asyncio.get_running_loop() if mode == "asyncio" else None
+        threading.Thread(target=warm_up, args=(app, config, startup, loop), name="warm-up", daemon=True).start()
+
+    # 3. Run Server
+    # Note: In production, this might be run via gunicorn/uvicorn directly,
     # but for simplicity/development we run it here.
     uvicorn.run(app, host="0.0.0.0", port=config.get("system", "web_port", 8000))
 
@@ -0,0 +1,103 @@
+"""
+Compare the numpy solar backend against islamic-times (ITLocation).
+
+Calculates a full year of prayer times for every city in core/cities.py with
+both backends and reports the largest difference per prayer. A city fails when
+more than --max-outlier-days days differ by more than the tolerance; a few
+outliers are expected where the sun only just reaches the Fajr/Isha angle
+(ill-conditioned) and where ITLocation returns the following day's times.
+Exits non-zero if any city fails.
+
+Usage:
+    python scripts/compare_backends.py [--year 2026] [--method ISNA] [--tolerance 2.5]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.backends import get_backend  # noqa: E402
+from core.cities import COUNTRIES  # noqa: E402
+from core.timetable import PRAYER_NAMES  # noqa: E402
+
+
+def compare_city(city: dict, year: int, settings: dict) -> tuple:
+    """Return (abs difference in minutes per day and prayer, seconds spent per backend)."""
+    settings = dict(settings, latitude=city["lat"], longitude=city["lng"])
+    start, end = date(year, 1, 1), date(year, 12, 31)
+
+    timings = {}
+    tables = {}
+    for name in ("islamic_times", "numpy"):
+        t0 = time.perf_counter()
+        tables[name] = get_backend(name).calculate_range(settings, start, end)
+        timings[name] = time.perf_counter() - t0
+
+    diff = (tables["numpy"].seconds - tables["islamic_times"].seconds) / 60.0
+    # An event just after midnight may be reported on either side of the day boundary
+    diff = (diff + 720.0) % 1440.0 - 720.0
+    # A time missing in only one backend counts as a failure
+    diff[np.isnan(tables["numpy"].seconds) != np.isnan(tables["islamic_times"].seconds)] = np.inf
+    return np.abs(diff), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, default=date.today().year)
+    parser.add_argument("--method", default="ISNA", help="calculation_method to compare")
+    parser.add_argument("--asr", default="STANDARD", help="asr_method (STANDARD or HANAFI)")
+    parser.add_argument("--high-latitude-rule", default="ANGLEBASED")
+    parser.add_argument("--tolerance", type=float, default=2.5, help="maximum allowed difference in minutes")
+    parser.add_argument("--max-outlier-days", type=int, default=4,
+                        help="days per city allowed to exceed the tolerance")
+    args = parser.parse_args()
+
+    settings = {
+        "calculation_method": args.method,
+        "asr_method": args.asr,
+        "custom_angles": {},
+        "high_latitude_rule": args.high_latitude_rule,
+    }
+
+    # islamic-times warns for every extreme-latitude day
+    warnings.simplefilter("ignore")
+
+    worst = np.zeros(len(PRAYER_NAMES))
+    totals = {"islamic_times": 0.0, "numpy": 0.0}
+    failures = []
+    print(f"{'City':<22}" + "".join(f"{p:>9}" for p in PRAYER_NAMES) + f"{'Outliers':>10}")
+    for country, cities in COUNTRIES.items():
+        for city in cities:
+            diff, timings = compare_city(city, args.year, settings)
+            outliers = int((diff > args.tolerance).any(axis=1).sum())
+            # Max over the days within tolerance; outlier days are only counted
+            within = np.where((diff > args.tolerance).any(axis=1, keepdims=True), np.nan, diff)
+            max_diff = np.nan_to_num(np.nanmax(within, axis=0)) if outliers < len(diff) else np.full(len(PRAYER_NAMES), np.inf)
+            worst = np.maximum(worst, max_diff)
+            for name, seconds in timings.items():
+                totals[name] += seconds
+            print(f"{city['name'][:22]:<22}" + "".join(f"{d:>9.2f}" for d in max_diff) + f"{outliers:>10}")
+            if outliers > args.max_outlier_days:
+                failures.append(f"{country}/{city['name']}")
+
+    print(f"{'Worst':<22}" + "".join(f"{d:>9.2f}" for d in worst))
+    print(f"Time: islamic_times {totals['islamic_times']:.2f}s, numpy {totals['numpy']:.2f}s")
+
+    if failures:
+        shown = ", ".join(failures[:10]) + (", ..." if len(failures) > 10 else "")
+        print(f"FAIL: {len(failures)} cities have more than {args.max_outlier_days} days "
+              f"beyond {args.tolerance} min: {shown}")
+        return 1
+    print(f"OK: all cities within {args.tolerance} min for {args.year} "
+          f"(at most {args.max_outlier_days} outlier days each)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
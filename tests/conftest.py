@@ -0,0 +1,60 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config.config_manager import ConfigManager  # noqa: E402
+from core.audio_manager import AudioManager  # noqa: E402
+from core.scheduler import AthanScheduler  # noqa: E402
+from benchmarks.stubs import OfflineCastManager  # noqa: E402
+
+# Small real MP3 shipped with the repo, copied into each test's audio directory
+SAMPLE_MP3 = os.path.join(ROOT, "audio", "athan", "beep.mp3")
+
+
+@pytest.fixture
+def config(tmp_path):
+    """ConfigManager over a temporary config.yaml, with every cache under tmp_path."""
+    config = ConfigManager(config_path=str(tmp_path / "config.yaml"),
+                           default_path=os.path.join(ROOT, "config", "default_config.yaml"))
+    config.update({
+        "system": {"timetable_cache_dir": str(tmp_path / "timetables"),
+                   "job_store_path": str(tmp_path / "jobs.sqlite")},
+        # No index watcher threads; lookups check the directory mtimes instead
+        "audio": {"index_poll_seconds": 0, "optimize": False, "fade_in": False},
+    })
+    yield config
+    config.stop_watching()
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    base = tmp_path / "audio"
+    for sub in ("athan", "reminders"):
+        (base / sub).mkdir(parents=True)
+        shutil.copy(SAMPLE_MP3, base / sub / "beep.mp3")
+    return base
+
+
+@pytest.fixture
+def audio_manager(config, audio_dir):
+    return AudioManager(config, base_path=str(audio_dir))
+
+
+@pytest.fixture
+def cast_manager(config):
+    cast_manager = OfflineCastManager(config, device_count=3)
+    cast_manager.start_discovery()
+    return cast_manager
+
+
+@pytest.fixture
+def scheduler(config, audio_manager, cast_manager):
+    scheduler = AthanScheduler(config, audio_manager=audio_manager, cast_manager=cast_manager)
+    yield scheduler
+    if scheduler.scheduler.running:
+        scheduler.scheduler.shutdown(wait=False)
@@ -0,0 +1,44 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from core.calculator import PrayerCalculator
+
+DAY = date(2030, 6, 21)
+# Between grid points, including either side of midnight where azimuth wraps through north
+TIMES = [time(0, 2, 30), time(6, 17, 45), time(12, 2, 30), time(17, 41, 10), time(23, 57, 30)]
+
+
+@pytest.fixture
+def grid_and_calculator(config):
+    calculator = PrayerCalculator(config)
+    return calculator.build_astronomy_grid(DAY), calculator
+
+
+def _angle_diff(a: float, b: float) -> float:
+    return abs((a - b + 180) % 360 - 180)
+
+
+@pytest.mark.parametrize("at", TIMES, ids=str)
+def test_grid_matches_direct_calculation(grid_and_calculator, at):
+    grid, calculator = grid_and_calculator
+    now = datetime.combine(DAY, at)
+    values = grid.interpolate(now)
+    calculator._astronomy_cache = None
+    direct = calculator._get_astronomy_data_direct(now)
+
+    # The direct values are rounded to 0.1
+    assert values["sun_altitude"] == pytest.approx(direct["sun_altitude"], abs=0.3)
+    assert _angle_diff(values["sun_azimuth"], direct["sun_azimuth"]) < 0.5
+    assert values["moon_illumination"] * 100 == pytest.approx(direct["moon_illumination"], abs=0.2)
+    assert grid.nearest_phase(now)[0] == direct["nearest_phase"]["name"]
+
+
+def test_grid_covers_only_its_day_and_location(grid_and_calculator):
+    grid, _ = grid_and_calculator
+
+    assert grid.covers(DAY, grid.location)
+    assert not grid.covers(DAY + timedelta(days=1), grid.location)
+    assert not grid.covers(DAY, (0.0, 0.0))
+    # Samples run from midnight to the following midnight inclusive
+    assert grid.offsets[-1] == 86400
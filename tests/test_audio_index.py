@@ -0,0 +1,169 @@
+import os
+import shutil
+import threading
+
+import pytest
+
+from core.audio_index import AudioIndex, mp3_info
+from tests.conftest import SAMPLE_MP3
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo, no CRC: 417-byte frames
+MPEG1_128K = bytes([0xFF, 0xFB, 0x90, 0x00])
+FRAME_128K = 144 * 128000 // 44100
+# MPEG-2 Layer III, 64 kbps, 22.05 kHz, mono
+MPEG2_64K_MONO = bytes([0xFF, 0xF3, 0x80, 0xC0])
+FRAME_64K = 72 * 64000 // 22050
+
+
+def _frames(header: bytes, frame_size: int, count: int) -> bytes:
+    return (header + bytes(frame_size - len(header))) * count
+
+
+def _id3(size: int, footer: bool = False) -> bytes:
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    flags = 0x10 if footer else 0x00
+    return b"ID3\x04\x00" + bytes([flags]) + syncsafe + bytes(size) + (bytes(10) if footer else b"")
+
+
+def _write(tmp_path, data: bytes, name: str = "a.mp3") -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_cbr_mpeg1(tmp_path):
+    path = _write(tmp_path, _frames(MPEG1_128K, FRAME_128K, 100))
+    duration, bitrate = mp3_info(path)
+
+    assert bitrate == 128
+    assert duration == pytest.approx(100 * FRAME_128K * 8 / 128000, abs=0.001)
+
+
+def test_cbr_mpeg2_mono(tmp_path):
+    path = _write(tmp_path, _frames(MPEG2_64K_MONO, FRAME_64K, 50))
+    duration, bitrate = mp3_info(path)
+
+    assert bitrate == 64
+    assert duration == pytest.approx(50 * FRAME_64K * 8 / 64000, abs=0.001)
+
+
+@pytest.mark.parametrize("footer", [False, True])
+def test_id3v2_tag_is_skipped(tmp_path, footer):
+    audio = _frames(MPEG1_128K, FRAME_128K, 100)
+    path = _write(tmp_path, _id3(2048, footer) + audio)
+    duration, bitrate = mp3_info(path)
+
+    assert bitrate == 128
+    assert duration == pytest.approx(len(audio) * 8 / 128000, abs=0.001)
+
+
+def test_large_id3v2_tag_beyond_scan_window(tmp_path):
+    # Bigger than the first read, e.g. embedded cover art
+    audio = _frames(MPEG1_128K, FRAME_128K, 100)
+    path = _write(tmp_path, _id3(200 * 1024) + audio)
+    duration, bitrate = mp3_info(path)
+
+    assert bitrate == 128
+    assert duration == pytest.approx(len(audio) * 8 / 128000, abs=0.001)
+
+
+def test_xing_header_gives_vbr_duration(tmp_path):
+    first = bytearray(FRAME_128K)
+    first[:4] = MPEG1_128K
+    # Side info for MPEG-1 stereo is 32 bytes; then "Xing", flags (frames present), frame count
+    xing = 4 + 32
+    first[xing:xing + 12] = b"Xing" + (1).to_bytes(4, "big") + (1000).to_bytes(4, "big")
+    data = bytes(first) + _frames(MPEG1_128K, FRAME_128K, 99)
+    duration, bitrate = mp3_info(_write(tmp_path, data))
+
+    assert duration == pytest.approx(1000 * 1152 / 44100, abs=0.001)
+    assert bitrate == round(len(data) * 8 / duration / 1000)
+
+
+def test_invalid_headers_are_skipped(tmp_path):
+    # A false sync with the "bad" bitrate index 15 before the real first frame
+    junk = bytes([0x00, 0xFF, 0xFB, 0xF0, 0x00, 0x12])
+    audio = _frames(MPEG1_128K, FRAME_128K, 10)
+    duration, bitrate = mp3_info(_write(tmp_path, junk + audio))
+
+    assert bitrate == 128
+    assert duration == pytest.approx(len(audio) * 8 / 128000, abs=0.001)
+
+
+def test_not_mpeg_or_missing(tmp_path):
+    assert mp3_info(_write(tmp_path, b"RIFF" + bytes(1000))) == (None, None)
+    assert mp3_info(str(tmp_path / "missing.mp3")) == (None, None)
+
+
+def test_sample_file():
+    duration, bitrate = mp3_info(SAMPLE_MP3)
+    assert duration > 0 and bitrate > 0
+
+
+def test_first_scan_runs_in_background_and_notifies(tmp_path, monkeypatch):
+    shutil.copy(SAMPLE_MP3, tmp_path / "a.mp3")
+    release = threading.Event()
+    original = AudioIndex.refresh
+
+    def slow_refresh(self, force=False):
+        release.wait(5)
+        return original(self, force)
+
+    monkeypatch.setattr(AudioIndex, "refresh", slow_refresh)
+    index = AudioIndex(str(tmp_path))
+    notified = []
+    index.listeners.append(notified.append)
+
+    # Construction returned while the scan is still blocked
+    assert not index.wait_loaded(timeout=0.05)
+    release.set()
+    assert index.files() == ["a.mp3"]
+    assert [info.filename for info in notified[0]] == ["a.mp3"]
+
+
+def test_entries_and_files_are_published_together(tmp_path):
+    for name in ("a.mp3", "b.mp3"):
+        shutil.copy(SAMPLE_MP3, tmp_path / name)
+    index = AudioIndex(str(tmp_path))
+    index.wait_loaded()
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                entries = index.entries()
+                index.fingerprint()
+                assert all(info.filename in index or info.filename == "c.mp3" for info in entries)
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    extra = tmp_path / "c.mp3"
+    try:
+        for _ in range(200):
+            if extra.exists():
+                os.remove(extra)
+            else:
+                shutil.copy(SAMPLE_MP3, extra)
+            index.refresh(force=True)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert errors == []
+    entries, files = index._state
+    assert tuple(sorted(entries)) == files
+
+
+def test_rescan_keeps_unchanged_entries(tmp_path):
+    shutil.copy(SAMPLE_MP3, tmp_path / "a.mp3")
+    index = AudioIndex(str(tmp_path))
+    before = index.get("a.mp3")
+    shutil.copy(SAMPLE_MP3, tmp_path / "b.mp3")
+    assert index.refresh(force=True)
+
+    assert index.get("a.mp3") is before
+    assert index.files() == ["a.mp3", "b.mp3"]
+    assert index.get("b.mp3").sha256 == before.sha256
@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+
+from core.cache import ByteCache, LRUCache
+from core.calculator import PrayerCalculator
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_put_refreshes_existing_key():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 10
+    assert len(cache) == 2
+
+
+def test_lru_stats_and_falsy_values():
+    cache = LRUCache(maxsize=4)
+    cache.put("empty", {})
+    assert cache.get("empty", "default") == {}
+    assert cache.get("missing", "default") == "default"
+
+    assert cache.stats() == {"size": 1, "maxsize": 4, "hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_byte_cache_respects_budget():
+    cache = ByteCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # "b" is now the oldest
+    cache.put("c", b"cccc")
+
+    assert "b" not in cache
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_cache_evicts_several_for_one_large_value():
+    cache = ByteCache(max_bytes=10)
+    for key in "abc":
+        cache.put(key, b"xxx")
+    cache.put("big", b"y" * 9)
+
+    assert list(cache._data) == ["big"]
+    assert cache.stats()["bytes"] == 9
+
+
+def test_byte_cache_skips_values_over_budget():
+    cache = ByteCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+
+    assert cache.put("huge", b"z" * 11) is False
+    assert "huge" not in cache and "a" in cache
+
+
+def test_byte_cache_replacing_a_key_adjusts_size():
+    cache = ByteCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aa")
+
+    assert cache.stats()["bytes"] == 2
+    assert len(cache) == 1
+
+
+def test_times_cache_is_keyed_by_location(config):
+    config.update({"location": {"calculation_backend": "numpy"}})
+    calculator = PrayerCalculator(config)
+    day = date(2030, 6, 1)
+    london = calculator.calculate_times(day)
+    hits = calculator.cache_stats()["hits"]
+    assert calculator.calculate_times(day) == london
+    assert calculator.cache_stats()["hits"] == hits + 1
+
+    config.update({"location": {"latitude": 21.4225, "longitude": 39.8262}})
+    makkah = calculator.calculate_times(day)
+    assert makkah != london
+    assert makkah == PrayerCalculator(config).calculate_times(day)
+
+    # Switching back hits the entries still cached for the old fingerprint
+    config.update({"location": {"latitude": 51.5074, "longitude": -0.1278}})
+    hits = calculator.cache_stats()["hits"]
+    assert calculator.calculate_times(day) == london
+    assert calculator.cache_stats()["hits"] == hits + 1
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def slow_device(cast_manager):
+    """One fake speaker whose quit_app takes far longer than the stop deadline."""
+    cast = next(iter(cast_manager.devices.values()))
+    original = cast.quit_app
+
+    def quit_app():
+        time.sleep(1.5)
+        original()
+
+    cast.quit_app = quit_app
+    return cast
+
+
+def test_stop_all_returns_within_deadline(cast_manager, slow_device):
+    started = time.monotonic()
+    results = cast_manager.stop_all(deadline=0.3)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.6
+    by_name = {r["name"]: r for r in results}
+    assert by_name[slow_device.name]["status"] == "timeout"
+    assert by_name[slow_device.name]["elapsed_s"] is None
+    others = [r for name, r in by_name.items() if name != slow_device.name]
+    assert len(others) == 2 and all(r["status"] == "stopped" for r in others)
+    assert cast_manager.stop_event.is_set()
+
+
+def test_stop_all_targets_only_given_devices(cast_manager):
+    uuid = str(next(iter(cast_manager.devices)))
+    results = cast_manager.stop_all([uuid])
+
+    assert [r["uuid"] for r in results] == [uuid]
+    assert results[0]["status"] == "stopped"
+
+
+def test_unreachable_device_reported(cast_manager):
+    cast = next(iter(cast_manager.devices.values()))
+
+    def wait(timeout=None):
+        raise TimeoutError("no route to host")
+
+    cast.wait = wait
+    results = {r["name"]: r for r in cast_manager.stop_all(deadline=0.5)}
+
+    assert results[cast.name]["status"] == "unreachable"
+    assert results[cast.name]["error"] == "no route to host"
+
+
+def test_stop_all_reuses_its_pool(cast_manager):
+    cast_manager.stop_all(deadline=0.5)
+    executor = cast_manager._stop_executor
+    cast_manager.stop_all(deadline=0.5)
+
+    assert executor is not None and cast_manager._stop_executor is executor
+    assert executor is not cast_manager._executor
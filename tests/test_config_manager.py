@@ -0,0 +1,131 @@
+import copy
+import json
+import time
+
+import pytest
+import yaml
+
+from config.config_manager import FrozenDict, freeze, thaw
+
+
+def _wait_for(condition, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_snapshot_is_immutable(config):
+    snapshot = config.config
+    with pytest.raises(TypeError):
+        snapshot["audio"] = {}
+    with pytest.raises(TypeError):
+        snapshot["audio"]["fade_in"] = True
+    with pytest.raises(TypeError):
+        snapshot["location"].update({"latitude": 0})
+    with pytest.raises(TypeError):
+        snapshot.pop("audio")
+    assert isinstance(snapshot["prayers"]["Fajr"].get("enabled_devices", ()), tuple)
+
+
+def test_freeze_thaw_round_trip():
+    data = {"a": {"b": [1, {"c": 2}]}, "d": "e"}
+    frozen = freeze(data)
+
+    assert isinstance(frozen, FrozenDict) and isinstance(frozen["a"]["b"], tuple)
+    assert thaw(frozen) == data
+    assert json.loads(json.dumps(frozen)) == data
+    # Copies are mutable, for callers that want to edit one
+    edited = copy.deepcopy(frozen)
+    edited["a"]["b"].append(3)
+    assert frozen["a"]["b"] == (1, FrozenDict(c=2))
+
+
+def test_update_publishes_new_version_and_notifies(config):
+    events = []
+    config.listeners.append(lambda old, new: events.append((old, new)))
+    version, before = config.snapshot()
+
+    config.update({"prayers": {"Fajr": {"athan_volume": 0.9}}})
+
+    assert config.version == version + 1
+    assert len(events) == 1
+    old, new = events[0]
+    assert old is before and new is config.config
+    assert new["prayers"]["Fajr"]["athan_volume"] == 0.9
+    # A snapshot someone still holds does not change
+    assert before["prayers"]["Fajr"].get("athan_volume") != 0.9
+    # Untouched sections are carried over
+    assert new["location"] == before["location"]
+
+
+def test_noop_update_does_not_publish(config):
+    config.update({"prayers": {"Fajr": {"athan_volume": 0.9}}})
+    events = []
+    config.listeners.append(lambda old, new: events.append(new))
+    version = config.version
+
+    config.update({"prayers": {"Fajr": {"athan_volume": 0.9}}})
+    config.set("prayers", "Fajr", config.get("prayers", "Fajr"))
+
+    assert config.version == version
+    assert events == []
+
+
+def test_update_is_saved(config):
+    config.update({"location": {"latitude": 12.5}})
+    with open(config.config_path) as f:
+        assert yaml.safe_load(f)["location"]["latitude"] == 12.5
+
+
+def test_plan_sections_trigger_refresh(config, scheduler, monkeypatch):
+    refreshes = []
+    monkeypatch.setattr(scheduler, "request_refresh", lambda: refreshes.append(1))
+    config.listeners.append(scheduler.on_config_changed)
+
+    # Not read by the job plan
+    config.update({"ui": {"theme": "dark"}})
+    assert refreshes == []
+
+    config.update({"prayers": {"Isha": {"athan_volume": 0.2}}})
+    assert refreshes == [1]
+
+
+def test_watcher_reloads_external_edit(config):
+    events = []
+    config.listeners.append(lambda old, new: events.append(new))
+    config.start_watching(0.05)
+
+    data = yaml.safe_load(open(config.config_path))
+    data["location"]["latitude"] = 12.5
+    with open(config.config_path, "w") as f:
+        yaml.safe_dump(data, f)
+
+    assert _wait_for(lambda: config.get("location", "latitude") == 12.5)
+    assert len(events) == 1
+
+
+def test_watcher_ignores_own_saves(config):
+    events = []
+    config.listeners.append(lambda old, new: events.append(new))
+    config.start_watching(0.05)
+
+    config.update({"location": {"latitude": 12.5}})
+    time.sleep(0.3)
+
+    # Only the update itself notified; the watcher did not reload the saved file
+    assert len(events) == 1
+
+
+def test_watcher_keeps_snapshot_on_broken_file(config):
+    config.start_watching(0.05)
+    version = config.version
+
+    with open(config.config_path, "w") as f:
+        f.write("location: [broken")
+    time.sleep(0.3)
+
+    assert config.version == version
+    assert config.get("location", "latitude") is not None
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from core.utils import (HIJRI_TABLE_END, HIJRI_TABLE_START, _gregorian_to_hijri_scalar, format_hijri,
+                        gregorian_to_hijri, gregorian_to_hijri_array, hijri_calendar)
+
+ONE_DAY = timedelta(days=1)
+
+SAMPLE_DATES = [
+    HIJRI_TABLE_START,
+    HIJRI_TABLE_START + ONE_DAY,
+    HIJRI_TABLE_END - ONE_DAY,
+    HIJRI_TABLE_END,
+    # Just outside the table: computed instead of looked up
+    HIJRI_TABLE_START - ONE_DAY,
+    HIJRI_TABLE_END + ONE_DAY,
+    date(1800, 6, 1),
+    date(2200, 6, 1),
+    # Leap days and century years
+    date(1900, 2, 28),
+    date(1900, 3, 1),
+    date(2000, 2, 29),
+    date(2024, 2, 29),
+    date(2100, 2, 28),
+    date(2100, 3, 1),
+    date(1970, 1, 1),
+    date(2024, 3, 11),
+    date(2026, 10, 17),
+]
+
+
+@pytest.mark.parametrize("offset", [-1, 0, 1])
+@pytest.mark.parametrize("day", SAMPLE_DATES, ids=str)
+def test_lookup_matches_scalar_algorithm(day, offset):
+    assert gregorian_to_hijri(day, offset) == _gregorian_to_hijri_scalar(day + timedelta(days=offset))
+
+
+@pytest.mark.parametrize("day", SAMPLE_DATES, ids=str)
+def test_array_matches_scalar_algorithm(day):
+    assert tuple(gregorian_to_hijri_array([day.toordinal()])[0]) == _gregorian_to_hijri_scalar(day)
+
+
+def test_whole_table_matches_scalar_algorithm():
+    ordinals = np.arange(HIJRI_TABLE_START.toordinal(), HIJRI_TABLE_END.toordinal() + 1)
+    vectorised = gregorian_to_hijri_array(ordinals)
+    scalar = np.array([_gregorian_to_hijri_scalar(date.fromordinal(int(o))) for o in ordinals])
+    mismatches = np.flatnonzero((vectorised != scalar).any(axis=1))
+
+    assert [date.fromordinal(int(ordinals[i])) for i in mismatches[:5]] == []
+
+
+@pytest.mark.parametrize("offset", [-1, 0, 1])
+@pytest.mark.parametrize("start, end", [
+    (date(2026, 1, 1), date(2026, 12, 31)),
+    # Inside the table up to its last day, and across each edge
+    (HIJRI_TABLE_END - timedelta(days=10), HIJRI_TABLE_END),
+    (HIJRI_TABLE_END - timedelta(days=10), HIJRI_TABLE_END + timedelta(days=10)),
+    (HIJRI_TABLE_START - timedelta(days=10), HIJRI_TABLE_START + timedelta(days=10)),
+    (date(2026, 5, 5), date(2026, 5, 5)),
+], ids=str)
+def test_calendar_matches_scalar_algorithm(start, end, offset):
+    calendar = hijri_calendar(start, end, offset)
+
+    assert [day for day, *_ in calendar] == [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    for day, iy, im, id in calendar:
+        assert (iy, im, id) == _gregorian_to_hijri_scalar(day + timedelta(days=offset))
+
+
+def test_format_hijri():
+    assert format_hijri(1447, 9, 1) == "1 Ramadan 1447"
+    assert format_hijri(1447, 13, 1) == "1 Dhu al-Hijjah 1447"
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from core.job_store import JobStore
+
+
+def _job(job_id: str, run_date: datetime) -> dict:
+    return {"id": job_id, "kind": "athan", "prayer": "Maghrib", "run_date": run_date,
+            "start_at": run_date + timedelta(seconds=10), "volume": 0.5}
+
+
+def test_round_trip(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    run_date = datetime(2030, 1, 1, 17, 0, 0)
+    store.replace_pending([_job("athan_Maghrib_20300101", run_date)], version="v1")
+
+    assert store.pending() == [_job("athan_Maghrib_20300101", run_date)]
+    assert store.version() == "v1"
+
+
+def test_replan_does_not_revive_fired_job(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    run_date = datetime.now() - timedelta(seconds=2)
+    fired, later = _job("athan_Maghrib_x", run_date), _job("athan_Isha_x", run_date + timedelta(hours=2))
+    store.replace_pending([fired, later])
+    store.set_status(fired["id"], "fired")
+
+    # A refresh inside the pre-roll window plans the fired job again
+    store.replace_pending([fired, later])
+
+    assert [job["id"] for job in store.pending()] == [later["id"]]
+    assert [row[4] for row in store.history() if row[0] == fired["id"]] == ["fired"]
+
+
+def test_replan_drops_pending_jobs_no_longer_planned(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite"))
+    run_date = datetime(2030, 1, 1, 17, 0, 0)
+    store.replace_pending([_job("a", run_date), _job("b", run_date)])
+    store.replace_pending([_job("b", run_date)])
+
+    assert [job["id"] for job in store.pending()] == ["b"]
@@ -0,0 +1,148 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.conftest import ROOT
+from web.app import create_app
+
+
+@pytest.fixture(params=["disk", "memory"])
+def media(request, config, audio_manager, monkeypatch):
+    """(client, url, key, file bytes), served from disk or pre-warmed into memory."""
+    # create_app mounts web/static and audio relative to the repo root
+    monkeypatch.chdir(ROOT)
+    path = audio_manager.get_athan_path("beep.mp3")
+    key = audio_manager.media_key(path)
+    if request.param == "memory":
+        audio_manager.prewarm(key)
+        assert audio_manager.cached_bytes(key) is not None
+    with open(path, "rb") as f:
+        data = f.read()
+    client = TestClient(create_app(config, audio_manager=audio_manager))
+    return client, f"/media/{key}/beep.mp3", key, data
+
+
+def test_full_response_headers(media):
+    client, url, key, data = media
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["etag"] == f'"{key}"'
+    assert response.headers["content-type"] == "audio/mpeg"
+    assert response.headers["content-length"] == str(len(data))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "immutable" in response.headers["cache-control"]
+
+
+@pytest.mark.parametrize("header", ['"{key}"', 'W/"{key}"', '"other", "{key}"', "*"])
+def test_if_none_match_gives_304(media, header):
+    client, url, key, _ = media
+    response = client.get(url, headers={"If-None-Match": header.format(key=key)})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == f'"{key}"'
+
+
+def test_stale_etag_gives_full_response(media):
+    client, url, _, data = media
+    response = client.get(url, headers={"If-None-Match": '"0000000000000000"'})
+
+    assert response.status_code == 200
+    assert response.content == data
+
+
+@pytest.mark.parametrize("header, first, last", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=100-199", 100, 199),
+    ("bytes=-100", None, None),  # suffix: the last 100 bytes
+    ("bytes=1000-", 1000, None),  # open-ended: to the end
+    ("bytes=0-99999999", 0, None),  # end clipped to the file
+])
+def test_range_gives_206(media, header, first, last):
+    client, url, _, data = media
+    size = len(data)
+    if first is None:
+        first = size - 100
+    if last is None:
+        last = size - 1
+    response = client.get(url, headers={"Range": header})
+
+    assert response.status_code == 206
+    assert response.content == data[first:last + 1]
+    assert response.headers["content-range"] == f"bytes {first}-{last}/{size}"
+    assert response.headers["content-length"] == str(last - first + 1)
+
+
+@pytest.mark.parametrize("header", ["bytes=99999999-", "bytes=-0", "bytes=200-100"])
+def test_unsatisfiable_range_gives_416(media, header):
+    client, url, _, data = media
+    response = client.get(url, headers={"Range": header})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(data)}"
+
+
+@pytest.mark.parametrize("header", ["bytes=0-10,20-30", "items=0-10", "bytes=-"])
+def test_unsupported_range_gives_full_response(media, header):
+    client, url, _, data = media
+    response = client.get(url, headers={"Range": header})
+
+    assert response.status_code == 200
+    assert response.content == data
+
+
+def test_if_range_match_gives_206(media):
+    client, url, key, data = media
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": f'"{key}"'})
+
+    assert response.status_code == 206
+    assert response.content == data[:10]
+
+
+def test_if_range_mismatch_gives_full_response(media):
+    client, url, _, data = media
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"0000000000000000"'})
+
+    assert response.status_code == 200
+    assert response.content == data
+    assert "content-range" not in response.headers
+
+
+def test_head_sends_headers_only(media):
+    client, url, key, data = media
+    response = client.head(url)
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len(data))
+    assert response.headers["etag"] == f'"{key}"'
+
+
+def test_head_range(media):
+    client, url, _, data = media
+    response = client.head(url, headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == b""
+    assert response.headers["content-length"] == "10"
+    assert response.headers["content-range"] == f"bytes 10-19/{len(data)}"
+
+
+def test_unknown_key_gives_404(media):
+    client, _, _, _ = media
+    assert client.get("/media/0000000000000000/beep.mp3").status_code == 404
+
+
+def test_removed_file_gives_404(config, audio_manager, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    path = audio_manager.get_athan_path("beep.mp3")
+    key = audio_manager.media_key(path)
+    # The sample reminder has the same content, hence the same key
+    os.remove(path)
+    os.remove(audio_manager.get_reminder_path("beep.mp3"))
+    client = TestClient(create_app(config, audio_manager=audio_manager))
+
+    assert client.get(f"/media/{key}/beep.mp3").status_code == 404
@@ -0,0 +1,82 @@
+from core.metrics import MetricsRegistry, format_labels, format_value
+
+
+def _lines(text: str) -> list:
+    assert text.endswith("\n")
+    return text.splitlines()
+
+
+def test_label_escaping():
+    labels = {"path": 'C:\\audio', "title": 'say "hi"', "note": "two\nlines"}
+
+    assert format_labels(labels) == '{note="two\\nlines",path="C:\\\\audio",title="say \\"hi\\""}'
+    assert format_labels({}) == ""
+
+
+def test_value_formatting():
+    assert format_value(3.0) == "3"
+    assert format_value(0.25) == "0.25"
+    assert format_value(float("inf")) == "+Inf"
+    assert format_value(7) == "7"
+
+
+def test_counter_help_type_and_samples():
+    registry = MetricsRegistry()
+    jobs = registry.counter("athan_jobs_total", "Jobs by event")
+    jobs.inc(event="executed")
+    jobs.inc(2, event="executed")
+    jobs.inc(event="missed")
+
+    lines = _lines(registry.render())
+    assert lines[:2] == ["# HELP athan_jobs_total Jobs by event", "# TYPE athan_jobs_total counter"]
+    assert sorted(lines[2:]) == ['athan_jobs_total{event="executed"} 3', 'athan_jobs_total{event="missed"} 1']
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    delay = registry.histogram("athan_delay_seconds", "Delay", buckets=(0.1, 1.0, 0.5))
+    for value in (0.05, 0.3, 0.3, 2.0):
+        delay.observe(value, kind="athan")
+
+    lines = _lines(registry.render())
+    assert lines[:2] == ["# HELP athan_delay_seconds Delay", "# TYPE athan_delay_seconds histogram"]
+    assert lines[2:] == [
+        'athan_delay_seconds_bucket{kind="athan",le="0.1"} 1',
+        'athan_delay_seconds_bucket{kind="athan",le="0.5"} 3',
+        'athan_delay_seconds_bucket{kind="athan",le="1"} 3',
+        'athan_delay_seconds_bucket{kind="athan",le="+Inf"} 4',
+        'athan_delay_seconds_sum{kind="athan"} 2.65',
+        'athan_delay_seconds_count{kind="athan"} 4',
+    ]
+
+
+def test_empty_metrics_still_declared():
+    registry = MetricsRegistry()
+    registry.counter("athan_empty_total", "Nothing yet")
+
+    assert _lines(registry.render()) == ["# HELP athan_empty_total Nothing yet", "# TYPE athan_empty_total counter"]
+
+
+def test_extra_families():
+    registry = MetricsRegistry()
+    text = registry.render([
+        ("athan_device_connected", "gauge", "1 if connected", [({"name": 'Kitchen "Mini"'}, 1)]),
+        ("athan_scheduled_jobs", "gauge", "Jobs scheduled", [({}, 12)]),
+    ])
+
+    assert _lines(text) == [
+        "# HELP athan_device_connected 1 if connected",
+        "# TYPE athan_device_connected gauge",
+        'athan_device_connected{name="Kitchen \\"Mini\\""} 1',
+        "# HELP athan_scheduled_jobs Jobs scheduled",
+        "# TYPE athan_scheduled_jobs gauge",
+        "athan_scheduled_jobs 12",
+    ]
+
+
+def test_scheduler_metrics_render(scheduler):
+    text = scheduler.metrics.render(scheduler.metric_families())
+    names = [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+
+    assert len(names) == len(set(names))
+    assert "athan_job_callback_delay_seconds" in names
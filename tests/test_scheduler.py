@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import core.scheduler
+
+
+def _frozen_now(monkeypatch, now: datetime):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    monkeypatch.setattr(core.scheduler, "datetime", FrozenDatetime)
+
+
+def test_refresh_inside_preroll_window_does_not_replay(config, scheduler, monkeypatch):
+    config.set("audio", "preroll_seconds", 10)
+    now = datetime.now()
+    jobs = scheduler.plan_jobs(now, now + scheduler.job_horizon())
+    scheduler.apply_jobs(jobs)
+    athan = next(job for job in jobs if job.kind == "athan")
+
+    # The pre-roll job has fired and is loading the speakers
+    inside = athan.run_date + timedelta(seconds=2)
+    _frozen_now(monkeypatch, inside)
+    added = []
+    monkeypatch.setattr(scheduler, "add_job", lambda job: added.append(job.id))
+
+    replanned = scheduler.plan_jobs(inside, inside + scheduler.job_horizon())
+    counts = scheduler.apply_jobs(replanned)
+
+    same = next(job for job in replanned if job.id == athan.id)
+    assert (same.run_date, same.start_at) == (athan.run_date, athan.start_at)
+    assert athan.id not in added
+    assert counts["modified"] == 0
+
+
+def test_changed_job_inside_preroll_window_is_not_readded(config, scheduler, monkeypatch):
+    config.set("audio", "preroll_seconds", 10)
+    now = datetime.now()
+    jobs = scheduler.plan_jobs(now, now + scheduler.job_horizon())
+    scheduler.apply_jobs(jobs)
+    athan = next(job for job in jobs if job.kind == "athan")
+
+    inside = athan.run_date + timedelta(seconds=2)
+    _frozen_now(monkeypatch, inside)
+    added = []
+    monkeypatch.setattr(scheduler, "add_job", lambda job: added.append(job.id))
+
+    config.update({"prayers": {athan.prayer: {"athan_volume": 0.9}}})
+    scheduler.apply_jobs(scheduler.plan_jobs(inside, inside + scheduler.job_horizon()))
+
+    assert athan.id not in added
+    assert scheduler.planned[athan.id] is athan
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+import pytest
+
+from core.calculator import PrayerCalculator
+
+DAY = date(2030, 3, 15)
+MINUTE = timedelta(minutes=1)
+
+
+@pytest.fixture
+def calculator(config):
+    config.update({"location": {"calculation_backend": "numpy"}})
+    return PrayerCalculator(config)
+
+
+def _times(config, day: date) -> dict:
+    """Reference times from a calculator with nothing cached."""
+    return PrayerCalculator(config).calculate_times(day)
+
+
+def test_after_isha_next_is_tomorrows_fajr(config, calculator):
+    today, tomorrow = _times(config, DAY), _times(config, DAY + timedelta(days=1))
+    now = today["Isha"] + MINUTE
+
+    assert calculator.get_next_prayer(now) == ("Fajr", tomorrow["Fajr"])
+    assert calculator.get_previous_prayer(now) == ("Isha", today["Isha"])
+    assert calculator.time_until_next_prayer(now) == tomorrow["Fajr"] - now
+
+
+def test_before_fajr_previous_is_yesterdays_isha(config, calculator):
+    yesterday, today = _times(config, DAY - timedelta(days=1)), _times(config, DAY)
+    now = today["Fajr"] - MINUTE
+
+    assert calculator.get_previous_prayer(now) == ("Isha", yesterday["Isha"])
+    assert calculator.get_next_prayer(now) == ("Fajr", today["Fajr"])
+
+
+def test_at_a_prayer_time(config, calculator):
+    today = _times(config, DAY)
+    now = today["Dhuhr"]
+
+    # Next is strictly after now, previous is at or before it
+    assert calculator.get_next_prayer(now) == ("Asr", today["Asr"])
+    assert calculator.get_previous_prayer(now) == ("Dhuhr", today["Dhuhr"])
+
+
+def test_day_rollover_matches_a_fresh_timeline(config, calculator):
+    for offset in range(4):
+        day = DAY + timedelta(days=offset)
+        times = _times(config, day)
+        for name in ("Fajr", "Maghrib", "Isha"):
+            now = times[name] + MINUTE
+            assert calculator.get_next_prayer(now) == PrayerCalculator(config).get_next_prayer(now)
+            assert calculator.get_previous_prayer(now) == (name, times[name])
+
+
+def test_midnight_crossing(config, calculator):
+    tomorrow = _times(config, DAY + timedelta(days=1))
+    before_midnight = _times(config, DAY)["Isha"] + MINUTE
+    after_midnight = tomorrow["Fajr"] - MINUTE
+
+    assert calculator.get_next_prayer(before_midnight) == ("Fajr", tomorrow["Fajr"])
+    assert calculator.get_next_prayer(after_midnight) == ("Fajr", tomorrow["Fajr"])
+    assert calculator.get_previous_prayer(after_midnight)[0] == "Isha"
+
+
+def test_location_change_rebuilds_timeline(config, calculator):
+    now = _times(config, DAY)["Dhuhr"] - timedelta(hours=2)
+    london = calculator.get_next_prayer(now)
+
+    config.update({"location": {"latitude": 21.4225, "longitude": 39.8262}})
+    makkah = calculator.get_next_prayer(now)
+
+    assert makkah != london
+    assert makkah == PrayerCalculator(config).get_next_prayer(now)
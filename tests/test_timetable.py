@@ -0,0 +1,135 @@
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+from core.calculator import PrayerCalculator
+from core.timetable import PRAYER_NAMES, PrayerTable, TimetableStore, location_fingerprint
+
+SETTINGS = {"latitude": 51.5, "longitude": -0.1, "calculation_method": "ISNA", "asr_method": "STANDARD",
+            "custom_angles": {}, "high_latitude_rule": None, "backend": "numpy"}
+
+
+def _year_table(year: int = 2030, seed: int = 0) -> PrayerTable:
+    days = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+    seconds = np.random.default_rng(seed).uniform(0, 86400, (days, len(PRAYER_NAMES)))
+    return PrayerTable(date(year, 1, 1), seconds)
+
+
+def test_save_load_round_trip_is_memory_mapped(tmp_path):
+    store = TimetableStore(str(tmp_path))
+    table = _year_table()
+    store.save_year("abc", table, SETTINGS)
+
+    loaded = store.load_year("abc", 2030)
+    # A read-only view of the mapped file, not a copy
+    assert not loaded.seconds.flags.owndata
+    assert not loaded.seconds.flags.writeable
+    assert loaded.start == date(2030, 1, 1)
+    np.testing.assert_array_equal(loaded.seconds, table.seconds)
+    assert loaded.row(date(2030, 6, 1)) == table.row(date(2030, 6, 1))
+    assert store.load_year("abc", 2031) is None
+
+
+def test_fingerprint_changes_with_settings_and_format(monkeypatch):
+    base = location_fingerprint(SETTINGS)
+    assert location_fingerprint(dict(SETTINGS)) == base
+    assert location_fingerprint(dict(SETTINGS, latitude=51.6)) != base
+    assert location_fingerprint(dict(SETTINGS, backend="islamic_times")) != base
+
+    monkeypatch.setattr(TimetableStore, "FORMAT_VERSION", TimetableStore.FORMAT_VERSION + 1)
+    assert location_fingerprint(SETTINGS) != base
+
+
+def test_location_change_misses_the_stored_year(config):
+    config.update({"location": {"calculation_backend": "numpy"}})
+    calculator = PrayerCalculator(config)
+    old = calculator.fingerprint()
+    calculator.get_year_table(2030)
+    assert calculator.store.load_year(old, 2030) is not None
+
+    config.update({"location": {"latitude": 21.4}})
+    new = calculator.fingerprint()
+    assert new != old
+    assert calculator.store.load_year(new, 2030) is None
+    calculator.get_year_table(2030)
+    assert calculator.store.load_year(new, 2030) is not None
+
+
+def test_year_with_nan_rows_is_persisted(config, monkeypatch):
+    calculator = PrayerCalculator(config)
+    table = _year_table()
+    # Polar night/day: some prayers, or whole days, have no time
+    table.seconds[10:20, :] = np.nan
+    table.seconds[100:110, 0] = np.nan
+    calls = []
+
+    def calculate_range(start, end):
+        calls.append((start, end))
+        return table
+
+    monkeypatch.setattr(calculator, "calculate_range", calculate_range)
+    calculator.get_year_table(2030)
+    stored = calculator.store.load_year(calculator.fingerprint(), 2030)
+
+    assert stored is not None
+    np.testing.assert_array_equal(stored.seconds, table.seconds)
+    assert stored.row(date(2030, 1, 15)) == {}
+    # The next miss is served from disk
+    calculator.get_year_table(2030)
+    assert len(calls) == 1
+
+
+def test_prune_keeps_most_recent_fingerprints(tmp_path, monkeypatch):
+    monkeypatch.setattr(TimetableStore, "MAX_FINGERPRINTS", 3)
+    store = TimetableStore(str(tmp_path))
+    for i in range(5):
+        store.save_year(f"fp{i}", _year_table(seed=i))
+        # Make the use order unambiguous regardless of timestamp resolution
+        os.utime(tmp_path / f"fp{i}", (1000 + i, 1000 + i))
+
+    assert sorted(os.listdir(tmp_path)) == ["fp2", "fp3", "fp4"]
+
+
+def test_load_touches_fingerprint_for_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(TimetableStore, "MAX_FINGERPRINTS", 2)
+    store = TimetableStore(str(tmp_path))
+    for i in range(2):
+        store.save_year(f"fp{i}", _year_table(seed=i))
+        os.utime(tmp_path / f"fp{i}", (1000 + i, 1000 + i))
+    store.load_year("fp0", 2030)
+    store.save_year("fp2", _year_table(seed=2))
+
+    assert sorted(os.listdir(tmp_path)) == ["fp0", "fp2"]
+
+
+def test_interrupted_save_keeps_previous_file(tmp_path, monkeypatch):
+    store = TimetableStore(str(tmp_path))
+    original = _year_table(seed=1)
+    store.save_year("abc", original)
+
+    def failing_save(f, array, allow_pickle=False):
+        f.write(b"\x93NUMPY partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", failing_save)
+    store.save_year("abc", _year_table(seed=2))
+
+    assert os.listdir(tmp_path / "abc") == ["2030.npy"]
+    np.testing.assert_array_equal(store.load_year("abc", 2030).seconds, original.seconds)
+
+
+def test_corrupt_file_is_discarded(tmp_path):
+    store = TimetableStore(str(tmp_path))
+    (tmp_path / "abc").mkdir()
+    (tmp_path / "abc" / "2030.npy").write_bytes(b"\x93NUMPY truncated")
+
+    assert store.load_year("abc", 2030) is None
+    assert not (tmp_path / "abc" / "2030.npy").exists()
+
+
+def test_save_rejects_partial_year(tmp_path):
+    store = TimetableStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.save_year("abc", PrayerTable.empty(date(2030, 1, 1), 10))
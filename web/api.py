@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
-from datetime import date, timedelta
-from core.utils import gregorian_to_hijri, format_hijri
+from datetime import date
+import calendar
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Longest date range served by /network-times in one request
+MAX_NETWORK_DAYS = 366
+# Prometheus text exposition format served by /metrics
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
 # Data Models
 class LocationConfig(BaseModel):
     latitude: float
@@ -47,16 +53,25 @@ class TestReminderRequest(BaseModel):
 class StopAudioRequest(BaseModel):
     target_devices: Optional[List[str]] = None
 
+def get_scheduler(request: Request):
+    """The running scheduler, or 503 while it is still starting in the background."""
+    scheduler = request.app.state.scheduler
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="Scheduler is starting, try again shortly")
+    return scheduler
+
 @router.get("/status")
 async def get_status(request: Request):
     """Get current status including prayer times and next prayer."""
-    scheduler = request.app.state.scheduler
+    from core.utils import gregorian_to_hijri, format_hijri
+    scheduler = get_scheduler(request)
     config_mgr = request.app.state.config
     calculator = scheduler.calculator
     
     # Recalculate to ensure freshness
     times = calculator.calculate_times()
     next_prayer, next_time = calculator.get_next_prayer()
+    previous_prayer, previous_time = calculator.get_previous_prayer()
     
     # Cast devices status
     devices = []
@@ -73,14 +88,9 @@ async def get_status(request: Request):
                 "status": status
             })
 
-    # Hijri Date
-    today = date.today()
-    # Apply offset if configured
+    # Hijri Date (offset applied as a shift into the lookup table)
     offset = config_mgr.get("location", "hijri_offset") or 0
-    if offset != 0:
-        today = today + timedelta(days=offset)
-        
-    h_y, h_m, h_d = gregorian_to_hijri(today)
+    h_y, h_m, h_d = gregorian_to_hijri(date.today(), offset=offset)
     hijri_str = format_hijri(h_y, h_m, h_d)
 
     return {
@@ -91,6 +101,11 @@ async def get_status(request: Request):
             "name": next_prayer,
             "time": next_time
         } if next_prayer else None,
+        "previous_prayer": {
+            "name": previous_prayer,
+            "time": previous_time
+        } if previous_prayer else None,
+        "missed_prayers": scheduler.missed_jobs,
         "devices": devices
     }
 
@@ -105,14 +120,11 @@ async def update_config(request: Request, config_data: Dict[str, Any]):
     """Update configuration."""
     config_mgr = request.app.state.config
     
+    # Publishes a new config snapshot; a running scheduler re-plans in the
+    # background (see AthanScheduler.on_config_changed), one still warming
+    # up reads the saved config when it starts
     config_mgr.update(config_data)
     
-    # Clear prayer times cache since settings may have changed
-    request.app.state.scheduler.calculator.clear_cache()
-    
-    # Trigger a refresh of the scheduler so new settings take effect
-    request.app.state.scheduler.refresh_prayer_times()
-    
     return {"status": "ok", "message": "Configuration updated and saved."}
 
 @router.get("/audio-files")
@@ -128,12 +140,87 @@ async def get_audio_files(request: Request):
         logger.error(f"Error listing audio files: {e}")
         return {"athan": [], "reminders": []}
 
+@router.get("/audio-library")
+async def get_audio_library(request: Request):
+    """Audio files with size, duration, bitrate and content hash."""
+    audio_manager = request.app.state.audio_manager
+    try:
+        return audio_manager.library()
+    except Exception as e:
+        logger.error(f"Error reading audio library: {e}")
+        return {"athan": [], "reminders": []}
+
 @router.get("/countries")
 async def get_countries():
     """List supported countries and their cities."""
     from core.cities import COUNTRIES
     return COUNTRIES
 
+@router.get("/network-times")
+def get_network_times(request: Request, country: Optional[str] = None,
+                      start: Optional[date] = None, end: Optional[date] = None):
+    """Prayer times for every city (optionally of one country) over a date range."""
+    from core.cities import COUNTRIES
+    calculator = get_scheduler(request).calculator
+
+    start = start or date.today()
+    end = end or start
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days >= MAX_NETWORK_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_NETWORK_DAYS} days")
+
+    if country is not None:
+        if country not in COUNTRIES:
+            raise HTTPException(status_code=404, detail=f"Unknown country '{country}'")
+        sites = [dict(city, country=country) for city in COUNTRIES[country]]
+    else:
+        sites = [dict(city, country=name) for name, cities in COUNTRIES.items() for city in cities]
+
+    tables = calculator.calculate_locations(sites, start, end)
+    return {
+        "start": start,
+        "end": end,
+        "locations": [
+            {
+                "name": site["name"],
+                "country": site["country"],
+                "lat": site["lat"],
+                "lng": site["lng"],
+                "times": [{"date": day, **times} for day, times in tables[(site["country"], site["name"])].rows()]
+            }
+            for site in sites
+        ]
+    }
+
+def _hijri_days(request: Request, start: date, end: date) -> list:
+    """Hijri dates (with the configured hijri_offset) for start..end inclusive."""
+    from core.utils import format_hijri, hijri_calendar, HIJRI_MONTHS
+    offset = request.app.state.config.get("location", "hijri_offset") or 0
+    return [
+        {
+            "date": day,
+            "hijri": {"year": h_y, "month": h_m, "day": h_d, "month_name": HIJRI_MONTHS[h_m - 1]},
+            "hijri_date": format_hijri(h_y, h_m, h_d)
+        }
+        for day, h_y, h_m, h_d in hijri_calendar(start, end, offset)
+    ]
+
+@router.get("/hijri-calendar/{year}")
+async def get_hijri_year(request: Request, year: int):
+    """Hijri date for every day of a Gregorian year."""
+    if not 1 <= year <= 9998:
+        raise HTTPException(status_code=400, detail="Invalid year")
+    return {"year": year, "days": _hijri_days(request, date(year, 1, 1), date(year, 12, 31))}
+
+@router.get("/hijri-calendar/{year}/{month}")
+async def get_hijri_month(request: Request, year: int, month: int):
+    """Hijri date for every day of a Gregorian month."""
+    if not 1 <= year <= 9998 or not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid year or month")
+    last_day = calendar.monthrange(year, month)[1]
+    return {"year": year, "month": month, "days": _hijri_days(request, date(year, month, 1), date(year, month, last_day))}
+
 @router.get("/cities")
 async def get_cities():
     """List supported cities (Legacy: returns UK cities)."""
@@ -143,27 +230,27 @@ async def get_cities():
 @router.post("/stop-audio")
 def stop_audio(request: Request, params: StopAudioRequest = None):
     """Stop audio playback on specified or all devices."""
-    scheduler = request.app.state.scheduler
+    scheduler = get_scheduler(request)
     try:
         target_devices = params.target_devices if params else None
-        scheduler.stop_all(target_devices=target_devices)
+        results = scheduler.stop_all(target_devices=target_devices)
         if target_devices:
-            return {"status": "ok", "message": f"Stopped audio on {len(target_devices)} device(s)."}
-        return {"status": "ok", "message": "Stopped all audio playback."}
+            return {"status": "ok", "message": f"Stopped audio on {len(target_devices)} device(s).", "devices": results}
+        return {"status": "ok", "message": "Stopped all audio playback.", "devices": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/test-play")
 def test_play(request: Request, params: TestPlayRequest):
     """Trigger a test playback."""
-    scheduler = request.app.state.scheduler
+    scheduler = get_scheduler(request)
     
     # Validate
     if params.volume is not None and not (0.0 <= params.volume <= 1.0):
          raise HTTPException(status_code=400, detail="Volume must be between 0.0 and 1.0")
 
     try:
-        scheduler.play_athan(
+        playback = scheduler.play_athan(
             prayer_name=params.prayer_name,
             prayer_settings={
                 "athan_audio_file": params.athan_audio_file,
@@ -172,20 +259,21 @@ def test_play(request: Request, params: TestPlayRequest):
                 "athan_enabled": True
             }
         )
-        return {"status": "ok", "message": f"Test playback triggered for {params.prayer_name}."}
+        return {"status": "ok", "message": f"Test playback triggered for {params.prayer_name}.",
+                "playback_id": playback.id, "state": playback.state}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/test-reminder")
 def test_reminder(request: Request, params: TestReminderRequest):
     """Trigger a test reminder."""
-    scheduler = request.app.state.scheduler
+    scheduler = get_scheduler(request)
     
     if params.volume is not None and not (0.0 <= params.volume <= 1.0):
          raise HTTPException(status_code=400, detail="Volume must be between 0.0 and 1.0")
          
     try:
-        scheduler.play_reminder(
+        playback = scheduler.play_reminder(
             prayer_name=params.prayer_name,
             settings={
                 "reminder_enabled": True,
@@ -196,6 +284,40 @@ def test_reminder(request: Request, params: TestReminderRequest):
                 "reminder_timing": params.timing
             }
         )
-        return {"status": "ok", "message": f"Test reminder triggered for {params.prayer_name}."}
+        return {"status": "ok", "message": f"Test reminder triggered for {params.prayer_name}.",
+                "playback_id": playback.id if playback else None, "state": playback.state if playback else None}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/playbacks")
+async def get_playbacks(request: Request):
+    """Recent playbacks (scheduled and test), newest first."""
+    scheduler = get_scheduler(request)
+    return [playback.as_dict() for playback in scheduler.playbacks.recent()]
+
+@router.get("/playback/{playback_id}")
+async def get_playback(request: Request, playback_id: str):
+    """Progress of one playback: overall state and per-device status and timings."""
+    scheduler = get_scheduler(request)
+    playback = scheduler.playbacks.get(playback_id)
+    if playback is None:
+        raise HTTPException(status_code=404, detail="Unknown playback id")
+    return playback.as_dict()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(request: Request):
+    """Prometheus text metrics: trigger lateness, job counts, cache hit rates, device state."""
+    families = []
+    startup = request.app.state.startup
+    if startup is not None:
+        families.append(("athan_startup_seconds", "gauge", "Boot milestones in seconds since process start",
+                         [({"milestone": name}, seconds) for name, seconds in startup.as_dict().items()]))
+
+    scheduler = request.app.state.scheduler
+    if scheduler is None:
+        # Still starting: serve the boot milestones only
+        from core.metrics import MetricsRegistry
+        text = MetricsRegistry().render(families)
+    else:
+        text = scheduler.metrics.render(scheduler.metric_families() + families)
+    return PlainTextResponse(text, media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,20 +2,31 @@ from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from web.api import router as api_router
+from web.media import router as media_router
 import os
 
-def create_app(config, scheduler):
+def create_app(config, scheduler=None, audio_manager=None, startup=None):
     app = FastAPI(title="Home Athan Automation")
 
-    # Store global state in app.state for access in endpoints
+    # Store global state in app.state for access in endpoints.
+    # The scheduler may be attached later (see main.warm_up); endpoints that
+    # need it answer 503 until then.
     app.state.config = config
     app.state.scheduler = scheduler
-    app.state.audio_manager = scheduler.audio_manager
+    app.state.audio_manager = audio_manager or (scheduler.audio_manager if scheduler else None)
+    app.state.startup = startup
+
+    if startup is not None:
+        @app.middleware("http")
+        async def record_first_byte(request: Request, call_next):
+            response = await call_next(request)
+            startup.mark("first_response")
+            return response
 
     # Mount static files
     # Ensure directories exist
     os.makedirs("web/static", exist_ok=True)
-    
+
     app.mount("/static", StaticFiles(directory="web/static"), name="static")
     # Serve audio files directly from the 'audio' directory at root
     os.makedirs("audio", exist_ok=True)
@@ -27,6 +38,8 @@ def create_app(config, scheduler):
 
     # Include API Router
     app.include_router(api_router, prefix="/api")
+    # Content-addressed audio for the speakers
+    app.include_router(media_router)
 
     @app.get("/")
     async def root(request: Request):
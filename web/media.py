@@ -0,0 +1,148 @@
+"""
+Audio serving for Cast devices at /media/{key}/{filename}.
+
+`key` is derived from the content (see AudioManager.media_key), so a URL
+always refers to the same bytes and can be cached forever by speakers and
+browsers. Responses carry a strong ETag, answer conditional requests with
+304 and support single byte ranges for Cast seeking. Files pre-warmed by
+the scheduler (AudioManager.prewarm) are served straight from memory.
+"""
+import logging
+import os
+import re
+
+import anyio
+from fastapi import APIRouter, Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int):
+    """(start, end) inclusive for a single "bytes=" range, None to ignore it, or ValueError if unsatisfiable."""
+    match = _RANGE.match(header.strip())
+    if match is None:
+        # Multiple or malformed ranges: serve the whole file
+        return None
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+class AudioFileResponse(Response):
+    """Streams (part of) a file, zero-copy when the server offers it.
+
+    Uses the ASGI "http.response.zerocopysend" extension (sendfile) when the
+    server advertises it, otherwise reads the file in chunks on a worker
+    thread.
+    """
+
+    media_type = "audio/mpeg"
+
+    def __init__(self, path: str, start: int, end: int, status_code: int = 200, headers: dict = None,
+                 send_body: bool = True):
+        super().__init__(status_code=status_code, headers=headers, media_type=self.media_type)
+        self.path = path
+        self.start = start
+        self.length = end - start + 1
+        self.send_body = send_body
+        self.headers["content-length"] = str(self.length)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body or self.length <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as f:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({"type": "http.response.zerocopysend", "file": f.wrapped,
+                            "offset": self.start, "count": self.length})
+                return
+            await f.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us; end the response
+                await send({"type": "http.response.body", "body": b""})
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+@router.api_route("/media/{key}/{filename}", methods=["GET", "HEAD"])
+async def get_media(request: Request, key: str, filename: str):
+    """Serve an audio file (original or optimised encode) by its content key."""
+    audio_manager = request.app.state.audio_manager
+    if audio_manager is None:
+        return Response(status_code=404)
+
+    # Pre-warmed ahead of a scheduled playback: no disk access at all
+    data = audio_manager.cached_bytes(key)
+    path = None
+    if data is not None:
+        size = len(data)
+    else:
+        path = audio_manager.media_path(key)
+        try:
+            size = os.stat(path).st_size if path else None
+        except OSError:
+            size = None
+        if size is None:
+            return Response(status_code=404)
+
+    etag = f'"{key}"'
+    headers = {"etag": etag, "cache-control": IMMUTABLE, "accept-ranges": "bytes"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    send_body = request.method != "HEAD"
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers=dict(headers, **{"content-range": f"bytes */{size}"}))
+        if byte_range is not None:
+            start, end = byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            return _respond(data, path, start, end, 206, headers, send_body)
+
+    return _respond(data, path, 0, size - 1, 200, headers, send_body)
+
+
+def _respond(data, path, start: int, end: int, status_code: int, headers: dict, send_body: bool) -> Response:
+    if data is None:
+        return AudioFileResponse(path, start, end, status_code=status_code, headers=headers, send_body=send_body)
+    if not send_body:
+        return Response(status_code=status_code, headers=dict(headers, **{"content-length": str(end - start + 1)}),
+                        media_type=AudioFileResponse.media_type)
+    return Response(data[start:end + 1], status_code=status_code, headers=headers,
+                    media_type=AudioFileResponse.media_type)
@@ -118,6 +118,11 @@ async function fetchStatus(forceRefresh = false) {
 
     try {
         const res = await fetch('/api/status');
+        if (res.status === 503) {
+            // Scheduler still starting after boot; retry shortly
+            setTimeout(() => fetchStatus(true), 2000);
+            return;
+        }
         const data = await res.json();
 
         // Update cache
@@ -150,7 +155,10 @@ async function fetchStatus(forceRefresh = false) {
                 // Filter times that are in the past
                 const pastTimes = timesArr.filter(t => t < now);
 
-                if (pastTimes.length > 0) {
+                if (data.previous_prayer) {
+                    // Server timeline already covers yesterday, so this handles midnight rollover
+                    prevTime = new Date(data.previous_prayer.time);
+                } else if (pastTimes.length > 0) {
                     prevTime = pastTimes[pastTimes.length - 1];
                 } else {
                     // Early morning (Midnight to Fajr)